@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de cinemática y solvers - Resultados en JSON para comparar commits
+
+    python benchmarks/run_benchmarks.py -o resultados.json
+    python benchmarks/run_benchmarks.py --quick --solvers genetic dls
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Agregar directorios al path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from models.arm_model import ArmModel
+from models.genetic_solver import GeneticSolver, VectorizedGeneticSolver
+from models.ik_solver import angle_bounds
+from models.island_solver import create_island_executor
+from models.solvers import SOLVERS, create_solver
+
+
+def time_per_call(function: Callable, number: int, repeat: int = 5) -> float:
+    """Mejor tiempo medio por llamada (s) entre `repeat` series de `number` llamadas"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def reachable_targets(arm_model: ArmModel, count: int, seed: int) -> np.ndarray:
+    """Objetivos alcanzables: efectores de configuraciones aleatorias con semilla"""
+    rng = np.random.default_rng(seed)
+    lower, upper = angle_bounds(arm_model)
+    angles = rng.uniform(lower, upper, size=(count, len(lower)))
+    return arm_model.forward_kinematics_batch(angles)[:, -1]
+
+
+def bench_kinematics(arm_model: ArmModel, number: int) -> Dict:
+    """Tiempo por llamada de la cinemática directa"""
+    rng = np.random.default_rng(0)
+    lower, upper = angle_bounds(arm_model)
+    angles = rng.uniform(lower, upper, size=(10_000, len(lower)))
+    transform = np.eye(4)
+
+    batch_time = time_per_call(lambda: arm_model.forward_kinematics_batch(angles),
+                               max(1, number // 1000))
+
+    return {
+        'update_positions_s': time_per_call(arm_model.update_positions, number),
+        'update_last_link_s': time_per_call(
+            lambda: arm_model.update_positions(arm_model.n_links - 1), number
+        ),
+        'apply_rotation_s': time_per_call(
+            lambda: arm_model._apply_rotation(transform, 0.5, 'z'), number
+        ),
+        'forward_kinematics_batch_per_config_s': batch_time / len(angles),
+    }
+
+
+def bench_fitness(arm_model: ArmModel, number: int) -> Dict:
+    """Evaluaciones de fitness por segundo"""
+    target = {'x': 2.0, 'y': 1.0, 'z': 2.0}
+    solver = GeneticSolver(arm_model, target)
+    individual = solver._generate_initial_population()[0]
+
+    vectorized = VectorizedGeneticSolver(arm_model, target, population_size=10_000,
+                                         seed=0)
+    population = vectorized._generate_initial_population()
+    population_time = time_per_call(lambda: vectorized._evaluate_population(population),
+                                    max(1, number // 1000))
+
+    return {
+        'genetic_evaluate_fitness_per_s': 1.0 / time_per_call(
+            lambda: solver._evaluate_fitness(individual), number
+        ),
+        'vectorized_evaluate_population_per_s': len(population) / population_time,
+    }
+
+
+def bench_solvers(arm_model: ArmModel, solver_names: List[str],
+                  targets: np.ndarray) -> Dict:
+    """Distribución del tiempo y las evaluaciones hasta la tolerancia de cada motor"""
+    results = {}
+    # Las islas comparten un pool: arrancar procesos no cuenta en cada objetivo
+    island_executor = create_island_executor() if 'islands' in solver_names else None
+
+    try:
+        for name in solver_names:
+            times = []
+            residuals = []
+            evaluations = []
+
+            for index, point in enumerate(targets):
+                target = {axis: float(value) for axis, value in zip('xyz', point)}
+                random.seed(index)
+                arm_model.reset_to_default_position()
+                options = {} if name == 'genetic' else {'seed': index}
+                if name == 'islands':
+                    options['executor'] = island_executor
+                solver = create_solver(name, arm_model, target, **options)
+
+                start = time.perf_counter()
+                solution = solver.solve()
+                times.append(time.perf_counter() - start)
+
+                solution_array = arm_model.angles_to_array(solution)
+                end_effector = arm_model.forward_kinematics_batch(solution_array)[-1]
+                residuals.append(float(np.linalg.norm(end_effector - point)))
+                evaluations.append(solver.metrics.evaluations)
+
+            times = np.array(times)
+            residuals = np.array(residuals)
+            evaluations = np.array(evaluations, dtype=float)
+            solved = residuals < 0.01
+            results[name] = {
+                'targets': len(targets),
+                'success_rate': float(solved.mean()),
+                'time_to_tolerance_s': _distribution(times[solved]),
+                'time_s': _distribution(times),
+                'residual': _distribution(residuals),
+                'evaluations_to_tolerance': _distribution(evaluations[solved]),
+                'evaluations': _distribution(evaluations),
+                'times_s': times.tolist(),
+            }
+    finally:
+        if island_executor is not None:
+            island_executor.shutdown()
+    return results
+
+
+def _distribution(values: np.ndarray) -> Dict:
+    """Resumen de una distribución"""
+    if len(values) == 0:
+        return {'count': 0}
+    return {
+        'count': int(len(values)),
+        'mean': float(np.mean(values)),
+        'p50': float(np.percentile(values, 50)),
+        'p90': float(np.percentile(values, 90)),
+        'p99': float(np.percentile(values, 99)),
+        'max': float(np.max(values)),
+    }
+
+
+def _git_commit() -> str:
+    """Commit actual del repositorio, si existe"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    """Ejecutar todos los benchmarks y guardar el resultado"""
+    parser = argparse.ArgumentParser(description="Benchmarks de cinemática y solvers")
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help="Archivo JSON de resultados")
+    parser.add_argument('--solvers', nargs='+', default=sorted(SOLVERS),
+                        choices=sorted(SOLVERS),
+                        help="Motores a medir con solve()")
+    parser.add_argument('--targets', type=int, default=50,
+                        help="Objetivos alcanzables para solve()")
+    parser.add_argument('--seed', type=int, default=1234,
+                        help="Semilla de los objetivos")
+    parser.add_argument('--quick', action='store_true',
+                        help="Menos repeticiones y objetivos")
+    args = parser.parse_args()
+
+    number = 200 if args.quick else 2000
+    target_count = min(args.targets, 10) if args.quick else args.targets
+
+    arm_model = ArmModel()
+    targets = reachable_targets(arm_model, target_count, args.seed)
+
+    results = {
+        'metadata': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+        },
+        'kinematics': bench_kinematics(arm_model, number),
+        'fitness': bench_fitness(arm_model, number),
+        'solvers': bench_solvers(arm_model, args.solvers, targets),
+    }
+
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    # Resumen en consola
+    kinematics = results['kinematics']
+    print(f"update_positions: {kinematics['update_positions_s'] * 1e6:.1f} µs/llamada")
+    print(f"update_positions (último segmento): "
+          f"{kinematics['update_last_link_s'] * 1e6:.1f} µs/llamada")
+    print(f"_apply_rotation: {kinematics['apply_rotation_s'] * 1e6:.1f} µs/llamada")
+    batch_ns = kinematics['forward_kinematics_batch_per_config_s'] * 1e9
+    print(f"forward_kinematics_batch: {batch_ns:.0f} ns/config")
+    for name, value in results['fitness'].items():
+        print(f"{name}: {value:,.0f} evaluaciones/s")
+    for name, summary in results['solvers'].items():
+        ttt = summary['time_to_tolerance_s']
+        ett = summary['evaluations_to_tolerance']
+        p50 = "-"
+        if ttt['count']:
+            p50 = f"{ttt['p50'] * 1e3:.1f} ms, {ett['p50']:,.0f} evaluaciones"
+        print(f"{name}: éxito {summary['success_rate']:.0%}, "
+              f"hasta tolerancia p50 {p50}")
+    print(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
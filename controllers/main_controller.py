@@ -3,30 +3,51 @@
 Controlador principal - Coordina modelo y vista
 """
 
+import time
+
+import numpy as np
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from typing import Dict, Optional
 
 from models.arm_model import ArmModel
-from models.genetic_solver import GeneticSolver
+from models.chain_model import ChainModel, as_point
+from models.ik_solver import IKSolver
+from models.island_solver import create_island_executor
+from models.solvers import ADAPTIVE_SOLVERS, SOLVER_LABELS, create_solver
+from models.solution_cache import SolutionCache
+from models.workspace_index import WorkspaceIndex
+from models.reachability import ReachabilityGrid
+from models.joint_trajectory import JointTrajectory
+from models.constraints import SelfCollisionConstraint
+from models.scene import ObstacleConstraint, ObstacleScene
+from controllers.progress_channel import ProgressChannel
 from views.main_window import MainWindow
 
+# Actualizaciones de la vista por segundo como máximo mientras se resuelve
+MAX_UI_UPDATES_PER_SECOND = 30
+
+# Cuadros por segundo al reproducir el movimiento hacia la solución
+PLAYBACK_FPS = 60
+
 class GeneticThread(QThread):
-    """Thread para ejecutar algoritmo genético sin bloquear la UI"""
+    """Thread para ejecutar el solver de cinemática inversa sin bloquear la UI"""
     
-    progress = pyqtSignal(dict)  # Emite solución intermedia
     finished = pyqtSignal(dict)  # Emite solución final
     error = pyqtSignal(str)      # Emite error
     
-    def __init__(self, solver: GeneticSolver):
+    def __init__(self, solver: IKSolver, progress_channel: ProgressChannel):
         super().__init__()
         self.solver = solver
+        self.progress_channel = progress_channel
         self.is_running = True
     
     def run(self):
         """Ejecutar algoritmo genético"""
         try:
+            # Las soluciones intermedias van al canal, sin señales por generación
             solution = self.solver.solve(
-                callback=lambda sol, fit, gen: self.progress.emit(sol) if sol else None
+                callback=lambda sol, fit, gen: (self.progress_channel.publish(sol)
+                                                if sol else None)
             )
             if solution:
                 self.finished.emit(solution)
@@ -36,29 +57,75 @@ class GeneticThread(QThread):
             self.error.emit(str(e))
     
     def stop(self):
-        """Detener el thread"""
+        """Detener el thread: el solver acaba en la próxima generación con la mejor"""
         self.is_running = False
+        self.solver.cancel()
 
 class MainController:
     """Controlador principal de la aplicación"""
     
-    def __init__(self):
+    def __init__(self, max_ui_rate: float = MAX_UI_UPDATES_PER_SECOND,
+                 arm_model: Optional[ChainModel] = None,
+                 obstacle_scene: Optional[ObstacleScene] = None):
+        """
+        Inicializar el controlador
+        
+        Args:
+            max_ui_rate: Actualizaciones de la vista por segundo como máximo
+                mientras el solver publica progreso
+            arm_model: Cadena a controlar (por defecto el brazo de 3 segmentos)
+            obstacle_scene: Obstáculos de la celda de trabajo (por defecto ninguno)
+        """
         # Modelos
-        self.arm_model = ArmModel()
+        self.arm_model = arm_model if arm_model is not None else ArmModel()
         self.genetic_solver = None
         self.genetic_thread = None
+        self.island_executor = None  # procesos de las islas, creados al primer uso
+        self.solution_cache = SolutionCache()
+        
+        # Índice precalculado (python -m models.workspace_index), mapeado en memoria
+        self.workspace_index = WorkspaceIndex.load(arm_model=self.arm_model)
+        
+        # Rejilla de alcanzabilidad (se construye una vez y queda en disco)
+        self.arm_model.reachability_grid = ReachabilityGrid.load_or_build(
+            self.arm_model
+        )
+        
+        # Restricciones del fitness: sin segmentos cruzados, atravesando la base
+        # ni atravesando los obstáculos de la escena
+        if obstacle_scene is None:
+            obstacle_scene = ObstacleScene()
+        self.obstacle_scene = obstacle_scene
+        self.constraints = [
+            SelfCollisionConstraint(self.arm_model),
+            ObstacleConstraint(self.obstacle_scene),
+        ]
+        
+        # Los objetivos dentro de la base no se pueden alcanzar sin atravesarla
+        base_clearance = self.constraints[0].base_clearance
+        self.arm_model.reachability_grid.excluded_radius = base_clearance
         
         # Vista
         self.view = MainWindow(self)
         
         # Estado
-        self.target_position = {'x': 2.0, 'y': 1.0, 'z': 2.0}
+        self.target_position = np.array([2.0, 1.0, 2.0])
         self.is_animating = False
+        self.solver_name = 'genetic'
+        self.solve_time_budget: Optional[float] = None  # segundos por solve()
         
-        # Timer para actualización de UI
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_ui)
-        self.update_timer.start(50)  # 20 FPS
+        # Progreso del solver: el hilo publica y un timer lo muestrea mientras resuelve
+        self.progress_channel = ProgressChannel()
+        self.progress_timer = QTimer()
+        self.progress_timer.timeout.connect(self.on_progress_tick)
+        self.set_max_ui_rate(max_ui_rate)
+        
+        # Reproducción del movimiento: cuadros precalculados, el timer solo los indexa
+        self.trajectory: Optional[JointTrajectory] = None
+        self.playback_started = 0.0
+        self.playback_timer = QTimer()
+        self.playback_timer.setInterval(int(round(1000.0 / PLAYBACK_FPS)))
+        self.playback_timer.timeout.connect(self.on_playback_tick)
         
         # Inicializar
         self.initialize()
@@ -68,32 +135,39 @@ class MainController:
         # Resetear brazo a posición por defecto
         self.arm_model.reset_to_default_position()
         
+        # Motores de cinemática inversa disponibles
+        self.view.set_solver_options(SOLVER_LABELS, self.solver_name)
+        self.view.gl_widget.set_obstacles(self.obstacle_scene)
+        
         # Actualizar vista inicial
         self.update_view()
     
     def update_view(self):
-        """Actualizar toda la vista"""
-        # Obtener datos del modelo
-        joint_positions = self.arm_model.get_joint_positions()
-        end_effector_pos = self.arm_model.get_end_effector_position()
-        angles = self.arm_model.get_angles()
-        distance = self.arm_model.calculate_distance_to_target(self.target_position)
+        """Actualizar toda la vista
         
-        # Actualizar vista
-        self.view.update_arm_display(joint_positions)
+        Se llama solo cuando cambian el modelo o el objetivo; la vista ignora
+        los valores que no cambiaron (no repinta ni reescribe etiquetas).
+        """
+        # Actualizar vista directamente desde los arreglos del modelo
+        self.view.update_arm_display(self.arm_model.joint_positions)
         self.view.update_target_display(self.target_position)
+        angles = self.arm_model.array_to_angles(self.arm_model.angles)
         self.view.update_angle_labels(angles)
+        self._show_status("Listo" if not self.is_animating else "Calculando...")
+    
+    def _show_status(self, status: str):
+        """Mostrar posición, objetivo y distancia actuales con un estado"""
         self.view.update_info_labels(
-            end_effector_pos,
+            self.arm_model.end_effector,
             self.target_position,
-            distance,
-            "Listo" if not self.is_animating else "Calculando..."
+            self.arm_model.distance_to(self.target_position),
+            status
         )
     
-    def update_ui(self):
-        """Actualizar UI (llamado por timer)"""
-        if not self.is_animating:
-            self.update_view()
+    def set_max_ui_rate(self, updates_per_second: float):
+        """Fijar el máximo de actualizaciones por segundo de la vista al calcular"""
+        self.max_ui_rate = max(1.0, float(updates_per_second))
+        self.progress_timer.setInterval(int(round(1000.0 / self.max_ui_rate)))
     
     def on_angle_changed(self):
         """Manejador para cambio de ángulos"""
@@ -104,7 +178,7 @@ class MainController:
         angles = self.view.get_angle_values()
         
         # Actualizar modelo
-        self.arm_model.set_angles(angles)
+        self.arm_model.set_angles_array(self.arm_model.angles_to_array(angles))
         
         # Actualizar vista
         self.update_view()
@@ -115,7 +189,10 @@ class MainController:
             return
         
         # Obtener objetivo de la vista
-        self.target_position = self.view.get_target_values()
+        target_position = as_point(self.view.get_target_values())
+        if np.array_equal(target_position, self.target_position):
+            return
+        self.target_position = target_position
         
         # Actualizar vista
         self.update_view()
@@ -125,58 +202,141 @@ class MainController:
         if self.is_animating:
             return
         
+        # Aplicar un cambio de objetivo que siga esperando el debounce
+        self.view.flush_target_update()
+        
         # Verificar si el objetivo es alcanzable
-        if not self.arm_model.is_target_reachable(self.target_position):
-            self.view.update_info_labels(
-                self.arm_model.get_end_effector_position(),
-                self.target_position,
-                self.arm_model.calculate_distance_to_target(self.target_position),
-                "Objetivo fuera de alcance"
-            )
+        if not self.arm_model.is_reachable(self.target_position):
+            self._show_status("Objetivo fuera de alcance")
             return
         
-        # Crear solver genético
-        self.genetic_solver = GeneticSolver(
+        # Acierto exacto en caché: aplicar sin resolver
+        self.solver_name = self.view.get_solver_name() or self.solver_name
+        cached_solution = self.solution_cache.get(self.target_position, tolerance=0.01)
+        if cached_solution is not None:
+            self.on_genetic_finished(cached_solution)
+            return
+        
+        # Crear solver con el motor seleccionado, sembrado con objetivos cercanos
+        # y las configuraciones conocidas más próximas del índice
+        options = {}
+        if self.solver_name in ADAPTIVE_SOLVERS:
+            # Mutación adaptativa, reinicios y parada al estancarse
+            options['adaptive'] = True
+        if self.solver_name == 'islands':
+            # Un solo pool para todos los cálculos: arrancar procesos cuesta décimas
+            if self.island_executor is None:
+                self.island_executor = create_island_executor()
+            options['executor'] = self.island_executor
+        self.genetic_solver = create_solver(
+            self.solver_name,
             self.arm_model,
             self.target_position,
-            population_size=100,
-            generations=200
+            self.constraints,
+            **options
         )
+        initial_guesses = self.solution_cache.nearby(self.target_position)
+        if self.workspace_index is not None:
+            initial_guesses += self.workspace_index.nearest_solutions(
+                self.target_position
+            )
+        self.genetic_solver.set_initial_guesses(initial_guesses)
+        self.solve_time_budget = self.view.get_time_budget()
+        self.genetic_solver.set_time_budget(self.solve_time_budget)
         
         # Crear y ejecutar thread
-        self.genetic_thread = GeneticThread(self.genetic_solver)
-        self.genetic_thread.progress.connect(self.on_genetic_progress)
+        self.progress_channel.clear()
+        self.genetic_thread = GeneticThread(self.genetic_solver, self.progress_channel)
         self.genetic_thread.finished.connect(self.on_genetic_finished)
         self.genetic_thread.error.connect(self.on_genetic_error)
         
         # Iniciar animación
         self.is_animating = True
         self.view.set_visualize_enabled(False)
-        self.view.update_info_labels(
-            self.arm_model.get_end_effector_position(),
-            self.target_position,
-            self.arm_model.calculate_distance_to_target(self.target_position),
-            "Calculando movimiento..."
-        )
+        self._show_status("Calculando movimiento...")
         
         self.genetic_thread.start()
+        self.progress_timer.start()
+        self.view.set_cancel_enabled(True)
+    
+    def on_progress_tick(self):
+        """Mostrar la solución intermedia más reciente (llamado por timer)"""
+        solution = self.progress_channel.take()
+        if solution is not None:
+            self.on_genetic_progress(solution)
     
     def on_genetic_progress(self, solution: Dict[str, float]):
-        """Manejador para progreso del algoritmo genético"""
+        """Manejador para progreso del algoritmo genético
+        
+        El brazo no salta entre las soluciones intermedias (pueden no tener
+        relación entre sí): solo se informa la mejor distancia hasta ahora.
+        """
         if not self.is_animating:
             return
         
-        # Aplicar solución al modelo
-        self.arm_model.set_angles(solution)
-        
-        # Actualizar vista
-        self.update_view()
+        solution_array = self.arm_model.angles_to_array(solution)
+        end_effector = self.arm_model.forward_kinematics_batch(solution_array)[-1]
+        distance = float(np.linalg.norm(end_effector - self.target_position))
+        self._show_status(f"Calculando movimiento... (mejor distancia {distance:.3f})")
     
     def on_genetic_finished(self, solution: Dict[str, float]):
         """Manejador para finalización del algoritmo genético"""
-        # Aplicar solución final
-        self.arm_model.set_angles(solution)
-        self.view.set_angle_values(solution)
+        self._stop_progress()
+        goal = self.arm_model.angles_to_array(solution)
+        
+        # Guardar en caché para objetivos repetidos o cercanos
+        self.solution_cache.put(
+            self.target_position,
+            solution,
+            self.arm_model.forward_kinematics_batch(goal)[-1]
+        )
+        
+        # Mover el brazo hacia la solución con una trayectoria suave
+        self.start_playback(goal)
+    
+    def start_playback(self, goal):
+        """Precalcular la trayectoria de mínimo jerk hasta `goal` y reproducirla"""
+        self.trajectory = JointTrajectory.minimum_jerk(
+            self.arm_model,
+            self.arm_model.angles,
+            goal,
+            frame_rate=PLAYBACK_FPS
+        )
+        self.playback_started = time.perf_counter()
+        
+        # También al aplicar una solución de la caché: bloquear la entrada hasta llegar
+        self.is_animating = True
+        self.view.set_visualize_enabled(False)
+        self.playback_timer.start()
+    
+    def on_playback_tick(self):
+        """Mostrar el cuadro del instante actual (llamado por timer)"""
+        trajectory = self.trajectory
+        frame = trajectory.frame_at(time.perf_counter() - self.playback_started)
+        
+        positions = trajectory.positions[frame]
+        self.view.update_arm_display(positions)
+        self.view.update_angle_labels(
+            self.arm_model.array_to_angles(trajectory.angles[frame])
+        )
+        self.view.update_info_labels(
+            positions[-1],
+            self.target_position,
+            float(np.linalg.norm(positions[-1] - self.target_position)),
+            "Moviendo..."
+        )
+        
+        if frame == len(trajectory) - 1:
+            self._finish_playback()
+    
+    def _finish_playback(self):
+        """Dejar el brazo en el último cuadro y devolver el control al usuario"""
+        self.playback_timer.stop()
+        goal = self.trajectory.angles[-1]
+        self.trajectory = None
+        
+        self.arm_model.set_angles_array(goal)
+        self.view.set_angle_values(self.arm_model.array_to_angles(goal))
         
         # Finalizar animación
         self.is_animating = False
@@ -187,17 +347,25 @@ class MainController:
     
     def on_genetic_error(self, error_msg: str):
         """Manejador para error del algoritmo genético"""
+        self._stop_progress()
+        
         # Finalizar animación
         self.is_animating = False
         self.view.set_visualize_enabled(True)
         
         # Mostrar error
-        self.view.update_info_labels(
-            self.arm_model.get_end_effector_position(),
-            self.target_position,
-            self.arm_model.calculate_distance_to_target(self.target_position),
-            f"Error: {error_msg}"
-        )
+        self._show_status(f"Error: {error_msg}")
+    
+    def cancel_solve(self):
+        """Cancelar el cálculo en curso; se aplica la mejor solución encontrada"""
+        if self.genetic_thread is not None and self.genetic_thread.isRunning():
+            self.genetic_thread.stop()
+    
+    def _stop_progress(self):
+        """Dejar de muestrear el progreso y descartar lo que quede en el canal"""
+        self.progress_timer.stop()
+        self.progress_channel.clear()
+        self.view.set_cancel_enabled(False)
     
     def reset_arm(self):
         """Resetear brazo a posición por defecto"""
@@ -205,13 +373,24 @@ class MainController:
             return
         
         self.arm_model.reset_to_default_position()
-        self.view.set_angle_values(self.arm_model.get_angles())
+        self.view.set_angle_values(
+            self.arm_model.array_to_angles(self.arm_model.angles)
+        )
         self.update_view()
     
     def reset_view(self):
         """Resetear vista 3D"""
         self.view.gl_widget.reset_view()
     
+    def shutdown(self):
+        """Cancelar el cálculo en curso y cerrar el pool de procesos de las islas"""
+        self.cancel_solve()
+        if self.genetic_thread is not None:
+            self.genetic_thread.wait()
+        if self.island_executor is not None:
+            self.island_executor.shutdown(wait=False, cancel_futures=True)
+            self.island_executor = None
+    
     def show(self):
         """Mostrar la ventana"""
         self.view.show()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Canal de progreso - Último valor publicado por el solver, muestreado por la UI
+"""
+
+import threading
+from typing import Any, Optional
+
+class ProgressChannel:
+    """Ranura "el último valor gana" entre el hilo del solver y la UI
+    
+    El solver publica cada generación sin esperar a la UI (una asignación bajo
+    un lock) y la UI toma el valor más reciente a su propio ritmo; las
+    generaciones intermedias que nadie llegó a leer se descartan.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self.published = 0
+        self.dropped = 0
+    
+    def publish(self, value: Any) -> None:
+        """
+        Publicar un valor, reemplazando el anterior si no se leyó
+        
+        Args:
+            value: Solución intermedia
+        """
+        with self._lock:
+            if self._value is not None:
+                self.dropped += 1
+            self._value = value
+            self.published += 1
+    
+    def take(self) -> Optional[Any]:
+        """
+        Tomar el último valor publicado y vaciar la ranura
+        
+        Returns:
+            El valor más reciente, o None si no hubo nada nuevo
+        """
+        with self._lock:
+            value, self._value = self._value, None
+            return value
+    
+    def clear(self) -> None:
+        """Descartar el valor pendiente y reiniciar los contadores"""
+        with self._lock:
+            self._value = None
+            self.published = 0
+            self.dropped = 0
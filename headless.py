@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Cinemática inversa sin interfaz gráfica - JSONL de objetivos a JSONL de soluciones
+
+Cada línea de entrada es un objeto {"id": ..., "x": ..., "y": ..., "z": ...};
+cada línea de salida repite el id con los ángulos en grados y la distancia
+residual, en el orden en que terminan los trabajos. Con --metrics se escriben
+además las métricas de cada solve() (SolverMetrics) en otro archivo JSONL.
+
+    python headless.py objetivos.jsonl -o soluciones.jsonl --workers 8
+    cat objetivos.jsonl | python headless.py - --solver dls
+"""
+
+import sys
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+# Agregar directorios al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.arm_model import ArmModel
+from models.constraints import Constraint, SelfCollisionConstraint
+from models.ik_solver import IKSolver
+from models.island_solver import create_island_executor
+from models.reachability import ReachabilityGrid
+from models.scene import ObstacleConstraint, ObstacleScene
+from models.solvers import SOLVERS, create_solver
+
+# Modelo del brazo de cada proceso trabajador
+_arm_model: Optional[ArmModel] = None
+
+# Escena de obstáculos de cada proceso trabajador, por ruta del archivo
+_obstacle_scenes: Dict[str, ObstacleScene] = {}
+
+
+def _solve_chunk(chunk: List[Tuple[int, str]], solver_name: str,
+                 with_metrics: bool = False, time_budget: Optional[float] = None,
+                 self_collision: bool = True, obstacles: Optional[str] = None,
+                 island_executor: Optional[ProcessPoolExecutor] = None,
+                 island_workers: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """
+    Resolver un bloque de líneas de entrada
+
+    Args:
+        chunk: Pares (número de línea, texto de la línea)
+        solver_name: Motor de cinemática inversa
+        with_metrics: Devolver también los registros de métricas
+        time_budget: Segundos por objetivo como máximo (None: sin límite)
+        self_collision: Descartar soluciones con el brazo chocando consigo mismo
+        obstacles: Archivo JSON de la escena de obstáculos (opcional)
+        island_executor: Pool de las islas compartido entre bloques (solo
+            en el proceso principal)
+        island_workers: Procesos del pool de islas propio del bloque, que
+            se cierra al terminarlo (por defecto, uno por núcleo)
+
+    Returns:
+        Líneas JSON de salida y líneas JSON de métricas
+    """
+    global _arm_model
+    if _arm_model is None:
+        _arm_model = ArmModel()
+        _arm_model.reachability_grid = ReachabilityGrid.load_or_build(_arm_model)
+
+    constraints = [SelfCollisionConstraint(_arm_model)] if self_collision else []
+    # Con autocolisión, los objetivos dentro de la base no se pueden alcanzar
+    excluded_radius = constraints[0].base_clearance if constraints else 0.0
+    _arm_model.reachability_grid.excluded_radius = excluded_radius
+    if obstacles is not None:
+        if obstacles not in _obstacle_scenes:
+            _obstacle_scenes[obstacles] = ObstacleScene.load(obstacles)
+        constraints.append(ObstacleConstraint(_obstacle_scenes[obstacles]))
+    # Los trabajadores del pool no ejecutan atexit: el pool de islas creado
+    # aquí se cierra al acabar el bloque o sus procesos bloquean la salida
+    owns_island_executor = solver_name == 'islands' and island_executor is None
+    if owns_island_executor:
+        island_executor = create_island_executor(island_workers)
+    lines = []
+    metrics_lines = []
+    try:
+        for line_number, line in chunk:
+            result, solver = _solve_line(_arm_model, line_number, line, solver_name,
+                                         time_budget, constraints, island_executor)
+            lines.append(json.dumps(result))
+            if with_metrics and solver is not None:
+                metrics_lines.extend(
+                    json.dumps(record)
+                    for record in solver.metrics.records(id=result['id'])
+                )
+    finally:
+        if owns_island_executor:
+            island_executor.shutdown(cancel_futures=True)
+
+    return lines, metrics_lines
+
+
+def _solve_line(arm_model: ArmModel, line_number: int, line: str, solver_name: str,
+                time_budget: Optional[float] = None,
+                constraints: Optional[List[Constraint]] = None,
+                island_executor: Optional[ProcessPoolExecutor] = None
+                ) -> Tuple[Dict, Optional[IKSolver]]:
+    """Resolver un objetivo y construir su registro de salida"""
+    try:
+        record = json.loads(line)
+        target = {axis: float(record[axis]) for axis in ('x', 'y', 'z')}
+    except (ValueError, KeyError, TypeError) as e:
+        return {'line': line_number, 'error': f"Entrada inválida: {e}"}, None
+
+    result = {'id': record.get('id', line_number), 'target': target}
+
+    if not arm_model.is_target_reachable(target):
+        result['error'] = "Objetivo fuera de alcance"
+        return result, None
+
+    options = {}
+    if island_executor is not None:
+        options['executor'] = island_executor
+    solver = create_solver(solver_name, arm_model, target, constraints, **options)
+    solver.set_time_budget(time_budget)
+    solution = solver.solve()
+    if solution is None:
+        result['error'] = "No se encontró solución"
+        return result, solver
+
+    positions = arm_model.forward_kinematics_batch(arm_model.angles_to_array(solution))
+    end_effector = positions[-1]
+    result['angles'] = solution
+    offset = end_effector - [target['x'], target['y'], target['z']]
+    result['residual'] = float(np.linalg.norm(offset))
+    if any(constraint.violation(positions[None])[0] > 0.0
+           for constraint in constraints or ()):
+        result['constraint_violation'] = True
+    if solver.metrics.stop_reason is not None:
+        result['stop_reason'] = solver.metrics.stop_reason
+    return result, solver
+
+
+def _read_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Leer la entrada en bloques de líneas no vacías, sin cargarla completa"""
+    lines = ((number, line) for number, line in enumerate(stream, start=1)
+             if line.strip())
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(input_stream: TextIO, output_stream: TextIO, solver_name: str = 'genetic',
+        workers: int = 1, chunk_size: int = 64, max_pending: Optional[int] = None,
+        metrics_stream: Optional[TextIO] = None, time_budget: Optional[float] = None,
+        self_collision: bool = True, obstacles: Optional[str] = None) -> int:
+    """
+    Procesar un flujo JSONL de objetivos
+
+    Args:
+        input_stream: Entrada JSONL
+        output_stream: Salida JSONL
+        solver_name: Motor de cinemática inversa
+        workers: Procesos trabajadores (1 resuelve en este proceso)
+        chunk_size: Líneas por trabajo enviado al pool
+        max_pending: Trabajos en vuelo como máximo (acota la memoria)
+        metrics_stream: Salida JSONL de métricas por objetivo (opcional)
+        time_budget: Segundos por objetivo como máximo; se devuelve la mejor
+            solución encontrada en ese tiempo (None: sin límite)
+        self_collision: Penalizar en el fitness los segmentos que se cruzan
+            entre sí o con la base
+        obstacles: Archivo JSON de la escena de obstáculos (ver
+            `ObstacleScene.from_dict`); sus colisiones también se penalizan
+
+    Returns:
+        Número de líneas escritas
+    """
+    written = 0
+    with_metrics = metrics_stream is not None
+
+    def write(results: Tuple[List[str], List[str]]) -> None:
+        nonlocal written
+        lines, metrics_lines = results
+        output_stream.write(''.join(line + '\n' for line in lines))
+        output_stream.flush()
+        if with_metrics:
+            metrics_stream.write(''.join(line + '\n' for line in metrics_lines))
+            metrics_stream.flush()
+        written += len(lines)
+
+    if workers <= 1:
+        # Un solo pool de islas para toda la entrada
+        island_executor = create_island_executor() if solver_name == 'islands' else None
+        try:
+            for chunk in _read_chunks(input_stream, chunk_size):
+                write(_solve_chunk(chunk, solver_name, with_metrics, time_budget,
+                                   self_collision, obstacles, island_executor))
+        finally:
+            if island_executor is not None:
+                island_executor.shutdown(cancel_futures=True)
+        return written
+
+    # Construir la rejilla de alcanzabilidad una vez; los trabajadores la leen del disco
+    ReachabilityGrid.load_or_build(ArmModel())
+
+    max_pending = max_pending or workers * 2
+    # Repartir los núcleos: cada trabajador abre su propio pool de islas
+    island_workers = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in _read_chunks(input_stream, chunk_size):
+            # Esperar a que haya hueco antes de leer más entrada
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+            pending.add(executor.submit(_solve_chunk, chunk, solver_name, with_metrics,
+                                        time_budget, self_collision, obstacles,
+                                        None, island_workers))
+
+        # Los últimos trabajos también se escriben según terminan
+        for future in as_completed(pending):
+            write(future.result())
+
+    return written
+
+
+def main():
+    """Función principal sin interfaz gráfica"""
+    parser = argparse.ArgumentParser(description="Cinemática inversa por lotes (JSONL)")
+    parser.add_argument('input', help="Archivo JSONL de objetivos o '-' para stdin")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Archivo JSONL de salida (por defecto stdout)")
+    parser.add_argument('--solver', default='genetic', choices=sorted(SOLVERS),
+                        help="Motor de cinemática inversa "
+                             "(por defecto, el algoritmo genético)")
+    parser.add_argument('--workers', type=int, default=1, help="Procesos trabajadores")
+    parser.add_argument('--chunk-size', type=int, default=64, help="Líneas por trabajo")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="Trabajos en vuelo como máximo")
+    parser.add_argument('--metrics', default=None,
+                        help="Archivo JSONL de métricas por objetivo")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="Milisegundos por objetivo como máximo "
+                             "(mejor solución hasta entonces)")
+    parser.add_argument('--allow-self-collision', action='store_true',
+                        help="No penalizar los segmentos que se cruzan entre sí "
+                             "o con la base")
+    parser.add_argument('--obstacles', default=None,
+                        help="Archivo JSON de obstáculos (esferas, cajas y cápsulas) "
+                             "a evitar")
+    args = parser.parse_args()
+
+    input_stream = sys.stdin if args.input == '-' else open(args.input)
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+    metrics_stream = open(args.metrics, 'w') if args.metrics else None
+
+    try:
+        run(input_stream, output_stream, args.solver, args.workers,
+            args.chunk_size, args.max_pending, metrics_stream,
+            args.time_budget / 1000.0 if args.time_budget is not None else None,
+            not args.allow_self_collision, args.obstacles)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+        if metrics_stream is not None:
+            metrics_stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Servidor de cinemática inversa - HTTP local con micro-lotes entre peticiones
+
+Cada POST /solve lleva un objeto {"id": ..., "x": ..., "y": ..., "z": ...,
+"deadline_ms": ...} y recibe el mismo registro que una línea de headless.py.
+Las peticiones que llegan dentro de una ventana corta (--batch-window) se
+resuelven juntas con una sola llamada a `BatchSolver.solve_independent`, así
+que un proceso atiende a muchos clientes con el coste de un solve
+vectorizado por lote. GET /health devuelve las estadísticas del servidor.
+
+    python ik_server.py --port 8765
+    python ik_server.py --unix /tmp/ik.sock
+    curl -s localhost:8765/solve -d '{"id": 1, "x": 2.0, "y": 1.0, "z": 2.0}'
+"""
+
+import sys
+import os
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Agregar directorios al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.arm_model import ArmModel
+from models.batch_solver import BatchSolver
+from models.constraints import Constraint, SelfCollisionConstraint
+from models.reachability import ReachabilityGrid
+from models.scene import ObstacleConstraint, ObstacleScene
+
+# Textos de los códigos de estado que devuelve el servidor
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    422: 'Unprocessable Entity',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+    504: 'Gateway Timeout',
+}
+
+# Tamaño máximo del cuerpo de una petición
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ServerOverloaded(Exception):
+    """La cola de peticiones pendientes está llena"""
+
+
+class DeadlineExceeded(Exception):
+    """El plazo de la petición venció antes de resolverla"""
+
+
+class MicroBatcher:
+    """Agrupa objetivos de peticiones concurrentes en un solo solve por lotes
+
+    `submit` encola un objetivo y devuelve un futuro. Un bucle toma el primer
+    objetivo pendiente, espera como mucho `batch_window` segundos a que
+    lleguen más (hasta `max_batch`) y resuelve todos a la vez en un hilo
+    aparte, para que el bucle de eventos siga aceptando peticiones mientras
+    tanto; lo que llega durante un solve forma el lote siguiente. La cola
+    admite `max_pending` objetivos: con ella llena, `submit` lanza
+    `ServerOverloaded` en lugar de acumular retraso. Los objetivos cuyo plazo
+    ya venció, o cuyo cliente dejó de esperar, se descartan antes de
+    resolver, y cada lote se limita al plazo más cercano de los suyos menos
+    `delivery_margin` (lo que cuesta entregar el resultado): al agotarse,
+    todos reciben la mejor solución encontrada hasta entonces.
+    Las `constraints` (autocolisión y obstáculos, como en headless.py) se
+    penalizan dentro del refinamiento.
+    """
+
+    def __init__(self, arm_model: ArmModel, batch_window: float = 0.002,
+                 max_batch: int = 256, max_pending: int = 4096,
+                 max_iterations: int = 50, restarts: int = 8,
+                 seed: Optional[int] = None,
+                 constraints: Optional[List[Constraint]] = None,
+                 delivery_margin: float = 0.005):
+        """
+        Inicializar el agrupador
+
+        Args:
+            arm_model: Modelo del brazo
+            batch_window: Segundos que se espera a completar un lote
+            max_batch: Objetivos por lote como máximo
+            max_pending: Objetivos en cola como máximo (contrapresión)
+            max_iterations: Iteraciones de mínimos cuadrados amortiguados
+            restarts: Arranques aleatorios por objetivo
+            seed: Semilla del generador aleatorio
+            constraints: Restricciones del fitness (por defecto, autocolisión)
+            delivery_margin: Segundos que el solve de un lote deja libres
+                antes del plazo para comprobar y entregar los resultados
+        """
+        self.arm_model = arm_model
+        self.batch_window = batch_window
+        self.max_batch = max(1, max_batch)
+        self.max_pending = max(1, max_pending)
+        self.delivery_margin = delivery_margin
+        if constraints is None:
+            constraints = [SelfCollisionConstraint(arm_model)]
+        self.constraints = constraints
+        self.solver = BatchSolver(arm_model, max_iterations, restarts, seed,
+                                  constraints)
+
+        self.stats = {'requests': 0, 'solved': 0, 'batches': 0, 'rejected': 0,
+                      'expired': 0, 'largest_batch': 0}
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Un solo hilo: el solver y su generador aleatorio no se comparten
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def pending(self) -> int:
+        """Objetivos en cola sin resolver"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Arrancar el bucle de lotes en el bucle de eventos actual"""
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Detener el bucle de lotes y el hilo del solver"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    def submit(self, target: np.ndarray, deadline: float) -> asyncio.Future:
+        """
+        Encolar un objetivo
+
+        Args:
+            target: Objetivo (3,)
+            deadline: Instante límite, en el reloj del bucle de eventos
+
+        Returns:
+            Futuro con los ángulos (6,) en grados, la distancia residual y si
+            la solución viola alguna restricción
+
+        Raises:
+            ServerOverloaded: Si la cola está llena
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((target, deadline, future))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise ServerOverloaded(f"{self.max_pending} objetivos en cola") from None
+        self.stats['requests'] += 1
+        return future
+
+    async def _run(self) -> None:
+        """Formar lotes y resolverlos mientras el servidor esté en marcha"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(loop)
+            batch = self._drop_expired(batch, loop.time())
+            if not batch:
+                continue
+
+            targets = np.array([target for target, _, _ in batch])
+            # Terminar antes del plazo: el resultado aún tiene que llegar al cliente
+            earliest = min(deadline for _, deadline, _ in batch)
+            time_budget = max(0.0, earliest - loop.time() - self.delivery_margin)
+            try:
+                angles, residuals, violations = await loop.run_in_executor(
+                    self._executor, self._solve, targets, time_budget)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['solved'] += len(batch)
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+            for i, (_, _, future) in enumerate(batch):
+                if not future.done():
+                    future.set_result((angles[i], float(residuals[i]),
+                                       bool(violations[i])))
+
+    async def _collect(self, loop: asyncio.AbstractEventLoop
+                       ) -> List[Tuple[np.ndarray, float, asyncio.Future]]:
+        """Esperar un objetivo y reunir los que lleguen dentro de la ventana"""
+        batch = [await self._queue.get()]
+        closes = loop.time() + self.batch_window
+        while len(batch) < self.max_batch:
+            # Lo que ya está en cola entra sin esperar
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = closes - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _drop_expired(self, batch: List[Tuple[np.ndarray, float, asyncio.Future]],
+                      now: float) -> List[Tuple[np.ndarray, float, asyncio.Future]]:
+        """Descartar los objetivos vencidos o que nadie espera"""
+        alive = []
+        for item in batch:
+            _, deadline, future = item
+            if future.done():
+                self.stats['expired'] += 1
+            elif now >= deadline:
+                self.stats['expired'] += 1
+                future.set_exception(DeadlineExceeded())
+            else:
+                alive.append(item)
+        return alive
+
+    def _solve(self, targets: np.ndarray,
+               time_budget: Optional[float] = None
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Resolver un lote (en el hilo del solver) en `time_budget` segundos o menos"""
+        angles, residuals = self.solver.solve_independent(targets, time_budget)
+        positions = self.arm_model.forward_kinematics_batch(angles)
+        violations = np.zeros(len(angles), dtype=bool)
+        for constraint in self.constraints:
+            violations |= constraint.violation(positions) > 0.0
+        return angles, residuals, violations
+
+
+class IKServer:
+    """Servidor HTTP/1.1 mínimo sobre asyncio delante de un `MicroBatcher`
+
+    Admite conexiones persistentes (keep-alive), así que un cliente puede
+    enviar muchas peticiones por la misma conexión. Responde 503 con
+    Retry-After cuando la cola está llena y 504 cuando vence el plazo de la
+    petición (`deadline_ms`, o `default_deadline` si no lo indica) antes de
+    que su objetivo entre en un lote. El plazo lo hace cumplir el
+    `MicroBatcher`, que entrega la mejor solución al vencer; la petición
+    solo espera `response_grace` segundos más por si el solver se bloquea.
+    """
+
+    def __init__(self, batcher: MicroBatcher, default_deadline: float = 1.0,
+                 response_grace: float = 0.5):
+        """
+        Inicializar el servidor
+
+        Args:
+            batcher: Agrupador que resuelve los objetivos
+            default_deadline: Plazo en segundos de las peticiones sin deadline_ms
+            response_grace: Segundos que se espera al lote después del plazo
+        """
+        self.batcher = batcher
+        self.arm_model = batcher.arm_model
+        self.default_deadline = default_deadline
+        self.response_grace = response_grace
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765,
+                    unix_path: Optional[str] = None) -> None:
+        """
+        Atender peticiones hasta que se cancele la tarea
+
+        Args:
+            host: Dirección TCP
+            port: Puerto TCP
+            unix_path: Socket Unix en lugar de TCP (opcional)
+        """
+        self.batcher.start()
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self.handle_connection,
+                                                     path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Atender las peticiones de una conexión hasta que se cierre"""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                status, payload, extra_headers = await self.dispatch(method, path, body)
+                self._write_response(writer, status, payload, extra_headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            # Cabeceras ilegibles o demasiado grandes
+            self._write_response(writer, 400, {'error': f"Petición inválida: {e}"}, {},
+                                 False)
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str,
+                       body: bytes) -> Tuple[int, Dict, Dict[str, str]]:
+        """
+        Responder a una petición
+
+        Args:
+            method: Método HTTP
+            path: Ruta pedida
+            body: Cuerpo de la petición
+
+        Returns:
+            Código de estado, cuerpo JSON y cabeceras adicionales
+        """
+        if path == '/health':
+            if method != 'GET':
+                return 405, {'error': "Use GET"}, {'Allow': 'GET'}
+            return 200, dict(self.batcher.stats, pending=self.batcher.pending), {}
+        if path != '/solve':
+            return 404, {'error': f"Ruta desconocida: {path}"}, {}
+        if method != 'POST':
+            return 405, {'error': "Use POST"}, {'Allow': 'POST'}
+        return await self.solve(body)
+
+    async def solve(self, body: bytes) -> Tuple[int, Dict, Dict[str, str]]:
+        """Resolver el objetivo de un POST /solve"""
+        try:
+            record = json.loads(body)
+            target = {axis: float(record[axis]) for axis in ('x', 'y', 'z')}
+            deadline_ms = record.get('deadline_ms')
+            timeout = self.default_deadline
+            if deadline_ms is not None:
+                timeout = float(deadline_ms) / 1000.0
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': f"Entrada inválida: {e}"}, {}
+
+        result = {'id': record.get('id'), 'target': target}
+        if not self.arm_model.is_target_reachable(target):
+            result['error'] = "Objetivo fuera de alcance"
+            return 422, result, {}
+
+        loop = asyncio.get_running_loop()
+        try:
+            point = np.array([target['x'], target['y'], target['z']])
+            future = self.batcher.submit(point, loop.time() + timeout)
+        except ServerOverloaded as e:
+            result['error'] = f"Servidor saturado: {e}"
+            return 503, result, {'Retry-After': '1'}
+
+        try:
+            # Un lote ya empezado entrega su mejor solución al vencer el plazo
+            angles, residual, violation = await asyncio.wait_for(
+                future, timeout + self.response_grace
+            )
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            result['error'] = "Plazo vencido"
+            return 504, result, {}
+        except Exception as e:
+            result['error'] = f"Error interno: {e}"
+            return 500, result, {}
+
+        result['angles'] = self.arm_model.array_to_angles(angles)
+        result['residual'] = residual
+        if violation:
+            result['constraint_violation'] = True
+        return 200, result, {}
+
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Leer una petición: método, ruta, cabeceras en minúsculas y cuerpo"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise
+            return None
+        except asyncio.LimitOverrunError:
+            raise ValueError("cabeceras demasiado grandes") from None
+
+        request_line, *header_lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, _ = request_line.split(' ', 2)
+        except ValueError:
+            raise ValueError(f"línea de petición: {request_line!r}") from None
+
+        headers = {}
+        for line in header_lines:
+            name, separator, value = line.partition(':')
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"cuerpo de {length} bytes")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Dict,
+                        extra_headers: Dict[str, str], keep_alive: bool) -> None:
+        """Escribir una respuesta JSON"""
+        body = json.dumps(payload).encode()
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+            **extra_headers,
+        }
+        head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+
+
+def main():
+    """Función principal del servidor"""
+    parser = argparse.ArgumentParser(
+        description="Servidor local de cinemática inversa con micro-lotes"
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección TCP")
+    parser.add_argument('--port', type=int, default=8765, help="Puerto TCP")
+    parser.add_argument('--unix', default=None, help="Socket Unix en lugar de TCP")
+    parser.add_argument('--batch-window', type=float, default=2.0,
+                        help="Milisegundos que se espera a completar un lote")
+    parser.add_argument('--max-batch', type=int, default=256,
+                        help="Objetivos por lote como máximo")
+    parser.add_argument('--max-pending', type=int, default=4096,
+                        help="Objetivos en cola como máximo; "
+                             "por encima se responde 503")
+    parser.add_argument('--deadline', type=float, default=1000.0,
+                        help="Plazo en milisegundos de las peticiones sin deadline_ms")
+    parser.add_argument('--restarts', type=int, default=8,
+                        help="Arranques aleatorios por objetivo")
+    parser.add_argument('--allow-self-collision', action='store_true',
+                        help="No penalizar los segmentos que se cruzan entre sí "
+                             "o con la base")
+    parser.add_argument('--obstacles', default=None,
+                        help="Archivo JSON de obstáculos (esferas, cajas y cápsulas) "
+                             "a evitar")
+    args = parser.parse_args()
+
+    arm_model = ArmModel()
+    arm_model.reachability_grid = ReachabilityGrid.load_or_build(arm_model)
+    constraints = []
+    if not args.allow_self_collision:
+        constraints.append(SelfCollisionConstraint(arm_model))
+    if constraints:
+        # Los objetivos dentro de la base no se pueden alcanzar sin atravesarla
+        arm_model.reachability_grid.excluded_radius = constraints[0].base_clearance
+    if args.obstacles is not None:
+        constraints.append(ObstacleConstraint(ObstacleScene.load(args.obstacles)))
+    batcher = MicroBatcher(arm_model, args.batch_window / 1000.0, args.max_batch,
+                           args.max_pending, restarts=args.restarts,
+                           constraints=constraints)
+    server = IKServer(batcher, args.deadline / 1000.0)
+
+    address = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Servidor de cinemática inversa en {address}", file=sys.stderr)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
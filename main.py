@@ -6,6 +6,7 @@ Patrón MVC - Modelo-Vista-Controlador
 
 import sys
 import os
+import argparse
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 
@@ -13,6 +14,7 @@ from PyQt5.QtCore import Qt
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from controllers.main_controller import MainController
+from models.scene import ObstacleScene
 
 def main():
     """Función principal de la aplicación"""
@@ -23,18 +25,28 @@ def main():
     print("🧬 Algoritmo genético para cinemática inversa")
     print("=" * 60)
     
+    # Argumentos propios; el resto queda para Qt
+    parser = argparse.ArgumentParser(description="Visualizador 3D del Brazo Robótico")
+    parser.add_argument('--obstacles', default=None,
+                        help="Archivo JSON de obstáculos (esferas, cajas y cápsulas) "
+                             "a evitar")
+    args, qt_args = parser.parse_known_args()
+    obstacle_scene = ObstacleScene.load(args.obstacles) if args.obstacles else None
+    
     # Crear aplicación Qt
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
     
     # Crear controlador principal
-    controller = MainController()
+    controller = MainController(obstacle_scene=obstacle_scene)
     
     # Mostrar ventana
     controller.show()
     
     # Ejecutar aplicación
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    controller.shutdown()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Control adaptativo del algoritmo genético - Estancamiento, diversidad y reinicios
+"""
+
+import numpy as np
+
+from models.solver_metrics import population_diversity
+
+# Acciones que devuelve `AdaptiveControl.update`
+CONTINUE, RESTART, STOP = 'continue', 'restart', 'stop'
+
+
+class AdaptiveControl:
+    """Ajuste en línea de la mutación, reinicios parciales y parada temprana
+
+    Se alimenta una vez por generación con el mejor fitness y la población.
+    Una generación mejora si baja el mejor fitness más que `min_improvement`
+    (relativo). La escala de las desviaciones de mutación sigue una regla de
+    éxito al estilo de la de 1/5 de las estrategias evolutivas: crece con cada
+    mejora y se reduce sin ella, así que pasos cada vez más finos afinan la
+    solución cerca del óptimo; la probabilidad de mutar crece con cada
+    generación sin mejora. Tras `restart_patience` generaciones sin mejora, o
+    un tercio de eso si la diversidad cayó por debajo de `diversity_floor`,
+    pide un reinicio parcial (la exploración global); tras `stop_patience`,
+    pide parar.
+
+    La diversidad se mide como la desviación estándar media por gen,
+    normalizada por la de una población uniforme en los límites (1: tan
+    dispersa como la inicial, 0: todos iguales).
+    """
+
+    def __init__(self, lower_bounds: np.ndarray, upper_bounds: np.ndarray,
+                 restart_patience: int = 15, stop_patience: int = 45,
+                 restart_fraction: float = 0.5, min_improvement: float = 1e-3,
+                 diversity_floor: float = 0.02, min_scale: float = 0.01,
+                 max_scale: float = 4.0, shrink: float = 0.8, grow: float = 1.1):
+        """
+        Inicializar el control
+
+        Args:
+            lower_bounds: Límite inferior de cada gen
+            upper_bounds: Límite superior de cada gen
+            restart_patience: Generaciones sin mejora antes de un reinicio parcial
+            stop_patience: Generaciones sin mejora antes de parar
+            restart_fraction: Fracción de la población que se reinicia
+            min_improvement: Mejora relativa del mejor fitness que cuenta como progreso
+            diversity_floor: Diversidad normalizada por debajo de la cual se
+                adelanta el reinicio
+            min_scale: Escala de mutación mínima
+            max_scale: Escala de mutación máxima
+            shrink: Factor de la escala en cada generación sin mejora
+            grow: Factor de la escala en cada generación con mejora
+        """
+        self.lower_bounds = np.asarray(lower_bounds, dtype=float)
+        self.upper_bounds = np.asarray(upper_bounds, dtype=float)
+        self.restart_patience = restart_patience
+        self.stop_patience = stop_patience
+        self.restart_fraction = restart_fraction
+        self.min_improvement = min_improvement
+        self.diversity_floor = diversity_floor
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.shrink = shrink
+        self.grow = grow
+
+        # Desviación estándar de una población uniforme en los límites
+        self._reference_diversity = float(
+            np.mean((self.upper_bounds - self.lower_bounds) / np.sqrt(12.0))
+        )
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Olvidar el estado de una ejecución anterior"""
+        self.mutation_scale = 1.0
+        self.diversity = 1.0
+        self.stalled_generations = 0
+        self.restarts = 0
+        self._best_fitness = float('inf')
+        self._since_restart = 0
+
+    def update(self, best_fitness: float, population: np.ndarray) -> str:
+        """
+        Registrar una generación y decidir la siguiente acción
+
+        Args:
+            best_fitness: Mejor fitness hasta ahora
+            population: Población actual (P, G)
+
+        Returns:
+            CONTINUE, RESTART (reiniciar parte de la población) o STOP
+        """
+        self.diversity = population_diversity(population) / self._reference_diversity
+
+        threshold = self._best_fitness - self.min_improvement * abs(self._best_fitness)
+        improved = best_fitness < threshold
+        if improved or not np.isfinite(self._best_fitness):
+            self._best_fitness = best_fitness
+            self.stalled_generations = 0
+            self._since_restart = 0
+            self.mutation_scale = min(self.max_scale, self.mutation_scale * self.grow)
+            return CONTINUE
+
+        self.stalled_generations += 1
+        self._since_restart += 1
+        self.mutation_scale = max(self.min_scale, self.mutation_scale * self.shrink)
+
+        if self.stalled_generations >= self.stop_patience:
+            return STOP
+
+        patience = self.restart_patience
+        if self.diversity < self.diversity_floor:
+            patience = max(1, patience // 3)
+        if self._since_restart >= patience:
+            self._since_restart = 0
+            self.restarts += 1
+            self.mutation_scale = 1.0
+            return RESTART
+
+        return CONTINUE
+
+    def scaled_rate(self, rate: float) -> float:
+        """Probabilidad de mutación aumentada mientras no hay mejora"""
+        return min(1.0, rate * (1.0 + self.stalled_generations))
+
+    def restart(self, population: np.ndarray, keep: int,
+                rng: np.random.Generator) -> np.ndarray:
+        """
+        Reemplazar la cola de una población por individuos aleatorios
+
+        Args:
+            population: Población (P, G) con los individuos a conservar al principio
+            keep: Individuos iniciales que nunca se reemplazan (la élite)
+            rng: Generador aleatorio
+
+        Returns:
+            Población con las últimas `restart_fraction` filas reiniciadas
+        """
+        start = max(keep,
+                    len(population) - int(len(population) * self.restart_fraction))
+        population = population.copy()
+        population[start:] = rng.uniform(
+            self.lower_bounds, self.upper_bounds,
+            size=(len(population) - start, population.shape[1])
+        )
+        return population
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Solver por lotes - Trayectorias y conjuntos de objetivos en una sola llamada
+"""
+
+from typing import List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from models.chain_model import ChainModel
+from models.constraints import Constraint
+from models.dls_solver import DampedLeastSquaresSolver
+from models.ik_solver import angle_bounds
+
+
+class BatchSolver:
+    """Cinemática inversa para arreglos (N, 3) de objetivos
+
+    `solve_trajectory` resuelve cada punto de paso partiendo de la solución
+    del anterior, de modo que un camino suave cuesta unas pocas iteraciones
+    por punto. `solve_independent` resuelve objetivos sin relación entre sí
+    como una única población vectorizada de N x `restarts` configuraciones.
+    Las `constraints` se penalizan en el error que minimiza cada paso, igual
+    que en los demás solvers; las distancias residuales devueltas son solo
+    la distancia al objetivo.
+    """
+
+    def __init__(self, arm_model: ChainModel, max_iterations: int = 50,
+                 restarts: int = 8, seed: Optional[int] = None,
+                 constraints: Optional[List[Constraint]] = None):
+        """
+        Inicializar el solver por lotes
+
+        Args:
+            arm_model: Modelo del brazo
+            max_iterations: Iteraciones máximas de mínimos cuadrados amortiguados
+            restarts: Arranques aleatorios por objetivo
+            seed: Semilla del generador aleatorio
+            constraints: Restricciones penalizadas en el refinamiento
+        """
+        self.arm_model = arm_model
+        self.max_iterations = max_iterations
+        self.restarts = max(1, restarts)
+        self.tolerance = 0.01  # 1cm
+        self.lower_bounds, self.upper_bounds = angle_bounds(arm_model)
+        self.rng = np.random.default_rng(seed)
+        self.constraints: List[Constraint] = list(constraints or [])
+
+    def solve_trajectory(self, targets: np.ndarray,
+                         initial_angles: Union[Mapping[str, float], np.ndarray,
+                                               None] = None
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolver una secuencia de puntos de paso con arranque en caliente
+
+        Args:
+            targets: Puntos de paso (N, 3)
+            initial_angles: Configuración de partida en grados, como arreglo
+                o diccionario (por defecto, la actual del brazo)
+
+        Returns:
+            Ángulos (N, 6) en grados y distancia residual por punto (N,)
+        """
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        if initial_angles is None:
+            previous = self.arm_model.angles.copy()
+        elif isinstance(initial_angles, Mapping):
+            previous = self.arm_model.angles_to_array(initial_angles)
+        else:
+            previous = np.array(initial_angles, dtype=float)
+        angles = np.zeros((len(targets), len(previous)))
+        residuals = np.zeros(len(targets))
+        solver = self._local_solver()
+
+        for i, target in enumerate(targets):
+            # Partir de la solución anterior
+            solution, errors = solver.refine(previous[None, :], target,
+                                             self.max_iterations)
+
+            # Si no converge, añadir arranques aleatorios
+            if errors[0] >= self.tolerance:
+                starts = np.vstack([solution, self._random_angles(self.restarts - 1)])
+                solution, errors = solver.refine(starts, target, self.max_iterations,
+                                                 stop_when_any=True)
+
+            best_index = int(np.argmin(errors))
+            angles[i] = previous = solution[best_index]
+            residuals[i] = errors[best_index]
+
+        if self.constraints:
+            residuals = self._distances(angles, targets)
+        return angles, residuals
+
+    def solve_independent(self, targets: np.ndarray,
+                          time_budget: Optional[float] = None
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolver objetivos independientes en una sola población vectorizada
+
+        Args:
+            targets: Objetivos (N, 3)
+            time_budget: Segundos como máximo; al agotarse se devuelve lo
+                mejor de cada objetivo hasta entonces (None: sin límite)
+
+        Returns:
+            Ángulos (N, 6) en grados y distancia residual por objetivo (N,)
+        """
+        targets = np.asarray(targets, dtype=float).reshape(-1, 3)
+        count = len(targets)
+        n_angles = len(self.lower_bounds)
+
+        # N x restarts configuraciones, cada fila con su objetivo
+        starts = self._random_angles(count * self.restarts)
+        repeated_targets = np.repeat(targets, self.restarts, axis=0)
+        solver = self._local_solver(time_budget)
+        solutions, errors = solver.refine(starts, repeated_targets, self.max_iterations)
+
+        solutions = solutions.reshape(count, self.restarts, n_angles)
+        errors = errors.reshape(count, self.restarts)
+        best = np.argmin(errors, axis=1)
+        rows = np.arange(count)
+
+        angles, residuals = solutions[rows, best], errors[rows, best]
+        if self.constraints:
+            residuals = self._distances(angles, targets)
+        return angles, residuals
+
+    def _local_solver(self,
+                      time_budget: Optional[float] = None) -> DampedLeastSquaresSolver:
+        """Solver de mínimos cuadrados amortiguados para refinar lotes"""
+        solver = DampedLeastSquaresSolver(self.arm_model,
+                                          {'x': 0.0, 'y': 0.0, 'z': 0.0})
+        solver.tolerance = self.tolerance
+        solver.constraints = self.constraints
+        solver.set_time_budget(time_budget)
+        solver._start_solve()
+        return solver
+
+    def _distances(self, angles: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Distancia del efector final de cada configuración a su objetivo (N,)"""
+        end_effectors = self.arm_model.forward_kinematics_batch(angles)[:, -1]
+        return np.linalg.norm(end_effectors - targets, axis=1)
+
+    def _random_angles(self, count: int) -> np.ndarray:
+        """Configuraciones aleatorias (count, 6) dentro de los límites"""
+        return self.rng.uniform(self.lower_bounds, self.upper_bounds,
+                                size=(count, len(self.lower_bounds)))
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Modelo de cadena cinemática - N segmentos con estado en arreglos contiguos
+"""
+
+import math
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from models.kinematics_kernel import compile_kernel
+
+# Punto 3D: diccionario {'x', 'y', 'z'} o secuencia (3,)
+Point = Union[Mapping[str, float], Sequence[float], np.ndarray]
+
+
+def as_point(point: Point) -> np.ndarray:
+    """
+    Convertir un punto a arreglo
+
+    Args:
+        point: Diccionario {'x', 'y', 'z'} o secuencia (3,)
+
+    Returns:
+        Arreglo (3,) de float
+    """
+    if isinstance(point, Mapping):
+        return np.array([point['x'], point['y'], point['z']], dtype=float)
+    return np.asarray(point, dtype=float).reshape(3)
+
+
+def point_to_dict(point: Point) -> Dict[str, float]:
+    """Convertir un punto a diccionario {'x', 'y', 'z'}"""
+    x, y, z = as_point(point)
+    return {'x': float(x), 'y': float(y), 'z': float(z)}
+
+
+class ChainModel:
+    """Cadena de N segmentos descrita por sus longitudes
+
+    El segmento i gira Rz(theta_i) @ Ry(gamma_i) respecto al anterior y se
+    extiende `link_lengths[i]` sobre su eje x. El estado vive en arreglos
+    contiguos: `angles` (2N,) en grados en el orden de `angle_names`
+    (theta1, gamma1, theta2, ...) y `joint_positions` (N + 1, 3) con la base,
+    las articulaciones y el efector final.
+
+    También guarda la rotación acumulada a la salida de cada segmento: al
+    cambiar un ángulo solo se recalculan los segmentos desde esa articulación
+    hacia el efector, sin rehacer el prefijo de la cadena.
+    """
+
+    __slots__ = (
+        'link_lengths', 'angles', 'joint_positions', 'reachability_grid',
+        '_angle_names', '_rotations', '_kernel'
+    )
+
+    def __init__(self, link_lengths: Sequence[float]):
+        """
+        Inicializar la cadena
+
+        Args:
+            link_lengths: Longitud de cada segmento
+        """
+        self.link_lengths = np.array(link_lengths, dtype=float)
+        if self.link_lengths.ndim != 1 or len(self.link_lengths) == 0:
+            raise ValueError("La cadena necesita al menos un segmento")
+
+        n_links = len(self.link_lengths)
+        self._angle_names = [
+            name for i in range(1, n_links + 1) for name in (f'theta{i}', f'gamma{i}')
+        ]
+
+        # Estado: ángulos en grados y posiciones de base, articulaciones y efector
+        self.angles = np.zeros(2 * n_links)
+        self.joint_positions = np.zeros((n_links + 1, 3))
+
+        # Rotación acumulada del marco de cada segmento (la 0 es la base)
+        self._rotations = np.zeros((n_links + 1, 3, 3))
+        self._rotations[0] = np.eye(3)
+
+        # Cinemática en forma cerrada generada para estas longitudes
+        self._kernel = compile_kernel(tuple(self.link_lengths.tolist()))
+
+        # Rejilla de alcanzabilidad opcional (models.reachability.ReachabilityGrid)
+        self.reachability_grid = None
+
+        self.update_positions()
+
+    @property
+    def n_links(self) -> int:
+        """Número de segmentos"""
+        return len(self.link_lengths)
+
+    @property
+    def angle_names(self) -> List[str]:
+        """Nombres de los ángulos en el orden usado por los arreglos"""
+        return list(self._angle_names)
+
+    @property
+    def max_reach(self) -> float:
+        """Alcance máximo: suma de las longitudes de los segmentos"""
+        return float(np.sum(self.link_lengths))
+
+    @property
+    def end_effector(self) -> np.ndarray:
+        """Posición (3,) del efector final"""
+        return self.joint_positions[-1]
+
+    def angles_to_array(self, angles: Mapping[str, float]) -> np.ndarray:
+        """
+        Convertir un diccionario de ángulos a arreglo
+
+        Args:
+            angles: Diccionario con los ángulos en grados
+
+        Returns:
+            Arreglo (2N,) en grados en el orden de `angle_names`
+        """
+        return np.array([angles.get(name, 0.0) for name in self._angle_names],
+                        dtype=float)
+
+    def array_to_angles(self, values: np.ndarray) -> Dict[str, float]:
+        """
+        Convertir un arreglo de ángulos a diccionario
+
+        Args:
+            values: Arreglo (2N,) en grados en el orden de `angle_names`
+
+        Returns:
+            Diccionario con los ángulos en grados
+        """
+        return {name: float(value) for name, value in zip(self._angle_names, values)}
+
+    def set_angles_array(self, values: np.ndarray) -> None:
+        """
+        Establecer todos los ángulos y recalcular las posiciones
+
+        Solo se recalcula desde el primer ángulo que cambió.
+
+        Args:
+            values: Arreglo (2N,) en grados en el orden de `angle_names`
+        """
+        values = np.asarray(values, dtype=float).reshape(self.angles.shape)
+        changed = np.flatnonzero(values != self.angles)
+        if not len(changed):
+            return
+
+        self.angles[:] = values
+        self.update_positions(changed[0] // 2)
+
+    def set_joint_angle(self, joint: Union[int, str], value: float) -> None:
+        """
+        Establecer un solo ángulo y recalcular aguas abajo de su articulación
+
+        Args:
+            joint: Índice en `angles` o nombre del ángulo ('theta2', ...)
+            value: Ángulo en grados
+        """
+        index = self._angle_names.index(joint) if isinstance(joint, str) else int(joint)
+        if self.angles[index] == value:
+            return
+
+        self.angles[index] = value
+        self.update_positions(index // 2)
+
+    def update_positions(self, start_link: int = 0) -> None:
+        """
+        Calcular las posiciones de las articulaciones
+
+        Args:
+            start_link: Primer segmento a recalcular; los anteriores conservan
+                su rotación y posición guardadas
+        """
+        self._kernel.update_from[start_link](self.angles, self._rotations,
+                                             self.joint_positions)
+
+    def distance_to(self, target: Point) -> float:
+        """
+        Calcular distancia del efector final al objetivo
+
+        Args:
+            target: Punto objetivo
+
+        Returns:
+            Distancia al objetivo
+        """
+        return float(np.linalg.norm(self.end_effector - as_point(target)))
+
+    def is_reachable(self, target: Point) -> bool:
+        """
+        Verificar si el objetivo es alcanzable
+
+        Args:
+            target: Punto objetivo
+
+        Returns:
+            True si es alcanzable
+        """
+        point = as_point(target)
+        if np.linalg.norm(point) > self.max_reach:
+            return False
+
+        # Los límites articulares dejan huecos dentro de la esfera
+        if self.reachability_grid is not None:
+            return self.reachability_grid.is_reachable(point)
+
+        return True
+
+    def are_targets_reachable(self, points: np.ndarray) -> np.ndarray:
+        """
+        Verificar un arreglo de objetivos
+
+        Args:
+            points: Objetivos (N, 3)
+
+        Returns:
+            Arreglo booleano (N,)
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        reachable = np.linalg.norm(points, axis=1) <= self.max_reach
+
+        if self.reachability_grid is not None:
+            reachable &= self.reachability_grid.are_reachable(points)
+
+        return reachable
+
+    def reset_to_default_position(self) -> None:
+        """Resetear la cadena a posición por defecto"""
+        values = np.zeros_like(self.angles)
+        values[1] = 90.0  # gamma1: apuntar hacia arriba
+        self.set_angles_array(values)
+
+    def forward_kinematics_batch(self, angles: np.ndarray) -> np.ndarray:
+        """
+        Calcular las posiciones de las articulaciones para M configuraciones
+
+        Usa el núcleo en forma cerrada generado para estas longitudes
+        (models.kinematics_kernel): sin matrices homogéneas ni bucle por
+        configuración, y la variante escalar para una sola configuración.
+
+        Args:
+            angles: Arreglo (..., 2N) con los ángulos en grados en el orden de
+                `angle_names`
+
+        Returns:
+            Arreglo (..., N + 1, 3) con base, articulaciones y efector final
+        """
+        angles = np.asarray(angles, dtype=float)
+        if angles.ndim == 1:
+            return self._kernel.forward_scalar(angles)
+        return self._kernel.forward(angles)
+
+    def jacobian_batch(self, angles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcular posiciones y jacobiano analítico del efector final
+
+        Cada theta_i gira alrededor del eje z del marco anterior y cada gamma_i
+        alrededor del eje y tras aplicar theta_i, ambos con origen en la
+        articulación i, por lo que cada columna es eje x (p_final - p_i).
+
+        Args:
+            angles: Arreglo (..., 2N) con los ángulos en grados en el orden de
+                `angle_names`
+
+        Returns:
+            Posiciones (..., N + 1, 3) y jacobiano (..., 3, 2N) por radián
+        """
+        angles = np.asarray(angles, dtype=float)
+        if angles.ndim == 1:
+            return self._kernel.jacobian_scalar(angles)
+        return self._kernel.jacobian(angles)
+
+    def forward_kinematics_matrix(self, angles: np.ndarray) -> np.ndarray:
+        """
+        Cinemática directa de referencia con matrices homogéneas 4x4
+
+        Es la formulación original (rotación, rotación, traslación por
+        segmento); sirve para verificar las rutas optimizadas.
+
+        Args:
+            angles: Arreglo (2N,) en grados en el orden de `angle_names`
+
+        Returns:
+            Arreglo (N + 1, 3) con base, articulaciones y efector final
+        """
+        q = np.radians(np.asarray(angles, dtype=float))
+        positions = [np.zeros(3)]
+        transform = np.eye(4)
+
+        for i, length in enumerate(self.link_lengths):
+            if i > 0:
+                offset = [self.link_lengths[i - 1], 0.0, 0.0]
+                transform = self._apply_translation(transform, offset)
+            transform = self._apply_rotation(transform, q[2 * i], 'z')
+            transform = self._apply_rotation(transform, q[2 * i + 1], 'y')
+            positions.append((transform @ np.array([length, 0.0, 0.0, 1.0]))[:3])
+
+        return np.array(positions)
+
+    def _apply_rotation(self, transform: np.ndarray, angle: float,
+                        axis: str) -> np.ndarray:
+        """Aplicar rotación a la matriz de transformación"""
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+
+        if axis == 'x':
+            rotation = np.array([
+                [1, 0, 0, 0],
+                [0, cos_a, -sin_a, 0],
+                [0, sin_a, cos_a, 0],
+                [0, 0, 0, 1]
+            ])
+        elif axis == 'y':
+            rotation = np.array([
+                [cos_a, 0, sin_a, 0],
+                [0, 1, 0, 0],
+                [-sin_a, 0, cos_a, 0],
+                [0, 0, 0, 1]
+            ])
+        elif axis == 'z':
+            rotation = np.array([
+                [cos_a, -sin_a, 0, 0],
+                [sin_a, cos_a, 0, 0],
+                [0, 0, 1, 0],
+                [0, 0, 0, 1]
+            ])
+
+        return transform @ rotation
+
+    def _apply_translation(self, transform: np.ndarray,
+                           translation: List[float]) -> np.ndarray:
+        """Aplicar traslación a la matriz de transformación"""
+        translation_matrix = np.eye(4)
+        translation_matrix[:3, 3] = translation
+        return transform @ translation_matrix
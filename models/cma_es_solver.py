@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Solver CMA-ES (estrategia evolutiva con adaptación de la covarianza)
+para cinemática inversa
+"""
+
+from typing import Dict, Callable, Optional, Tuple
+
+import numpy as np
+
+from models.chain_model import ChainModel, Point
+from models.ik_solver import IKSolver
+
+# Peso de la salida de los límites no periódicos (gamma) en el fitness
+BOUNDS_PENALTY = 1.0
+
+
+class CMAESSolver(IKSolver):
+    """Estrategia evolutiva con adaptación de la matriz de covarianza
+
+    Muestrea cada generación de una normal N(m, sigma^2 C) y adapta la media,
+    el paso sigma (camino de evolución conjugado) y la covarianza C (rango 1
+    y rango mu) a partir de los mejores individuos, siguiendo a Hansen, "The
+    CMA Evolution Strategy: A Tutorial". La búsqueda se hace en coordenadas
+    normalizadas a [0, 1] por ángulo. Cada configuración se evalúa proyectada
+    a los límites (theta da la vuelta completa y gamma se recorta), y la
+    salida de gamma fuera de su rango se penaliza para que la media no se
+    aleje de él.
+
+    Con un paisaje suave de pocas dimensiones necesita muchas menos
+    evaluaciones que un genético por torneo. Cuando converge sin alcanzar la
+    tolerancia reinicia desde una media aleatoria duplicando la población
+    (IPOP), hasta agotar `max_evaluations`.
+    """
+
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 population_size: Optional[int] = None, max_evaluations: int = 20000,
+                 sigma: float = 0.3, seed: Optional[int] = None):
+        """
+        Inicializar el solver
+
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            population_size: Muestras por generación (por defecto 4 + 3 ln n)
+            max_evaluations: Evaluaciones de fitness como máximo, con reinicios
+            sigma: Paso inicial en coordenadas normalizadas
+            seed: Semilla del generador aleatorio
+        """
+        super().__init__(arm_model, target)
+        n = len(self.lower_bounds)
+        self.population_size = population_size or 4 + int(3 * np.log(n))
+        self.max_evaluations = max_evaluations
+        self.sigma = sigma
+
+        # Reinicio cuando el paso se anula o el mejor no mejora en tantas generaciones
+        self.min_step = 1e-9
+        self.stall_generations = 10 + int(30 * n / self.population_size)
+
+        self.rng = np.random.default_rng(seed)
+
+        self._range = self.upper_bounds - self.lower_bounds
+        self._periodic = self._range >= 360.0
+
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+
+        Args:
+            callback: Función de callback para progreso
+
+        Returns:
+            Mejor solución encontrada o None
+        """
+        self._start_solve()
+        n = len(self.lower_bounds)
+
+        # La primera media es la mejor configuración sembrada, si hay
+        seeded = self._warm_start_population(1, self.rng)
+        if len(seeded):
+            mean = (seeded[0] - self.lower_bounds) / self._range
+        else:
+            mean = self.rng.random(n)
+
+        best_solution = None
+        best_fitness = float('inf')
+        population_size = self.population_size
+        generation = 0
+
+        while self.metrics.evaluations < self.max_evaluations:
+            best_run, fitness_run, generation, stop = self._run(
+                mean, population_size, generation, best_fitness, callback
+            )
+            if fitness_run < best_fitness:
+                best_fitness = fitness_run
+                best_solution = best_run
+            if stop:
+                break
+
+            # IPOP: reiniciar con el doble de población desde otro punto
+            population_size *= 2
+            mean = self.rng.random(n)
+            self.metrics.count_restart()
+
+        self.metrics.finish(best_fitness)
+        if best_solution is None:
+            return None
+        return self.arm_model.array_to_angles(best_solution)
+
+    def _run(self, mean: np.ndarray, population_size: int, generation: int,
+             best_fitness: float, callback: Optional[Callable] = None
+             ) -> Tuple[np.ndarray, float, int, bool]:
+        """
+        Una ejecución de CMA-ES hasta converger, estancarse o parar
+
+        Args:
+            mean: Media inicial en coordenadas normalizadas (n,)
+            population_size: Muestras por generación
+            generation: Generaciones acumuladas de ejecuciones anteriores
+            best_fitness: Mejor fitness de ejecuciones anteriores
+            callback: Función de callback para progreso
+
+        Returns:
+            Mejor configuración (n,) en grados, su fitness, generaciones
+            acumuladas y si hay que terminar el solve() (tolerancia, plazo,
+            cancelación o evaluaciones agotadas)
+        """
+        n = len(mean)
+
+        # Pesos de recombinación y constantes de adaptación
+        mu = population_size // 2
+        weights = np.log((population_size + 1) / 2.0) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mu_eff = 1.0 / np.sum(weights ** 2)
+        cc = (4 + mu_eff / n) / (n + 4 + 2 * mu_eff / n)
+        cs = (mu_eff + 2) / (n + mu_eff + 5)
+        c1 = 2 / ((n + 1.3) ** 2 + mu_eff)
+        cmu = min(1 - c1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((n + 2) ** 2 + mu_eff))
+        damps = 1 + 2 * max(0.0, np.sqrt((mu_eff - 1) / (n + 1)) - 1) + cs
+        chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        sigma = self.sigma
+        covariance = np.eye(n)
+        path_sigma = np.zeros(n)
+        path_c = np.zeros(n)
+
+        best_run = None
+        fitness_run = float('inf')
+        stalled = 0
+
+        iteration = generation
+        while True:
+            # Muestrear N(m, sigma^2 C) con C = B diag(D^2) B^T
+            with self.metrics.phase('sample'):
+                eigenvalues, basis = np.linalg.eigh(covariance)
+                scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+                z = self.rng.standard_normal((population_size, n))
+                steps = (z * scales) @ basis.T
+                samples = mean + sigma * steps
+
+            angles = self.lower_bounds + samples * self._range
+            repaired = self._project_to_bounds(angles)
+            fitness = self._evaluate_population(repaired)
+            outside = ((angles - repaired) / self._range)[:, ~self._periodic]
+            ranking = fitness + BOUNDS_PENALTY * np.sum(outside ** 2, axis=1)
+
+            # Estancado si el mejor no baja al menos un 0.1%
+            best_index = int(np.argmin(fitness))
+            improved = fitness[best_index] < fitness_run * (1 - 1e-3)
+            stalled = 0 if improved else stalled + 1
+            if fitness[best_index] < fitness_run:
+                fitness_run = float(fitness[best_index])
+                best_run = repaired[best_index].copy()
+
+            best_fitness = min(best_fitness, fitness_run)
+            self.metrics.record_generation(iteration, best_fitness, fitness, repaired)
+            if callback:
+                callback(self.arm_model.array_to_angles(best_run), fitness_run,
+                         iteration)
+
+            # Verificar convergencia, plazo, cancelación y presupuesto
+            if fitness_run < self.tolerance or self._should_stop():
+                return best_run, fitness_run, iteration + 1, True
+            if self.metrics.evaluations >= self.max_evaluations:
+                return best_run, fitness_run, iteration + 1, True
+
+            # Recombinación de los mu mejores y actualización de la distribución
+            with self.metrics.phase('update'):
+                selected = np.argsort(ranking)[:mu]
+                step_mean = weights @ steps[selected]
+                mean = mean + sigma * step_mean
+
+                inverse_sqrt = basis @ np.diag(1.0 / scales) @ basis.T
+                whitened_step = inverse_sqrt @ step_mean
+                path_sigma = ((1 - cs) * path_sigma
+                              + np.sqrt(cs * (2 - cs) * mu_eff) * whitened_step)
+                norm_sigma = np.linalg.norm(path_sigma)
+                decay = np.sqrt(1 - (1 - cs) ** (2 * (iteration - generation + 1)))
+                hsig = norm_sigma / decay / chi_n < 1.4 + 2 / (n + 1)
+                path_c = ((1 - cc) * path_c
+                          + hsig * np.sqrt(cc * (2 - cc) * mu_eff) * step_mean)
+
+                rank_mu = (steps[selected].T * weights) @ steps[selected]
+                covariance = ((1 - c1 - cmu) * covariance
+                              + c1 * (np.outer(path_c, path_c)
+                                      + (1 - hsig) * cc * (2 - cc) * covariance)
+                              + cmu * rank_mu)
+                covariance = (covariance + covariance.T) / 2
+                sigma *= np.exp((cs / damps) * (norm_sigma / chi_n - 1))
+
+            # Reiniciar si el paso se anula o el mejor no mejora
+            iteration += 1
+            collapsed = sigma * scales.max() < self.min_step
+            if collapsed or stalled >= self.stall_generations:
+                return best_run, fitness_run, iteration, False
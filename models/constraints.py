@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Restricciones de los solvers - Penalizaciones calculadas para poblaciones enteras
+"""
+
+import numpy as np
+
+from models.chain_model import ChainModel
+
+# Margen que separa cualquier configuración inválida de las válidas (el
+# fitness de una válida es una distancia, menor que dos veces el alcance)
+INFEASIBLE_OFFSET = 1e3
+
+
+def segment_distances(p1: np.ndarray, q1: np.ndarray, p2: np.ndarray,
+                      q2: np.ndarray) -> np.ndarray:
+    """
+    Distancia mínima entre pares de segmentos [p1, q1] y [p2, q2]
+
+    Puntos más cercanos con parámetros recortados a [0, 1] (Ericson, Real-Time
+    Collision Detection, 5.1.9), para todos los pares a la vez. Los segmentos
+    deben tener longitud no nula.
+
+    Args:
+        p1, q1: Extremos de los primeros segmentos (..., 3)
+        p2, q2: Extremos de los segundos segmentos (..., 3)
+
+    Returns:
+        Distancias (...)
+    """
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = _dot(d1, d1)
+    e = _dot(d2, d2)
+    b = _dot(d1, d2)
+    c = _dot(d1, r)
+    f = _dot(d2, r)
+
+    # Segmentos paralelos: cualquier s sirve, se toma 0
+    denominator = a * e - b * b
+    parallel = denominator <= 1e-12 * a * e
+    safe_denominator = np.where(parallel, 1.0, denominator)
+    s = np.where(parallel, 0.0, np.clip((b * f - c * e) / safe_denominator, 0.0, 1.0))
+    t = (b * s + f) / e
+
+    # Si t sale de [0, 1], recortarlo y recalcular s
+    below, above = t < 0.0, t > 1.0
+    s = np.where(below, np.clip(-c / a, 0.0, 1.0), s)
+    s = np.where(above, np.clip((b - c) / a, 0.0, 1.0), s)
+    t = np.clip(t, 0.0, 1.0)
+
+    closest = (p1 + d1 * s[..., None]) - (p2 + d2 * t[..., None])
+    return np.linalg.norm(closest, axis=-1)
+
+
+def point_segment_distances(point: np.ndarray, p: np.ndarray,
+                            q: np.ndarray) -> np.ndarray:
+    """
+    Distancia mínima de puntos a segmentos [p, q]
+
+    Args:
+        point: Puntos (..., 3)
+        p, q: Extremos de los segmentos (..., 3)
+
+    Returns:
+        Distancias (...)
+    """
+    direction = q - p
+    t = _dot(point - p, direction) / _dot(direction, direction)
+    closest = p + direction * np.clip(t, 0.0, 1.0)[..., None]
+    return np.linalg.norm(point - closest, axis=-1)
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Producto escalar sobre el último eje"""
+    return (a * b).sum(axis=-1)
+
+
+class Constraint:
+    """Restricción evaluada sobre las posiciones de una población
+
+    `violation(positions)` devuelve, para cada configuración (P, N + 1, 3),
+    cuánto se viola la restricción (0: se cumple). Una restricción dura suma
+    `INFEASIBLE_OFFSET` a toda configuración que la viole, de modo que
+    cualquier solución válida gana a cualquier inválida; una blanda suma
+    `weight` veces la violación.
+    """
+
+    def __init__(self, weight: float = 1.0, hard: bool = True):
+        """
+        Inicializar la restricción
+
+        Args:
+            weight: Peso de la violación en el fitness
+            hard: Separar las configuraciones inválidas de las válidas
+        """
+        self.weight = weight
+        self.hard = hard
+
+    def violation(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calcular la violación de cada configuración
+
+        Args:
+            positions: Posiciones de las articulaciones (P, N + 1, 3)
+
+        Returns:
+            Violación (P,) no negativa
+        """
+        raise NotImplementedError
+
+    def penalty(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Penalización a sumar al fitness
+
+        Args:
+            positions: Posiciones de las articulaciones (P, N + 1, 3)
+
+        Returns:
+            Penalización (P,)
+        """
+        violation = self.violation(positions)
+        penalty = self.weight * violation
+        if self.hard:
+            penalty = np.where(violation > 0.0, INFEASIBLE_OFFSET + penalty, 0.0)
+        return penalty
+
+
+class SelfCollisionConstraint(Constraint):
+    """Segmentos que se atraviesan entre sí o atraviesan la base
+
+    Cada segmento es una cápsula de radio `link_radius` y la base una esfera
+    de radio `base_radius` en el origen. Se comprueban todos los pares de
+    segmentos no contiguos, los contiguos plegados uno sobre otro (el extremo
+    libre de uno demasiado cerca del otro) y los segmentos que no parten de
+    la base contra ella. La violación es la suma de las penetraciones.
+    """
+
+    def __init__(self, arm_model: ChainModel, link_radius: float = 0.1,
+                 base_radius: float = 0.3, weight: float = 1.0, hard: bool = True):
+        """
+        Inicializar la restricción
+
+        Args:
+            arm_model: Cadena cuyos segmentos se comprueban
+            link_radius: Radio de cada segmento
+            base_radius: Radio de la base
+            weight: Peso de la violación en el fitness
+            hard: Separar las configuraciones inválidas de las válidas
+        """
+        super().__init__(weight, hard)
+        self.link_radius = link_radius
+        self.base_radius = base_radius
+
+        n_links = arm_model.n_links
+        first, second = np.triu_indices(n_links, k=2)
+        self._pairs = (first, second)
+        self._adjacent = np.arange(n_links - 1)
+
+    @property
+    def base_clearance(self) -> float:
+        """Distancia al origen por debajo de la cual un segmento atraviesa la base"""
+        return self.base_radius + self.link_radius
+
+    def violation(self, positions: np.ndarray) -> np.ndarray:
+        """Suma de penetraciones entre segmentos y con la base (P,)"""
+        starts = positions[:, :-1]
+        ends = positions[:, 1:]
+        clearance = 2.0 * self.link_radius
+        violation = np.zeros(len(positions))
+
+        # Pares de segmentos no contiguos
+        first, second = self._pairs
+        if len(first):
+            distances = segment_distances(starts[:, first], ends[:, first],
+                                          starts[:, second], ends[:, second])
+            violation += np.maximum(0.0, clearance - distances).sum(axis=1)
+
+        # Contiguos: comparten articulación, se mide el extremo libre de cada uno
+        adjacent = self._adjacent
+        if len(adjacent):
+            distances = np.minimum(
+                point_segment_distances(starts[:, adjacent], starts[:, adjacent + 1],
+                                        ends[:, adjacent + 1]),
+                point_segment_distances(ends[:, adjacent + 1], starts[:, adjacent],
+                                        ends[:, adjacent])
+            )
+            violation += np.maximum(0.0, clearance - distances).sum(axis=1)
+
+        # Base: el primer segmento parte de ella
+        if positions.shape[1] > 2:
+            distances = point_segment_distances(np.zeros(3), starts[:, 1:], ends[:, 1:])
+            violation += np.maximum(0.0, self.base_clearance - distances).sum(axis=1)
+
+        return violation
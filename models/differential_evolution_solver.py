@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Solver de evolución diferencial para cinemática inversa
+"""
+
+from typing import Dict, Callable, Optional
+
+import numpy as np
+
+from models.chain_model import ChainModel, Point
+from models.ik_solver import IKSolver
+
+
+class DifferentialEvolutionSolver(IKSolver):
+    """Evolución diferencial current-to-pbest/1/bin con parámetros autoadaptados
+
+    Cada individuo genera un mutante x + F (x_pbest - x) + F (x_r1 - x_r2),
+    con x_pbest uno de los `best_fraction` mejores (JADE), lo cruza gen a gen
+    con probabilidad CR y lo reemplaza si el hijo no es peor. F y CR son
+    propios de cada individuo y se re-muestrean con probabilidad
+    `parameter_resample` (jDE), así que sobreviven solo los valores que
+    producen hijos mejores. Toda la población se muta, cruza y evalúa a la
+    vez; los genes de gamma que salen del rango se colocan entre el padre y
+    el límite.
+    """
+
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 population_size: int = 20, generations: int = 300,
+                 seed: Optional[int] = None):
+        """
+        Inicializar el solver
+
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            population_size: Tamaño de la población
+            generations: Número máximo de generaciones
+            seed: Semilla del generador aleatorio
+        """
+        super().__init__(arm_model, target)
+        self.population_size = max(4, population_size)
+        self.generations = generations
+
+        # Parámetros de jDE / JADE
+        self.initial_f = 0.5
+        self.initial_cr = 0.9
+        self.parameter_resample = 0.1
+        self.best_fraction = 0.1
+
+        self.rng = np.random.default_rng(seed)
+        self._periodic = (self.upper_bounds - self.lower_bounds) >= 360.0
+
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+
+        Args:
+            callback: Función de callback para progreso
+
+        Returns:
+            Mejor solución encontrada o None
+        """
+        self._start_solve()
+        size, n_genes = self.population_size, len(self.lower_bounds)
+
+        seeded = self._warm_start_population(size, self.rng)
+        population = np.concatenate([seeded, self.rng.uniform(
+            self.lower_bounds, self.upper_bounds, size=(size - len(seeded), n_genes)
+        )])
+        fitness = self._evaluate_population(population)
+        scale = np.full(size, self.initial_f)
+        crossover_rate = np.full(size, self.initial_cr)
+
+        for generation in range(self.generations):
+            best_index = int(np.argmin(fitness))
+            best_fitness = float(fitness[best_index])
+            self.metrics.record_generation(generation, best_fitness, fitness,
+                                           population)
+            if callback:
+                callback(self.arm_model.array_to_angles(population[best_index]),
+                         best_fitness, generation)
+
+            # Verificar convergencia, plazo y cancelación
+            if best_fitness < self.tolerance or self._should_stop():
+                break
+
+            with self.metrics.phase('mutate'):
+                # jDE: re-muestrear F y CR de algunos individuos
+                trial_scale = np.where(self.rng.random(size) < self.parameter_resample,
+                                       self.rng.uniform(0.1, 1.0, size), scale)
+                trial_cr = np.where(self.rng.random(size) < self.parameter_resample,
+                                    self.rng.random(size), crossover_rate)
+
+                # Índices r1 != r2 != i y uno de los mejores para cada individuo
+                order = np.argsort(self.rng.random((size, size)) + np.eye(size), axis=1)
+                r1, r2 = order[:, 0], order[:, 1]
+                elite_count = max(1, int(round(self.best_fraction * size)))
+                pbest = np.argsort(fitness)[self.rng.integers(elite_count, size=size)]
+
+                factor = trial_scale[:, None]
+                mutant = population + factor * (
+                    self._difference(population[pbest], population)
+                    + self._difference(population[r1], population[r2])
+                )
+
+            with self.metrics.phase('crossover'):
+                # Cruce binomial con al menos un gen del mutante
+                take = self.rng.random((size, n_genes)) < trial_cr[:, None]
+                take[np.arange(size), self.rng.integers(n_genes, size=size)] = True
+                trial = np.where(take, mutant, population)
+                trial = self._repair(trial, population)
+
+            trial_fitness = self._evaluate_population(trial)
+
+            # Selección uno a uno: el hijo reemplaza al padre si no es peor
+            with self.metrics.phase('select'):
+                improved = trial_fitness <= fitness
+                population[improved] = trial[improved]
+                fitness[improved] = trial_fitness[improved]
+                scale[improved] = trial_scale[improved]
+                crossover_rate[improved] = trial_cr[improved]
+
+        best_index = int(np.argmin(fitness))
+        self.metrics.finish(float(fitness[best_index]))
+        return self.arm_model.array_to_angles(population[best_index])
+
+    def _difference(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Diferencia a - b, por el camino corto en los ángulos de vuelta completa"""
+        difference = a - b
+        return np.where(self._periodic, (difference + 180.0) % 360.0 - 180.0,
+                        difference)
+
+    def _repair(self, trial: np.ndarray, parents: np.ndarray) -> np.ndarray:
+        """Llevar a su rango los genes fuera: gamma hacia el límite, theta envuelto"""
+        bounded = ~self._periodic
+        trial = np.where(bounded & (trial < self.lower_bounds),
+                         (parents + self.lower_bounds) / 2, trial)
+        trial = np.where(bounded & (trial > self.upper_bounds),
+                         (parents + self.upper_bounds) / 2, trial)
+        return self._project_to_bounds(trial)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Solver de mínimos cuadrados amortiguados (Levenberg-Marquardt) para cinemática inversa
+"""
+
+from typing import Dict, Callable, Optional, Tuple
+
+import numpy as np
+
+from models.chain_model import ChainModel, Point
+from models.ik_solver import IKSolver
+
+
+class DampedLeastSquaresSolver(IKSolver):
+    """Solver determinista basado en el jacobiano analítico del brazo
+
+    Cada iteración resuelve dq = J^T (J J^T + lambda^2 I)^-1 e. El
+    amortiguamiento lambda se reduce cuando el paso mejora el error y se
+    aumenta (descartando el paso) cuando no, al estilo Levenberg-Marquardt.
+    Se refinan en paralelo la configuración actual del brazo y varios
+    arranques aleatorios para no quedar atrapado en los límites de gamma.
+    """
+
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 max_iterations: int = 50, restarts: int = 8,
+                 damping: float = 0.1, seed: Optional[int] = None):
+        """
+        Inicializar el solver
+
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            max_iterations: Número máximo de iteraciones
+            restarts: Arranques en paralelo (incluye la configuración actual)
+            damping: Amortiguamiento inicial lambda
+            seed: Semilla del generador aleatorio
+        """
+        super().__init__(arm_model, target)
+        self.max_iterations = max_iterations
+        self.restarts = max(1, restarts)
+        self.damping = damping
+        self.min_damping = 1e-6
+        self.max_damping = 1e3
+
+        self.rng = np.random.default_rng(seed)
+
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+
+        Args:
+            callback: Función de callback para progreso
+
+        Returns:
+            Mejor solución encontrada o None
+        """
+        self._start_solve()
+        current = self.arm_model.angles.copy()
+        seeded = self._warm_start_population(self.restarts, self.rng)
+        random_starts = self.rng.uniform(
+            self.lower_bounds, self.upper_bounds,
+            size=(max(0, self.restarts - 1 - len(seeded)), len(current))
+        )
+        starts = np.vstack([current[None, :], seeded, random_starts])
+
+        angles, errors = self.refine(starts, self._target_array, self.max_iterations,
+                                     callback, stop_when_any=True)
+
+        best_index = int(np.argmin(errors))
+        self.metrics.finish(float(errors[best_index]))
+        return self.arm_model.array_to_angles(angles[best_index])
+
+    def refine(self, angles: np.ndarray, targets: np.ndarray, iterations: int,
+               callback: Optional[Callable] = None,
+               stop_when_any: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Refinar un lote de configuraciones con iteraciones de Levenberg-Marquardt
+
+        Args:
+            angles: Configuraciones iniciales (K, 6) en grados
+            targets: Objetivos (3,) o (K, 3)
+            iterations: Número máximo de iteraciones
+            callback: Función de callback para progreso
+            stop_when_any: Terminar en cuanto una configuración alcance la
+                tolerancia (todas comparten objetivo)
+
+        Returns:
+            Configuraciones refinadas (K, 6) y su error (K,): distancia al
+            objetivo más las penalizaciones de `constraints`
+        """
+        angles = self._project_to_bounds(np.array(angles, dtype=float))
+        targets = np.broadcast_to(np.asarray(targets, dtype=float), (len(angles), 3))
+        damping = np.full(len(angles), self.damping)
+        identity = np.eye(3)
+
+        with self.metrics.phase('evaluate'):
+            positions, jacobian = self.arm_model.jacobian_batch(angles)
+            residual = targets - positions[:, -1]
+            errors = np.linalg.norm(residual, axis=1)
+        if self.constraints:
+            errors += self._constraint_penalty(positions)
+        self.metrics.count_evaluations(len(angles))
+
+        for iteration in range(iterations):
+            active = errors >= self.tolerance
+            if not active.all() and (stop_when_any or not active.any()):
+                break
+            if self._should_stop():
+                break
+
+            # Paso amortiguado: J^T (J J^T + lambda^2 I)^-1 e
+            with self.metrics.phase('step'):
+                system = (jacobian @ jacobian.transpose(0, 2, 1)
+                          + (damping ** 2)[:, None, None] * identity)
+                step = np.linalg.solve(system, residual[:, :, None])
+                delta = (jacobian.transpose(0, 2, 1) @ step)[:, :, 0]
+                candidate = self._project_to_bounds(angles + np.degrees(delta))
+
+            with self.metrics.phase('evaluate'):
+                candidate_positions, candidate_jacobian = self.arm_model.jacobian_batch(
+                    candidate
+                )
+                candidate_residual = targets - candidate_positions[:, -1]
+                candidate_errors = np.linalg.norm(candidate_residual, axis=1)
+            if self.constraints:
+                candidate_errors += self._constraint_penalty(candidate_positions)
+            self.metrics.count_evaluations(len(candidate))
+
+            # Aceptar solo los pasos que mejoran
+            improved = active & (candidate_errors < errors)
+            angles[improved] = candidate[improved]
+            jacobian[improved] = candidate_jacobian[improved]
+            residual[improved] = candidate_residual[improved]
+            errors[improved] = candidate_errors[improved]
+
+            damping = np.where(improved, damping * 0.5,
+                               np.where(active, damping * 2.0, damping))
+            np.clip(damping, self.min_damping, self.max_damping, out=damping)
+            self.metrics.record_generation(iteration, float(errors.min()), errors)
+
+            # Callback para progreso
+            if callback:
+                best_index = int(np.argmin(errors))
+                callback(self.arm_model.array_to_angles(angles[best_index]),
+                         float(errors[best_index]), iteration)
+
+        return angles, errors
@@ -4,15 +4,25 @@ Modelo del solver genético para cinemática inversa
 """
 
 import random
-import math
-from typing import Dict, List, Callable, Optional
-from models.arm_model import ArmModel
+import numpy as np
+from typing import Dict, List, Callable, Optional, Tuple
+from models.chain_model import ChainModel, Point
+from models.ik_solver import IKSolver
+from models.dls_solver import DampedLeastSquaresSolver
+from models.adaptive_control import AdaptiveControl, RESTART, STOP
 
-class GeneticSolver:
-    """Solver genético para cinemática inversa"""
+class GeneticSolver(IKSolver):
+    """Solver genético para cinemática inversa
     
-    def __init__(self, arm_model: ArmModel, target: Dict[str, float], 
-                 population_size: int = 100, generations: int = 200):
+    Con `adaptive=True` la fuerza de la mutación se ajusta en cada generación
+    según el progreso, la población se reinicia en parte cuando se estanca y
+    el solve() termina con `stop_reason = 'stalled'` si deja de mejorar. Por
+    defecto se usan los parámetros fijos.
+    """
+    
+    def __init__(self, arm_model: ChainModel, target: Point, 
+                 population_size: int = 100, generations: int = 200,
+                 adaptive: bool = False):
         """
         Inicializar el solver genético
         
@@ -21,9 +31,9 @@ class GeneticSolver:
             target: Punto objetivo
             population_size: Tamaño de la población
             generations: Número de generaciones
+            adaptive: Adaptar la mutación, reiniciar y parar al estancarse
         """
-        self.arm_model = arm_model
-        self.target = target
+        super().__init__(arm_model, target)
         self.population_size = population_size
         self.generations = generations
         
@@ -31,6 +41,12 @@ class GeneticSolver:
         self.mutation_rate = 0.1
         self.crossover_rate = 0.8
         self.elite_size = 5
+        self.gene_mutation_rate = 0.1
+        
+        # Control adaptativo de la mutación, reinicios y parada temprana
+        self.adaptive_control: Optional[AdaptiveControl] = (
+            AdaptiveControl(self.lower_bounds, self.upper_bounds) if adaptive else None
+        )
         
     def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
         """
@@ -42,6 +58,12 @@ class GeneticSolver:
         Returns:
             Mejor solución encontrada o None
         """
+        self._start_solve()
+        control = self.adaptive_control
+        if control is not None:
+            control.reset()
+        rng = np.random.default_rng(random.getrandbits(32))
+        
         # Generar población inicial
         population = self._generate_initial_population()
         
@@ -49,10 +71,14 @@ class GeneticSolver:
         best_fitness = float('inf')
         
         for generation in range(self.generations):
-            # Evaluar fitness
+            # Evaluar fitness de toda la población en una pasada (las
+            # restricciones cuestan lo mismo para uno que para cien)
+            population_array = np.array([
+                self.arm_model.angles_to_array(individual) for individual in population
+            ])
+            fitness_values = self._evaluate_population(population_array)
             fitness_scores = []
-            for individual in population:
-                fitness = self._evaluate_fitness(individual)
+            for fitness, individual in zip(fitness_values.tolist(), population):
                 fitness_scores.append((fitness, individual))
                 
                 # Actualizar mejor solución
@@ -62,10 +88,23 @@ class GeneticSolver:
             
             # Ordenar por fitness
             fitness_scores.sort(key=lambda x: x[0])
+            action = None
+            if control is not None:
+                action = control.update(best_fitness, population_array)
+            self.metrics.record_generation(
+                generation, best_fitness, fitness_values, population_array,
+                mutation_scale=control.mutation_scale if control is not None else None
+            )
             
-            # Verificar convergencia
-            if best_fitness < 0.01:  # Tolerancia de 1cm
+            # Verificar convergencia, plazo, cancelación y estancamiento
+            if best_fitness < self.tolerance:
                 break
+            if self._should_stop():
+                break
+            if action == STOP:
+                self.metrics.stop_reason = 'stalled'
+                break
+            mutation_rate, gene_rate, mutation_scale = self._mutation_parameters()
             
             # Crear nueva población
             new_population = []
@@ -77,36 +116,58 @@ class GeneticSolver:
             # Generar resto de la población
             while len(new_population) < self.population_size:
                 # Selección de padres
-                parent1 = self._tournament_selection(fitness_scores)
-                parent2 = self._tournament_selection(fitness_scores)
+                with self.metrics.phase('select'):
+                    parent1 = self._tournament_selection(fitness_scores)
+                    parent2 = self._tournament_selection(fitness_scores)
                 
                 # Cruce
-                if random.random() < self.crossover_rate:
-                    child = self._crossover(parent1, parent2)
-                else:
-                    child = parent1.copy()
+                with self.metrics.phase('crossover'):
+                    if random.random() < self.crossover_rate:
+                        child = self._crossover(parent1, parent2)
+                    else:
+                        child = parent1.copy()
                 
                 # Mutación
-                if random.random() < self.mutation_rate:
-                    child = self._mutate(child)
+                with self.metrics.phase('mutate'):
+                    if random.random() < mutation_rate:
+                        child = self._mutate(child, gene_rate, mutation_scale)
                 
                 new_population.append(child)
             
+            # Reinicio parcial: individuos aleatorios en lugar de los últimos hijos
+            if action == RESTART:
+                restarted = control.restart(
+                    np.array([self.arm_model.angles_to_array(individual)
+                              for individual in new_population]),
+                    self.elite_size, rng
+                )
+                new_population = [self.arm_model.array_to_angles(values)
+                                  for values in restarted]
+                self.metrics.count_restart()
+            
             population = new_population
             
             # Callback para progreso
             if callback:
                 callback(best_solution, best_fitness, generation)
         
+        self.metrics.finish(best_fitness)
         return best_solution
     
     def _generate_initial_population(self) -> List[Dict[str, float]]:
         """Generar población inicial"""
         population = []
         
-        for _ in range(self.population_size):
+        # Sembrar con soluciones previas y perturbaciones de ellas
+        if self.initial_guesses:
+            seeded = self._warm_start_population(
+                self.population_size, np.random.default_rng(random.getrandbits(32))
+            )
+            population = [self.arm_model.array_to_angles(values) for values in seeded]
+        
+        for _ in range(self.population_size - len(population)):
             individual = {}
-            for angle_name in self.arm_model.angles.keys():
+            for angle_name in self.arm_model.angle_names:
                 # Generar ángulos aleatorios
                 if 'gamma' in angle_name:
                     # Ángulos gamma entre 0 y 180 grados
@@ -120,14 +181,18 @@ class GeneticSolver:
         return population
     
     def _evaluate_fitness(self, individual: Dict[str, float]) -> float:
-        """Evaluar fitness de un individuo"""
-        # Aplicar ángulos al modelo
-        self.arm_model.set_angles(individual)
+        """Evaluar fitness de un individuo (sin modificar el estado del modelo)"""
+        angles = self.arm_model.angles_to_array(individual)
+        positions = self.arm_model.forward_kinematics_batch(angles)
+        
+        # Distancia al objetivo
+        fitness = float(np.linalg.norm(positions[-1] - self._target_array))
         
-        # Calcular distancia al objetivo
-        distance = self.arm_model.calculate_distance_to_target(self.target)
+        # Restricciones (colisiones, ...)
+        if self.constraints:
+            fitness += float(self._constraint_penalty(positions[None])[0])
         
-        return distance
+        return fitness
     
     def _tournament_selection(self, fitness_scores: List[tuple], tournament_size: int = 3) -> Dict[str, float]:
         """Selección por torneo"""
@@ -146,19 +211,285 @@ class GeneticSolver:
         
         return child
     
-    def _mutate(self, individual: Dict[str, float]) -> Dict[str, float]:
-        """Mutar un individuo"""
+    def _mutation_parameters(self) -> Tuple[float, float, float]:
+        """Probabilidades por individuo y por gen y escala actuales de la mutación"""
+        control = self.adaptive_control
+        if control is None:
+            return self.mutation_rate, self.gene_mutation_rate, 1.0
+        return (control.scaled_rate(self.mutation_rate),
+                control.scaled_rate(self.gene_mutation_rate),
+                control.mutation_scale)
+    
+    def _mutate(self, individual: Dict[str, float], gene_rate: float = 0.1,
+                scale: float = 1.0) -> Dict[str, float]:
+        """
+        Mutar un individuo
+        
+        Args:
+            individual: Individuo a mutar
+            gene_rate: Probabilidad de mutar cada gen
+            scale: Factor de las desviaciones de la mutación
+        """
         mutated = individual.copy()
         
         for angle_name in mutated.keys():
-            if random.random() < 0.1:  # 10% de probabilidad de mutar cada gen
+            if random.random() < gene_rate:
                 if 'gamma' in angle_name:
                     # Mutación para ángulos gamma
-                    mutated[angle_name] += random.gauss(0, 10)
+                    mutated[angle_name] += random.gauss(0, 10 * scale)
                     mutated[angle_name] = max(0, min(180, mutated[angle_name]))
                 else:
                     # Mutación para ángulos theta
-                    mutated[angle_name] += random.gauss(0, 15)
+                    mutated[angle_name] += random.gauss(0, 15 * scale)
                     mutated[angle_name] = max(-180, min(180, mutated[angle_name]))
         
         return mutated
+
+
+class VectorizedGeneticSolver(IKSolver):
+    """Solver genético con la población almacenada como arreglo (P, 6)
+    
+    Mismos operadores que `GeneticSolver` (torneo, cruce uniforme, mutación
+    gaussiana y elitismo), pero aplicados a toda la población a la vez con
+    `ChainModel.forward_kinematics_batch` y un `numpy.random.Generator`,
+    y el mismo control adaptativo opcional.
+    """
+    
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 population_size: int = 100, generations: int = 200,
+                 seed: Optional[int] = None, adaptive: bool = False):
+        """
+        Inicializar el solver genético vectorizado
+        
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            population_size: Tamaño de la población
+            generations: Número de generaciones
+            seed: Semilla del generador aleatorio
+            adaptive: Adaptar la mutación, reiniciar y parar al estancarse
+        """
+        super().__init__(arm_model, target)
+        self.population_size = population_size
+        self.generations = generations
+        
+        # Parámetros del algoritmo genético
+        self.mutation_rate = 0.1
+        self.crossover_rate = 0.8
+        self.elite_size = 5
+        self.gene_mutation_rate = 0.1
+        self.tournament_size = 3
+        
+        # Búsqueda local sobre la élite (0 la desactiva)
+        self.local_search_interval = 0
+        self.local_search_iterations = 5
+        
+        self.rng = np.random.default_rng(seed)
+        
+        # Desviación de mutación por gen (gamma: 10°, theta: 15°)
+        is_gamma = np.array(['gamma' in name for name in arm_model.angle_names])
+        self.mutation_sigma = np.where(is_gamma, 10.0, 15.0)
+        
+        # Control adaptativo de la mutación, reinicios y parada temprana
+        self.adaptive_control: Optional[AdaptiveControl] = (
+            AdaptiveControl(self.lower_bounds, self.upper_bounds) if adaptive else None
+        )
+    
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+        
+        Args:
+            callback: Función de callback para progreso
+            
+        Returns:
+            Mejor solución encontrada o None
+        """
+        self._start_solve()
+        if self.adaptive_control is not None:
+            self.adaptive_control.reset()
+        population = self._generate_initial_population()
+        
+        _, _, best_solution, best_fitness = self.evolve(population, self.generations,
+                                                        callback)
+        
+        self.metrics.finish(best_fitness)
+        if best_solution is None:
+            return None
+        return self.arm_model.array_to_angles(best_solution)
+    
+    def evolve(self, population: np.ndarray, generations: int,
+               callback: Optional[Callable] = None
+               ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], float]:
+        """
+        Evolucionar una población durante un número de generaciones
+        
+        El estado de `adaptive_control` continúa el de la llamada anterior
+        (solve() lo reinicia), así que varias llamadas seguidas detectan el
+        estancamiento como una sola.
+        
+        Args:
+            population: Población inicial (P, 6) en grados
+            generations: Número máximo de generaciones
+            callback: Función de callback para progreso
+            
+        Returns:
+            Población final, su fitness, mejor individuo y su fitness
+        """
+        best_solution = None
+        best_fitness = float('inf')
+        population = np.array(population, dtype=float)
+        fitness = self._evaluate_population(population)
+        control = self.adaptive_control
+        
+        for generation in range(generations):
+            # Refinar la élite con mínimos cuadrados amortiguados
+            interval = self.local_search_interval
+            if interval and generation % interval == 0:
+                self._refine_elite(population, fitness)
+            
+            # Actualizar mejor solución
+            best_index = int(np.argmin(fitness))
+            if fitness[best_index] < best_fitness:
+                best_fitness = float(fitness[best_index])
+                best_solution = population[best_index].copy()
+            action = None
+            if control is not None:
+                action = control.update(best_fitness, population)
+            self.metrics.record_generation(
+                generation, best_fitness, fitness, population,
+                mutation_scale=control.mutation_scale if control is not None else None
+            )
+            
+            # Verificar convergencia, plazo, cancelación y estancamiento
+            if best_fitness < self.tolerance:
+                return population, fitness, best_solution, best_fitness
+            if self._should_stop():
+                return population, fitness, best_solution, best_fitness
+            if action == STOP:
+                self.metrics.stop_reason = 'stalled'
+                return population, fitness, best_solution, best_fitness
+            
+            population = self._next_generation(population, fitness)
+            
+            # Reinicio parcial: individuos aleatorios en lugar de los últimos hijos
+            if action == RESTART:
+                population = control.restart(population, self.elite_size, self.rng)
+                self.metrics.count_restart()
+            
+            fitness = self._evaluate_population(population)
+            
+            # Callback para progreso
+            if callback:
+                callback(self.arm_model.array_to_angles(best_solution), best_fitness,
+                         generation)
+        
+        best_index = int(np.argmin(fitness))
+        if fitness[best_index] < best_fitness:
+            best_fitness = float(fitness[best_index])
+            best_solution = population[best_index].copy()
+        
+        return population, fitness, best_solution, best_fitness
+    
+    def _generate_initial_population(self) -> np.ndarray:
+        """Generar población inicial (P, 6) en grados"""
+        seeded = self._warm_start_population(self.population_size, self.rng)
+        random_part = self.rng.uniform(
+            self.lower_bounds, self.upper_bounds,
+            size=(self.population_size - len(seeded), len(self.lower_bounds))
+        )
+        return np.concatenate([seeded, random_part])
+    
+    def _refine_elite(self, population: np.ndarray, fitness: np.ndarray) -> None:
+        """Aplicar unas iteraciones de búsqueda local a la élite, in situ"""
+        local_solver = DampedLeastSquaresSolver(self.arm_model, self.target)
+        local_solver.tolerance = self.tolerance
+        local_solver.constraints = self.constraints
+        
+        elite = np.argsort(fitness)[:min(self.elite_size, len(fitness))]
+        with self.metrics.phase('local_search'):
+            refined, errors = local_solver.refine(
+                population[elite], self._target_array, self.local_search_iterations,
+                stop_when_any=True
+            )
+        self.metrics.count_evaluations(local_solver.metrics.evaluations)
+        population[elite] = refined
+        fitness[elite] = errors
+    
+    def _next_generation(self, population: np.ndarray,
+                         fitness: np.ndarray) -> np.ndarray:
+        """Crear nueva población con elitismo, torneo, cruce y mutación"""
+        size, n_genes = population.shape
+        elite_size = min(self.elite_size, size)
+        n_children = size - elite_size
+        
+        # Elitismo y selección por torneo de ambos padres
+        with self.metrics.phase('select'):
+            elite = population[np.argsort(fitness)[:elite_size]]
+            contenders = self.rng.integers(size,
+                                           size=(2, n_children, self.tournament_size))
+            winner = np.argmin(fitness[contenders], axis=-1)
+            parents = np.take_along_axis(contenders, winner[..., None], axis=-1)[..., 0]
+            parent1 = population[parents[0]]
+            parent2 = population[parents[1]]
+        
+        # Cruce uniforme
+        with self.metrics.phase('crossover'):
+            crossover = self.rng.random(n_children) < self.crossover_rate
+            from_parent2 = ((self.rng.random((n_children, n_genes)) < 0.5)
+                            & crossover[:, None])
+            children = np.where(from_parent2, parent2, parent1)
+        
+        # Mutación gaussiana por gen
+        with self.metrics.phase('mutate'):
+            mutation_rate, gene_rate, mutation_scale = self._mutation_parameters()
+            mutate = (
+                (self.rng.random(n_children) < mutation_rate)[:, None]
+                & (self.rng.random((n_children, n_genes)) < gene_rate)
+            )
+            sigma = self.mutation_sigma * mutation_scale
+            children += mutate * self.rng.normal(size=(n_children, n_genes)) * sigma
+            np.clip(children, self.lower_bounds, self.upper_bounds, out=children)
+        
+        return np.concatenate([elite, children])
+    
+    def _mutation_parameters(self) -> Tuple[float, float, float]:
+        """Probabilidades por individuo y por gen y escala actuales de la mutación"""
+        control = self.adaptive_control
+        if control is None:
+            return self.mutation_rate, self.gene_mutation_rate, 1.0
+        return (control.scaled_rate(self.mutation_rate),
+                control.scaled_rate(self.gene_mutation_rate),
+                control.mutation_scale)
+
+
+class MemeticGeneticSolver(VectorizedGeneticSolver):
+    """Híbrido memético: búsqueda global genética y refinamiento local de la élite
+    
+    Cada `local_search_interval` generaciones los `elite_size` mejores
+    individuos reciben unas iteraciones de `DampedLeastSquaresSolver`, que
+    pule los últimos centímetros mientras el resto de la población sigue
+    explorando para escapar de mínimos locales.
+    """
+    
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 population_size: int = 100, generations: int = 200,
+                 seed: Optional[int] = None, local_search_interval: int = 5,
+                 local_search_iterations: int = 5, adaptive: bool = False):
+        """
+        Inicializar el solver memético
+        
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            population_size: Tamaño de la población
+            generations: Número de generaciones
+            seed: Semilla del generador aleatorio
+            local_search_interval: Generaciones entre refinamientos de la élite
+            local_search_iterations: Iteraciones de búsqueda local por refinamiento
+            adaptive: Adaptar la mutación, reiniciar y parar al estancarse
+        """
+        super().__init__(arm_model, target, population_size, generations, seed,
+                         adaptive)
+        self.local_search_interval = local_search_interval
+        self.local_search_iterations = local_search_iterations
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Interfaz común de los solvers de cinemática inversa
+"""
+
+import time
+import threading
+from typing import Dict, List, Callable, Optional, Tuple
+
+import numpy as np
+
+from models.chain_model import ChainModel, Point, as_point
+from models.constraints import Constraint
+from models.solver_metrics import SolverMetrics
+
+
+def angle_bounds(arm_model: ChainModel) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Límites de búsqueda de cada ángulo en grados
+
+    Args:
+        arm_model: Modelo del brazo
+
+    Returns:
+        Límites inferior y superior (gamma: 0-180, theta: -180-180)
+    """
+    is_gamma = np.array(['gamma' in name for name in arm_model.angle_names])
+    return np.where(is_gamma, 0.0, -180.0), np.full(len(is_gamma), 180.0)
+
+
+class IKSolver:
+    """Base de los solvers de cinemática inversa
+
+    Todos los solvers se construyen con `(arm_model, target, ...)`, donde
+    `arm_model` es cualquier `ChainModel` y `target` un punto {'x', 'y', 'z'}
+    o un arreglo (3,), y exponen
+    `solve(callback)`, que devuelve el mejor diccionario de ángulos en grados
+    y llama a `callback(solucion, fitness, iteracion)` durante el progreso.
+
+    `solve()` es "anytime": con `set_time_budget(segundos)` o `cancel()` desde
+    otro hilo, el bucle principal termina en la siguiente generación o
+    iteración y devuelve la mejor solución encontrada hasta ese momento.
+
+    Las restricciones de `constraints` (por ejemplo `SelfCollisionConstraint`)
+    se suman al fitness de cada configuración evaluada, así que una sola
+    ejecución ya devuelve soluciones válidas.
+    """
+
+    def __init__(self, arm_model: ChainModel, target: Point):
+        """
+        Inicializar el solver
+
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+        """
+        self.arm_model = arm_model
+        self.target = target
+        self.tolerance = 0.01  # 1cm
+
+        # Límites por ángulo (gamma: 0-180, theta: -180-180)
+        self.lower_bounds, self.upper_bounds = angle_bounds(arm_model)
+
+        self._target_array = as_point(target)
+
+        # Arranque en caliente: soluciones previas y perturbaciones de ellas
+        self.initial_guesses: List[Dict[str, float]] = []
+        self.warm_start_fraction = 0.5
+        self.warm_start_sigma = 5.0  # grados
+
+        # Tiempos por fase, evaluaciones y curva de convergencia del último solve()
+        self.metrics = SolverMetrics(type(self).__name__)
+
+        # Presupuesto de tiempo y cancelación cooperativa
+        self.time_budget: Optional[float] = None  # segundos
+        self._deadline: Optional[float] = None
+        self._cancel_event = threading.Event()
+
+        # Restricciones penalizadas dentro del fitness
+        self.constraints: List[Constraint] = []
+
+    def add_constraint(self, constraint: Constraint) -> None:
+        """
+        Añadir una restricción al fitness
+
+        Args:
+            constraint: Restricción evaluada sobre las posiciones de la población
+        """
+        self.constraints.append(constraint)
+
+    def set_initial_guesses(self, guesses: List[Dict[str, float]]) -> None:
+        """
+        Sembrar el solver con configuraciones conocidas cerca del objetivo
+
+        Args:
+            guesses: Diccionarios de ángulos en grados
+        """
+        self.initial_guesses = [dict(guess) for guess in guesses]
+
+    def set_time_budget(self, seconds: Optional[float]) -> None:
+        """
+        Limitar el tiempo de pared de cada solve()
+
+        Args:
+            seconds: Presupuesto en segundos (None: sin límite)
+        """
+        self.time_budget = seconds
+
+    def cancel(self) -> None:
+        """Pedir (desde cualquier hilo) que solve() acabe con la mejor solución"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True si se pidió cancelar"""
+        return self._cancel_event.is_set()
+
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+
+        Args:
+            callback: Función de callback para progreso
+
+        Returns:
+            Mejor solución encontrada o None
+        """
+        raise NotImplementedError
+
+    def _start_solve(self) -> None:
+        """Iniciar las métricas y fijar el plazo de esta ejecución de solve()"""
+        self.metrics.start()
+        self._deadline = None
+        if self.time_budget is not None:
+            self._deadline = time.perf_counter() + self.time_budget
+
+    def _remaining_time(self) -> Optional[float]:
+        """Segundos que quedan del presupuesto (None: sin límite)"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.perf_counter())
+
+    def _should_stop(self) -> bool:
+        """Cancelado o plazo agotado: hay que devolver la mejor solución hasta ahora"""
+        if self._cancel_event.is_set():
+            self.metrics.stop_reason = 'cancelled'
+            return True
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self.metrics.stop_reason = 'deadline'
+            return True
+        return False
+
+    def _warm_start_population(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Generar la parte sembrada de una población inicial
+
+        Args:
+            size: Tamaño total de la población
+            rng: Generador aleatorio
+
+        Returns:
+            Arreglo (K, 6) con las soluciones previas y perturbaciones
+            gaussianas de ellas, K <= size * warm_start_fraction
+        """
+        if not self.initial_guesses:
+            return np.empty((0, len(self.lower_bounds)))
+
+        guesses = np.array([self.arm_model.angles_to_array(guess)
+                            for guess in self.initial_guesses])
+        count = max(len(guesses), int(size * self.warm_start_fraction))
+        count = min(count, size)
+
+        parents = guesses[np.arange(count) % len(guesses)]
+        noise = rng.normal(scale=self.warm_start_sigma, size=parents.shape)
+        noise[:min(len(guesses), count)] = 0.0  # conservar las soluciones tal cual
+
+        return self._project_to_bounds(parents + noise)
+
+    def _evaluate_population(self, population: np.ndarray) -> np.ndarray:
+        """Evaluar fitness (distancia más penalizaciones) de ángulos (P, 6)"""
+        with self.metrics.phase('evaluate'):
+            positions = self.arm_model.forward_kinematics_batch(population)
+            fitness = np.linalg.norm(positions[:, -1] - self._target_array, axis=1)
+        if self.constraints:
+            fitness += self._constraint_penalty(positions)
+        self.metrics.count_evaluations(len(population))
+        return fitness
+
+    def _constraint_penalty(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Sumar las penalizaciones de todas las restricciones
+
+        Args:
+            positions: Posiciones de las articulaciones (P, N + 1, 3)
+
+        Returns:
+            Penalización total (P,)
+        """
+        penalty = np.zeros(len(positions))
+        with self.metrics.phase('constraints'):
+            for constraint in self.constraints:
+                penalty += constraint.penalty(positions)
+        return penalty
+
+    def _project_to_bounds(self, population: np.ndarray) -> np.ndarray:
+        """Envolver los ángulos de vuelta completa y recortar el resto a sus límites"""
+        periodic = (self.upper_bounds - self.lower_bounds) >= 360.0
+        wrapped = np.where(
+            periodic,
+            (population - self.lower_bounds) % 360.0 + self.lower_bounds,
+            population
+        )
+        return np.clip(wrapped, self.lower_bounds, self.upper_bounds)
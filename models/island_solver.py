@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Solver genético por islas - Evoluciona subpoblaciones en procesos separados
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Callable, Optional, Tuple
+
+import numpy as np
+
+from models.adaptive_control import AdaptiveControl
+from models.chain_model import ChainModel, Point
+from models.genetic_solver import VectorizedGeneticSolver
+from models.ik_solver import IKSolver
+
+
+def _evolve_island(config: Dict, population: Optional[np.ndarray],
+                   control: Optional[AdaptiveControl], generations: int,
+                   seed: np.random.SeedSequence,
+                   deadline: Optional[float] = None
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, int,
+                              Optional[AdaptiveControl]]:
+    """
+    Evolucionar una isla en un proceso trabajador
+
+    Args:
+        config: Longitudes del brazo, objetivo, restricciones y parámetros
+            del algoritmo
+        population: Población de la isla o None para generarla
+        control: Control adaptativo de la isla, con el estado de las épocas
+            anteriores (None: parámetros fijos)
+        generations: Generaciones a evolucionar antes de migrar
+        seed: Semilla de esta isla para esta época
+        deadline: Instante límite del solve() en `time.time()` (None: sin
+            límite); la isla evalúa al menos su población aunque ya haya pasado
+
+    Returns:
+        Población final, su fitness, mejor individuo, su fitness, número
+        de evaluaciones y control adaptativo actualizado
+    """
+    arm_model = ChainModel(config['link_lengths'])
+    solver = VectorizedGeneticSolver(
+        arm_model,
+        config['target'],
+        population_size=config['population_size'],
+        generations=generations,
+        seed=seed
+    )
+    for name, value in config['parameters'].items():
+        setattr(solver, name, value)
+    solver.set_initial_guesses(config['initial_guesses'])
+    solver.constraints = list(config['constraints'])
+    solver.adaptive_control = control
+    if deadline is not None:
+        solver.set_time_budget(max(0.0, deadline - time.time()))
+    solver._start_solve()
+
+    if population is None:
+        population = solver._generate_initial_population()
+
+    result = solver.evolve(population, generations)
+    return result + (solver.metrics.evaluations, control)
+
+
+def create_island_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Crear un pool de procesos para las islas
+
+    'spawn' evita clonar el estado de Qt al crear los procesos. Arrancar cada
+    proceso (intérprete e importación de numpy) cuesta unas décimas de
+    segundo, así que conviene crear el pool una vez y pasarlo a todos los
+    solvers.
+
+    Args:
+        max_workers: Procesos del pool (por defecto, uno por núcleo)
+
+    Returns:
+        Pool de procesos
+    """
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+class IslandGeneticSolver(IKSolver):
+    """Solver genético con modelo de islas sobre un pool de procesos
+
+    Cada isla es una población de `VectorizedGeneticSolver` que evoluciona en
+    su propio proceso durante `migration_interval` generaciones; después los
+    mejores individuos de cada isla reemplazan a los peores de la siguiente
+    (topología en anillo). El plazo de `set_time_budget` se pasa a los
+    procesos como instante absoluto: cada isla para dentro de la época al
+    llegar a él, tras evaluar al menos su población, y devuelve lo que tenga.
+    Mientras tanto el proceso principal espera a las islas con un margen de
+    `deadline_grace` segundos sobre el plazo (para el arranque de los
+    procesos); `cancel()` interrumpe la espera en el acto. Se devuelve el
+    mejor individuo de todas las épocas, incluidas las islas que terminaron
+    en una época interrumpida.
+
+    Con `adaptive=True`, el control adaptativo de cada isla pasa de una época
+    a la siguiente, de modo que los reinicios por estancamiento funcionan
+    igual que en un solo proceso; el solve() termina con
+    `stop_reason = 'stalled'` cuando todas las islas dejan de mejorar.
+
+    El pool de procesos se crea en el primer solve() y se reutiliza en los
+    siguientes; quien crea el solver debe cerrarlo con `close()` (o usarlo
+    en un bloque `with`). También se puede pasar uno compartido por varios
+    solvers, que no se cierra y queda a cargo de quien lo creó.
+    """
+
+    def __init__(self, arm_model: ChainModel, target: Point,
+                 population_size: int = 100, generations: int = 200,
+                 islands: Optional[int] = None, migration_interval: int = 10,
+                 migration_size: int = 2, max_workers: Optional[int] = None,
+                 seed: Optional[int] = None, adaptive: bool = False,
+                 executor: Optional[ProcessPoolExecutor] = None):
+        """
+        Inicializar el solver por islas
+
+        Args:
+            arm_model: Modelo del brazo
+            target: Punto objetivo
+            population_size: Tamaño de la población de cada isla
+            generations: Número de generaciones
+            islands: Número de islas (por defecto, uno por núcleo)
+            migration_interval: Generaciones entre migraciones
+            migration_size: Individuos que migran de cada isla
+            max_workers: Procesos del pool propio (por defecto, uno por isla)
+            seed: Semilla del generador aleatorio
+            adaptive: Adaptar la mutación, reiniciar y parar al estancarse
+            executor: Pool compartido de `create_island_executor` (por
+                defecto, uno propio creado al primer solve())
+        """
+        super().__init__(arm_model, target)
+        self.population_size = population_size
+        self.generations = generations
+        self.islands = islands or os.cpu_count() or 1
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.max_workers = max_workers or min(self.islands, os.cpu_count() or 1)
+        self.seed = seed
+        self.adaptive = adaptive
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        # Parámetros del algoritmo genético de cada isla
+        self.mutation_rate = 0.1
+        self.crossover_rate = 0.8
+        self.elite_size = 5
+        self.local_search_interval = 0
+        self.local_search_iterations = 5
+
+        # Cada cuánto se revisan plazo y cancelación mientras las islas evolucionan (s)
+        self.poll_interval = 0.01
+
+        # Espera extra sobre el plazo para que las islas devuelvan su época (s)
+        self.deadline_grace = 1.0
+
+    def solve(self, callback: Optional[Callable] = None) -> Optional[Dict[str, float]]:
+        """
+        Resolver cinemática inversa
+
+        Args:
+            callback: Función de callback para progreso, llamada tras cada
+                migración con la última generación completada
+
+        Returns:
+            Mejor solución encontrada o None
+        """
+        config = {
+            'link_lengths': self.arm_model.link_lengths.tolist(),
+            'target': self._target_array.tolist(),
+            'population_size': self.population_size,
+            'initial_guesses': self.initial_guesses,
+            'constraints': self.constraints,
+            'parameters': {
+                'mutation_rate': self.mutation_rate,
+                'crossover_rate': self.crossover_rate,
+                'elite_size': self.elite_size,
+                'tolerance': self.tolerance,
+                'local_search_interval': self.local_search_interval,
+                'local_search_iterations': self.local_search_iterations,
+            },
+        }
+        island_seeds = np.random.SeedSequence(self.seed).spawn(self.islands)
+        populations: List[Optional[np.ndarray]] = [None] * self.islands
+        controls = [
+            AdaptiveControl(self.lower_bounds, self.upper_bounds)
+            if self.adaptive else None
+            for _ in range(self.islands)
+        ]
+
+        self._start_solve()
+        best_solution = None
+        best_fitness = float('inf')
+        generation = 0
+
+        executor = self.executor
+        while generation < self.generations:
+            epoch = min(self.migration_interval, self.generations - generation)
+            remaining = self._remaining_time()
+            deadline = None if remaining is None else time.time() + remaining
+            futures = [
+                executor.submit(_evolve_island, config, populations[i], controls[i],
+                                epoch, island_seeds[i].spawn(1)[0], deadline)
+                for i in range(self.islands)
+            ]
+            with self.metrics.phase('evolve'):
+                interrupted = not self._wait_for_epoch(futures)
+
+            # Las islas que terminaron cuentan aunque la época se interrumpiera
+            results = [
+                future.result() for future in futures
+                if future.done() and not future.cancelled()
+                and future.exception() is None
+            ]
+            for _, _, island_best, island_fitness, evaluations, _ in results:
+                self.metrics.count_evaluations(evaluations)
+                if island_best is not None and island_fitness < best_fitness:
+                    best_fitness = island_fitness
+                    best_solution = island_best.copy()
+            if interrupted:
+                # Sin esperar a las islas en curso: paran solas al terminar la época
+                for future in futures:
+                    future.cancel()
+                break
+            # Un error en una isla se propaga como en una llamada normal
+            results = [future.result() for future in futures]
+            generation += epoch
+            controls = [control for *_, control in results]
+
+            self.metrics.record_generation(
+                generation - 1, best_fitness,
+                np.concatenate([fitness for _, fitness, *_ in results]),
+                np.concatenate([population for population, *_ in results])
+            )
+            if self.adaptive:
+                self.metrics.restarts = sum(control.restarts for control in controls)
+
+            # Verificar convergencia, plazo y cancelación
+            if best_fitness < self.tolerance:
+                break
+            if self._should_stop():
+                break
+            if self.adaptive and all(
+                    control.stalled_generations >= control.stop_patience
+                    for control in controls):
+                self.metrics.stop_reason = 'stalled'
+                break
+
+            with self.metrics.phase('migrate'):
+                populations = self._migrate(results)
+
+            # Callback para progreso
+            if callback:
+                callback(self.arm_model.array_to_angles(best_solution), best_fitness,
+                         generation - 1)
+
+        self.metrics.finish(best_fitness)
+        if best_solution is None:
+            return None
+        return self.arm_model.array_to_angles(best_solution)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Pool de procesos de las islas, creado la primera vez que se usa"""
+        if self._executor is None:
+            self._executor = create_island_executor(self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """Cerrar el pool propio sin esperar a las islas en curso"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'IslandGeneticSolver':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _wait_for_epoch(self, futures: List) -> bool:
+        """
+        Esperar a las islas; False si se interrumpió la espera
+
+        La cancelación la interrumpe en el acto. Con el plazo agotado se
+        sigue esperando hasta `deadline_grace` segundos más, porque las islas
+        paran solas en cuanto evalúan su población.
+        """
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=self.poll_interval)
+            if not pending:
+                break
+            if self.cancelled:
+                self._should_stop()
+                return False
+            expired = (self._deadline is not None
+                       and time.perf_counter() >= self._deadline + self.deadline_grace)
+            if expired:
+                self._should_stop()
+                return False
+        return True
+
+    def _migrate(self, results: List[Tuple]) -> List[np.ndarray]:
+        """Reemplazar los peores de cada isla por los mejores de la anterior"""
+        populations = [population.copy() for population, *_ in results]
+        orders = [np.argsort(fitness) for _, fitness, *_ in results]
+        size = min(self.migration_size, self.population_size)
+
+        if self.islands < 2 or size <= 0:
+            return populations
+
+        for i in range(self.islands):
+            source = i - 1
+            migrants = results[source][0][orders[source][:size]]
+            populations[i][orders[i][-size:]] = migrants
+
+        return populations
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Trayectoria articular - Movimiento suave precalculado entre dos configuraciones
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from models.chain_model import ChainModel
+
+
+def minimum_jerk_profile(tau: np.ndarray) -> np.ndarray:
+    """
+    Perfil de mínimo jerk s(tau) = 10 tau^3 - 15 tau^4 + 6 tau^5
+
+    Parte y llega con velocidad y aceleración nulas.
+
+    Args:
+        tau: Tiempo normalizado en [0, 1]
+
+    Returns:
+        Fracción recorrida en [0, 1]
+    """
+    tau = np.clip(tau, 0.0, 1.0)
+    return tau ** 3 * (10.0 + tau * (-15.0 + 6.0 * tau))
+
+
+class JointTrajectory:
+    """Trayectoria en el espacio articular muestreada a una tasa fija
+
+    Todos los cuadros se calculan al construirla: los ángulos (F, 2N) y, en
+    una sola pasada vectorizada de cinemática directa, las posiciones
+    (F, N + 1, 3). Reproducirla es indexar el cuadro del instante pedido.
+    """
+
+    # La velocidad máxima del perfil de mínimo jerk es 1.875 veces la media
+    PEAK_SPEED_RATIO = 1.875
+
+    def __init__(self, angles: np.ndarray, positions: np.ndarray, frame_rate: float):
+        """
+        Inicializar la trayectoria
+
+        Args:
+            angles: Ángulos por cuadro (F, 2N) en grados
+            positions: Posiciones de las articulaciones por cuadro (F, N + 1, 3)
+            frame_rate: Cuadros por segundo
+        """
+        self.angles = angles
+        self.positions = positions
+        self.frame_rate = float(frame_rate)
+
+    @classmethod
+    def minimum_jerk(cls, arm_model: ChainModel, start: np.ndarray, goal: np.ndarray,
+                     duration: Optional[float] = None, max_speed: float = 180.0,
+                     min_duration: float = 0.3,
+                     frame_rate: float = 60.0) -> 'JointTrajectory':
+        """
+        Interpolar de `start` a `goal` con el perfil de mínimo jerk
+
+        Args:
+            arm_model: Cadena para la cinemática directa de los cuadros
+            start: Ángulos de partida (2N,) en grados
+            goal: Ángulos de llegada (2N,) en grados
+            duration: Duración en segundos; por defecto, la necesaria para que
+                ninguna articulación supere `max_speed`
+            max_speed: Velocidad articular máxima en grados por segundo
+            min_duration: Duración mínima cuando se calcula automáticamente
+                (sin movimiento la trayectoria tiene dos cuadros iguales, el
+                de partida y el de llegada)
+            frame_rate: Cuadros por segundo
+
+        Returns:
+            Trayectoria con todos los cuadros precalculados
+        """
+        start = np.asarray(start, dtype=float)
+        goal = np.asarray(goal, dtype=float)
+        delta = goal - start
+
+        if duration is None:
+            largest_move = float(np.max(np.abs(delta))) if delta.size else 0.0
+            duration = 0.0
+            if largest_move:
+                duration = max(min_duration,
+                               cls.PEAK_SPEED_RATIO * largest_move / max_speed)
+
+        frames = max(2, int(np.ceil(duration * frame_rate)) + 1)
+        progress = minimum_jerk_profile(np.linspace(0.0, 1.0, frames))
+        angles = start + progress[:, None] * delta
+
+        return cls(angles, arm_model.forward_kinematics_batch(angles), frame_rate)
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    @property
+    def duration(self) -> float:
+        """Duración en segundos"""
+        return (len(self) - 1) / self.frame_rate
+
+    def frame_at(self, elapsed: float) -> int:
+        """
+        Índice del cuadro que corresponde a un instante
+
+        Args:
+            elapsed: Segundos desde el inicio de la reproducción
+
+        Returns:
+            Índice del cuadro, saturado al último
+        """
+        return min(int(elapsed * self.frame_rate), len(self) - 1)
+
+    def is_finished(self, elapsed: float) -> bool:
+        """Verificar si la reproducción llegó al último cuadro"""
+        return self.frame_at(elapsed) == len(self) - 1
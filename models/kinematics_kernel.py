@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Núcleos de cinemática generados - FK y jacobiano en forma cerrada por geometría
+"""
+
+import re
+import sys
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+# Término de una suma: (signo, factor, factor); '1' y '0' son constantes
+Term = Tuple[int, str, str]
+
+_IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+
+
+class KinematicsKernel:
+    """Funciones de cinemática compiladas para unas longitudes fijas
+
+    `forward` y `jacobian` operan sobre lotes (..., 2N) con numpy;
+    `forward_scalar` y `jacobian_scalar` sobre una configuración (2N,) con
+    `math`, sin el costo fijo de los ufuncs sobre arreglos pequeños. Devuelven
+    lo mismo que `ChainModel.forward_kinematics_batch` y `jacobian_batch`.
+    `update_from[k]` es la cinemática directa incremental de
+    `ChainModel.update_positions`: parte de la rotación y posición guardadas
+    del segmento k y reescribe las siguientes.
+    """
+
+    def __init__(self, link_lengths: Sequence[float]):
+        """
+        Generar y compilar los núcleos
+
+        Args:
+            link_lengths: Longitud de cada segmento
+        """
+        self.link_lengths = tuple(float(length) for length in link_lengths)
+        self.sources: Dict[str, str] = {}
+
+        self.forward = self._compile('forward', 'forward', vectorized=True)
+        self.forward_scalar = self._compile('forward_scalar', 'forward',
+                                            vectorized=False)
+        self.jacobian = self._compile('jacobian', 'jacobian', vectorized=True)
+        self.jacobian_scalar = self._compile('jacobian_scalar', 'jacobian',
+                                             vectorized=False)
+
+        # update_from[k](angles, rotations, positions): recalcular desde el segmento k
+        self.update_from = [
+            self._compile(f'update_from_{k}', 'update', vectorized=False, start_link=k)
+            for k in range(len(self.link_lengths))
+        ]
+
+    def _compile(self, name: str, kind: str, vectorized: bool,
+                 start_link: int = 0) -> Callable:
+        """Generar el código de una variante y compilarlo"""
+        source = generate_kernel_source(self.link_lengths, name, kind, vectorized,
+                                        start_link)
+        self.sources[name] = source
+
+        namespace = {'np': np}
+        if not vectorized:
+            namespace.update(cos=math.cos, sin=math.sin)
+        exec(compile(source, f'<kinematics_kernel:{name}>', 'exec'), namespace)
+        return namespace[name]
+
+
+@lru_cache(maxsize=32)
+def compile_kernel(link_lengths: Tuple[float, ...]) -> KinematicsKernel:
+    """
+    Núcleo de una geometría, compilado una sola vez por proceso
+
+    Args:
+        link_lengths: Longitudes de los segmentos (tupla, para la caché)
+
+    Returns:
+        Núcleo compilado
+    """
+    return KinematicsKernel(link_lengths)
+
+
+def generate_kernel_source(link_lengths: Sequence[float], name: str = 'forward',
+                           kind: str = 'forward', vectorized: bool = True,
+                           start_link: int = 0) -> str:
+    """
+    Generar el código de la cinemática de una cadena
+
+    Desarrolla Rz(theta_i) @ Ry(gamma_i) segmento a segmento sobre variables
+    escalares: las longitudes quedan como literales, los productos por 0 y 1
+    desaparecen, el seno y coseno de cada ángulo se calculan una vez y se
+    eliminan las asignaciones que no llegan a la salida (en la cinemática
+    directa sobran, por ejemplo, las columnas y y z del último marco).
+
+    Args:
+        link_lengths: Longitud de cada segmento
+        name: Nombre de la función generada
+        kind: 'forward' (posiciones), 'jacobian' (posiciones y jacobiano) o
+            'update' (escribe rotaciones y posiciones desde `start_link` en
+            los arreglos recibidos, partiendo del marco guardado)
+        vectorized: Variante con numpy sobre lotes (..., 2N) o escalar con math
+        start_link: Primer segmento recalculado (solo para 'update')
+
+    Returns:
+        Código fuente de la función
+    """
+    if kind not in ('forward', 'jacobian', 'update'):
+        raise ValueError(f"Tipo de núcleo desconocido: {kind}")
+    if kind == 'update' and vectorized:
+        raise ValueError("El núcleo 'update' solo tiene variante escalar")
+
+    n_links = len(link_lengths)
+    lines: List[Tuple[str, str]] = []
+
+    def assign(target: str, terms: List[Term]) -> str:
+        """Emitir target = suma de términos, o devolver la constante o alias"""
+        expression = _sum_expression(terms)
+        if expression in ('0', '1') or _IDENTIFIER.fullmatch(expression):
+            return expression
+        lines.append((target, expression))
+        return target
+
+    # Marco de partida por columnas: rotation[columna][fila]
+    if start_link:
+        rotation = [[f'b{row}{col}' for row in range(3)] for col in range(3)]
+        position = [f'p{start_link}{axis}' for axis in 'xyz']
+    else:
+        rotation = [['1', '0', '0'], ['0', '1', '0'], ['0', '0', '1']]
+        position = ['0', '0', '0']
+    positions = [position]
+    rotations = []
+    axes: List[List[str]] = []
+
+    for i in range(start_link, n_links):
+        cos_t, sin_t, cos_g, sin_g = f'ct{i}', f'st{i}', f'cg{i}', f'sg{i}'
+
+        # Eje de theta_i: z del marco anterior
+        axes.append(rotation[2])
+
+        # rotation @ Rz(theta)
+        x_axis = [
+            assign(f'a{i}x{r}',
+                   [(1, rotation[0][r], cos_t), (1, rotation[1][r], sin_t)])
+            for r in range(3)
+        ]
+        y_axis = [
+            assign(f'a{i}y{r}',
+                   [(1, rotation[1][r], cos_t), (-1, rotation[0][r], sin_t)])
+            for r in range(3)
+        ]
+
+        # Eje de gamma_i: y tras aplicar theta_i
+        axes.append(y_axis)
+
+        # ... @ Ry(gamma)
+        z_axis = rotation[2]
+        rotation = [
+            [assign(f'r{i}x{r}', [(1, x_axis[r], cos_g), (-1, z_axis[r], sin_g)])
+             for r in range(3)],
+            y_axis,
+            [assign(f'r{i}z{r}', [(1, x_axis[r], sin_g), (1, z_axis[r], cos_g)])
+             for r in range(3)],
+        ]
+        rotations.append(rotation)
+
+        literal = repr(float(link_lengths[i]))
+        position = [
+            assign(f'p{i + 1}{axis}',
+                   [(1, position[r], '1'), (1, literal, rotation[0][r])])
+            for r, axis in enumerate('xyz')
+        ]
+        positions.append(position)
+
+    if kind == 'update':
+        # Filas de cada rotación y posiciones de los segmentos recalculados
+        rotation_rows = [
+            [[frame[col][row] for col in range(3)] for row in range(3)]
+            for frame in rotations
+        ]
+        outputs = [value for frame in rotation_rows for row in frame for value in row]
+        outputs += [value for point in positions[1:] for value in point]
+    else:
+        outputs = [value for point in positions for value in point]
+
+    if kind == 'jacobian':
+        # Columna j: eje_j x (p_final - p_articulación)
+        end = positions[-1]
+        levers = [
+            [assign(f'l{i}{r}', [(1, end[r], '1'), (-1, positions[i][r], '1')])
+             for r in range(3)]
+            for i in range(n_links)
+        ]
+        columns = []
+        for j, axis in enumerate(axes):
+            lever = levers[j // 2]
+            columns.append([
+                assign(f'j{j}x', [(1, axis[1], lever[2]), (-1, axis[2], lever[1])]),
+                assign(f'j{j}y', [(1, axis[2], lever[0]), (-1, axis[0], lever[2])]),
+                assign(f'j{j}z', [(1, axis[0], lever[1]), (-1, axis[1], lever[0])]),
+            ])
+        outputs += [column[r] for r in range(3) for column in columns]
+
+    body = _eliminate_dead_code(lines, outputs)
+    expressions = [expression for _, expression in body] + outputs
+    used = set(_IDENTIFIER.findall(' '.join(expressions)))
+
+    # Entradas: marco guardado, ángulos en radianes y su seno y coseno (solo los usados)
+    if kind == 'update':
+        source = [f'def {name}(angles, rotations, positions):']
+        if start_link:
+            rows = ', '.join(
+                f"({', '.join(f'b{row}{col}' for col in range(3))})" for row in range(3)
+            )
+            start = ', '.join(positions[0])
+            source.append(f'    {rows} = rotations[{start_link}].tolist()')
+            source.append(f'    {start} = positions[{start_link}].tolist()')
+    else:
+        source = [f'def {name}(angles):']
+    if vectorized:
+        source.append('    q = np.radians(np.asarray(angles, dtype=float))')
+        source.append('    batch_shape = q.shape[:-1]')
+    for k in range(2 * start_link, 2 * n_links):
+        prefix = ('t', 'g')[k % 2]
+        i = k // 2
+        needs_cos, needs_sin = f'c{prefix}{i}' in used, f's{prefix}{i}' in used
+        if not (needs_cos or needs_sin):
+            continue
+        if vectorized:
+            source.append(f'    q{k} = q[..., {k}]')
+        else:
+            source.append(f'    q{k} = angles[{k}] * {np.pi / 180.0!r}')
+        trig = 'np.' if vectorized else ''
+        if needs_cos:
+            source.append(f'    c{prefix}{i} = {trig}cos(q{k})')
+        if needs_sin:
+            source.append(f'    s{prefix}{i} = {trig}sin(q{k})')
+
+    source.extend(f'    {target} = {expression}' for target, expression in body)
+
+    n_positions = 3 * (n_links + 1)
+    if kind == 'update':
+        n_rotations = 9 * (n_links - start_link)
+        values = ', '.join(_scalar_output(value) for value in outputs[:n_rotations])
+        source.append(f'    rotations[{start_link + 1}:].flat = [{values}]')
+        values = ', '.join(_scalar_output(value) for value in outputs[n_rotations:])
+        source.append(f'    positions[{start_link + 1}:].flat = [{values}]')
+        return '\n'.join(source) + '\n'
+
+    if vectorized:
+        source.append('    zero = np.zeros(batch_shape)')
+        values = ', '.join(_vector_output(value) for value in outputs[:n_positions])
+        source.append(f'    positions = np.stack([{values}], axis=-1)'
+                      f'.reshape(batch_shape + ({n_links + 1}, 3))')
+        if kind == 'jacobian':
+            values = ', '.join(_vector_output(value) for value in outputs[n_positions:])
+            source.append(f'    jacobian = np.stack([{values}], axis=-1)'
+                          f'.reshape(batch_shape + (3, {2 * n_links}))')
+    else:
+        values = ', '.join(_scalar_output(value) for value in outputs[:n_positions])
+        source.append(f'    positions = np.array([{values}]).reshape({n_links + 1}, 3)')
+        if kind == 'jacobian':
+            values = ', '.join(_scalar_output(value) for value in outputs[n_positions:])
+            source.append(
+                f'    jacobian = np.array([{values}]).reshape(3, {2 * n_links})'
+            )
+
+    if kind == 'jacobian':
+        source.append('    return positions, jacobian')
+    else:
+        source.append('    return positions')
+    return '\n'.join(source) + '\n'
+
+
+def verify_kernel(chain_model, samples: int = 200, seed: int = 0,
+                  epsilon: float = 1e-6) -> Dict[str, float]:
+    """
+    Comparar el núcleo de una cadena con la ruta de matrices homogéneas
+
+    La cinemática directa se compara con `forward_kinematics_matrix` y el
+    jacobiano con diferencias centrales de esa misma ruta.
+
+    Args:
+        chain_model: Cadena (ChainModel) a verificar
+        samples: Configuraciones aleatorias
+        seed: Semilla del generador aleatorio
+        epsilon: Paso de las diferencias finitas en radianes
+
+    Returns:
+        Error máximo de cada variante
+    """
+    kernel = compile_kernel(tuple(chain_model.link_lengths))
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(-180.0, 180.0, size=(samples, 2 * chain_model.n_links))
+
+    matrix_path = chain_model.forward_kinematics_matrix
+    reference = np.array([matrix_path(values) for values in angles])
+    step = np.degrees(epsilon)
+    numeric = np.empty((samples, 3, angles.shape[1]))
+    for j in range(angles.shape[1]):
+        forward, backward = angles.copy(), angles.copy()
+        forward[:, j] += step
+        backward[:, j] -= step
+        numeric[:, :, j] = [
+            (matrix_path(f)[-1] - matrix_path(b)[-1]) / (2 * epsilon)
+            for f, b in zip(forward, backward)
+        ]
+
+    positions, jacobian = kernel.jacobian(angles)
+    scalar = [kernel.jacobian_scalar(values) for values in angles]
+
+    forward_scalar = np.array([kernel.forward_scalar(values) for values in angles])
+    jacobian_scalar = np.array([values for _, values in scalar])
+
+    return {
+        'forward': float(np.max(np.abs(kernel.forward(angles) - reference))),
+        'forward_scalar': float(np.max(np.abs(forward_scalar - reference))),
+        'jacobian_positions': float(np.max(np.abs(positions - reference))),
+        'jacobian': float(np.max(np.abs(jacobian - numeric))),
+        'jacobian_scalar': float(np.max(np.abs(jacobian_scalar - numeric))),
+    }
+
+
+def _sum_expression(terms: List[Term]) -> str:
+    """Escribir una suma de productos omitiendo ceros y unos"""
+    parts = []
+    for sign, left, right in terms:
+        if '0' in (left, right):
+            continue
+        factors = [factor for factor in (left, right) if factor != '1']
+        product = ' * '.join(factors) if factors else '1'
+        parts.append((sign, product))
+
+    if not parts:
+        return '0'
+
+    # Empezar por un término positivo si lo hay: "b - a" en vez de "-a + b"
+    parts.sort(key=lambda part: part[0] < 0)
+    sign, product = parts[0]
+    expression = product if sign > 0 else f'-{product}'
+    for sign, product in parts[1:]:
+        expression += f' + {product}' if sign > 0 else f' - {product}'
+    return expression
+
+
+def _eliminate_dead_code(lines: List[Tuple[str, str]],
+                         outputs: List[str]) -> List[Tuple[str, str]]:
+    """Quitar las asignaciones que no alcanzan la salida"""
+    needed: Set[str] = set(outputs)
+    kept = []
+    for target, expression in reversed(lines):
+        if target in needed:
+            kept.append((target, expression))
+            needed.update(_IDENTIFIER.findall(expression))
+    return kept[::-1]
+
+
+def _vector_output(value: str) -> str:
+    """Salida de la variante vectorizada: las constantes toman la forma del lote"""
+    if value in ('0', '1'):
+        return 'zero' if value == '0' else 'zero + 1.0'
+    return value
+
+
+def _scalar_output(value: str) -> str:
+    """Salida de la variante escalar"""
+    return f'{value}.0' if value in ('0', '1') else value
+
+
+if __name__ == "__main__":
+    # Verificación: python -m models.kinematics_kernel [longitudes...]
+    from models.chain_model import ChainModel
+
+    lengths = [float(value) for value in sys.argv[1:]] or [3.0, 2.5, 2.0]
+    chain = ChainModel(lengths)
+    print(compile_kernel(tuple(chain.link_lengths)).sources['jacobian_scalar'])
+    for variant, error in verify_kernel(chain).items():
+        print(f"{variant}: error máximo {error:.2e}")
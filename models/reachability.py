@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Rejilla de alcanzabilidad - Voxeles del espacio de trabajo real del brazo
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from models.chain_model import ChainModel, Point, as_point
+from models.ik_solver import angle_bounds
+
+# Directorio por defecto de las rejillas precalculadas
+DEFAULT_GRID_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'reachability'
+)
+
+
+class ReachabilityGrid:
+    """Rejilla de ocupación de los puntos que el efector final puede alcanzar
+
+    theta1 da una vuelta completa alrededor del eje z, así que el espacio de
+    trabajo es un sólido de revolución: basta muestrear su perfil (r, z) con
+    theta1 = 0, refinarlo en su frontera, dilatarlo para no rechazar objetivos
+    alcanzables y revolucionarlo sobre los voxeles. Cada consulta es un acceso
+    a un arreglo.
+
+    Con `excluded_radius` (por ejemplo `SelfCollisionConstraint.base_clearance`
+    si la autocolisión está activa) los objetivos a menos de esa distancia
+    del origen se rechazan también: el último segmento no puede llegar ahí
+    sin atravesar la base.
+    """
+
+    def __init__(self, occupancy: np.ndarray, origin: np.ndarray, voxel_size: float):
+        """
+        Inicializar la rejilla
+
+        Args:
+            occupancy: Arreglo booleano (nx, ny, nz) de voxeles alcanzables
+            origin: Esquina mínima de la rejilla (3,)
+            voxel_size: Lado de cada voxel
+        """
+        self.occupancy = occupancy
+        self.origin = np.asarray(origin, dtype=float)
+        self.voxel_size = float(voxel_size)
+        self.excluded_radius = 0.0
+
+    @classmethod
+    def build(cls, arm_model: ChainModel, voxel_size: float = 0.1,
+              samples: int = 800_000, dilation: int = 2, refinement_rounds: int = 6,
+              seed: Optional[int] = 0) -> 'ReachabilityGrid':
+        """
+        Muestrear el perfil del espacio de trabajo y construir la rejilla
+
+        Args:
+            arm_model: Modelo del brazo
+            voxel_size: Lado de cada voxel
+            samples: Configuraciones muestreadas para el perfil (r, z)
+            dilation: Celdas de dilatación del perfil
+            refinement_rounds: Rondas de perturbación de las muestras de la frontera
+            seed: Semilla del generador aleatorio
+
+        Returns:
+            Rejilla construida
+        """
+        rng = np.random.default_rng(seed)
+        lower, upper = angle_bounds(arm_model)
+        reach = float(np.sum(arm_model.link_lengths))
+
+        cells = int(np.ceil(reach / voxel_size)) + dilation + 1
+        profile = np.zeros((cells, 2 * cells), dtype=bool)
+
+        def mark(angles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Marcar las celdas (r, z) alcanzadas y devolver sus índices"""
+            positions = arm_model.forward_kinematics_batch(angles)[:, -1]
+            radii = np.hypot(positions[:, 0], positions[:, 1])
+            r_index = np.floor(radii / voxel_size).astype(int)
+            z_index = np.floor(positions[:, 2] / voxel_size).astype(int) + cells
+            profile[r_index, z_index] = True
+            return r_index, z_index
+
+        # Perfil (r, z) con theta1 = 0
+        angles = rng.uniform(lower, upper, size=(samples, len(lower)))
+        angles[:, 0] = 0.0
+        r_index, z_index = mark(angles)
+
+        # El muestreo uniforme de ángulos deja huecos donde el perfil es
+        # delgado (cerca del eje z): perturbar las muestras de la frontera
+        for _ in range(refinement_rounds):
+            frontier = ~_dilate(~profile, 1)
+            on_frontier = ~frontier[r_index, z_index]
+            parents = angles[on_frontier][:samples]
+            if not len(parents):
+                break
+            angles = parents + rng.normal(scale=2.0, size=parents.shape)
+            angles = np.clip(angles, lower, upper)
+            angles[:, 0] = 0.0
+            r_index, z_index = mark(angles)
+
+        # Dilatar el perfil para cubrir los huecos restantes
+        profile = _dilate(profile, dilation)
+
+        # Revolucionar el perfil sobre los centros de los voxeles
+        origin = np.full(3, -cells * voxel_size)
+        centers = origin[0] + (np.arange(2 * cells) + 0.5) * voxel_size
+        x, y = np.meshgrid(centers, centers, indexing='ij')
+        r_cells = np.minimum(np.floor(np.hypot(x, y) / voxel_size).astype(int),
+                             cells - 1)
+        occupancy = profile[r_cells[:, :, None], np.arange(2 * cells)[None, None, :]]
+
+        return cls(occupancy, origin, voxel_size)
+
+    @classmethod
+    def load_or_build(cls, arm_model: ChainModel, directory: str = DEFAULT_GRID_DIR,
+                      voxel_size: float = 0.1, **build_options) -> 'ReachabilityGrid':
+        """
+        Abrir la rejilla guardada para este brazo o construirla y guardarla
+
+        Args:
+            arm_model: Modelo del brazo
+            directory: Directorio de la caché en disco
+            voxel_size: Lado de cada voxel
+            **build_options: Parámetros de `build`
+
+        Returns:
+            Rejilla del brazo
+        """
+        key = cls._cache_key(arm_model, voxel_size, build_options)
+        grid_path = os.path.join(directory, f'grid_{key}.npy')
+        metadata_path = os.path.join(directory, f'grid_{key}.json')
+
+        if os.path.exists(grid_path) and os.path.exists(metadata_path):
+            with open(metadata_path) as metadata_file:
+                metadata = json.load(metadata_file)
+            return cls(np.load(grid_path, mmap_mode='r'), metadata['origin'],
+                       metadata['voxel_size'])
+
+        grid = cls.build(arm_model, voxel_size=voxel_size, **build_options)
+
+        # Escritura atómica: varios procesos pueden construirla a la vez
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, suffix='.npy',
+                                         delete=False) as grid_file:
+            np.save(grid_file, grid.occupancy)
+        os.replace(grid_file.name, grid_path)
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.json',
+                                         delete=False) as metadata_file:
+            json.dump({'origin': grid.origin.tolist(), 'voxel_size': grid.voxel_size},
+                      metadata_file)
+        os.replace(metadata_file.name, metadata_path)
+
+        return grid
+
+    def is_reachable(self, target: Point) -> bool:
+        """
+        Verificar si un objetivo cae en un voxel alcanzable
+
+        Args:
+            target: Punto objetivo
+
+        Returns:
+            True si es alcanzable
+        """
+        return bool(self.are_reachable(as_point(target)[None, :])[0])
+
+    def are_reachable(self, points: np.ndarray) -> np.ndarray:
+        """
+        Verificar un arreglo de objetivos
+
+        Args:
+            points: Objetivos (N, 3)
+
+        Returns:
+            Arreglo booleano (N,)
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        reachable = np.zeros(len(points), dtype=bool)
+
+        # NaN o infinito no son objetivos: se rechazan sin calcular su voxel
+        rows = np.flatnonzero(np.all(np.isfinite(points), axis=1))
+        indices = np.floor((points[rows] - self.origin) / self.voxel_size).astype(int)
+        inside = np.all((indices >= 0) & (indices < self.occupancy.shape), axis=1)
+        rows, indices = rows[inside], indices[inside]
+
+        i, j, k = indices.T
+        reachable[rows] = self.occupancy[i, j, k]
+
+        # Esfera de la base: alcanzable sin restricciones, pero en colisión
+        if self.excluded_radius > 0.0:
+            outside = np.linalg.norm(points[rows], axis=1) >= self.excluded_radius
+            reachable[rows] &= outside
+        return reachable
+
+    @staticmethod
+    def _cache_key(arm_model: ChainModel, voxel_size: float,
+                   build_options: Dict) -> str:
+        """Huella de la geometría, los rangos articulares y los parámetros"""
+        lower, upper = angle_bounds(arm_model)
+        description = json.dumps({
+            'link_lengths': arm_model.link_lengths.tolist(),
+            'lower': lower.tolist(),
+            'upper': upper.tolist(),
+            'voxel_size': voxel_size,
+            'options': build_options,
+        }, sort_keys=True)
+        return hashlib.sha1(description.encode()).hexdigest()[:16]
+
+
+def _dilate(mask: np.ndarray, steps: int) -> np.ndarray:
+    """Dilatar una máscara 2D con vecindad de 4 celdas"""
+    for _ in range(steps):
+        dilated = mask.copy()
+        dilated[1:, :] |= mask[:-1, :]
+        dilated[:-1, :] |= mask[1:, :]
+        dilated[:, 1:] |= mask[:, :-1]
+        dilated[:, :-1] |= mask[:, 1:]
+        mask = dilated
+    return mask
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Escena de obstáculos - Esferas, cajas y cápsulas sobre una rejilla uniforme
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from models.constraints import Constraint, point_segment_distances, segment_distances
+
+# Celdas como máximo de la rejilla (el índice es denso: un offset por celda)
+MAX_GRID_CELLS = 1 << 21
+
+# Tipos de obstáculo
+SPHERE, BOX, CAPSULE = 0, 1, 2
+
+# Aristas de una caja como pares de esquinas; la esquina i toma de max los
+# ejes cuyos bits están activos (bit 0: x, bit 1: y, bit 2: z)
+BOX_EDGES = np.array([
+    (0, 1), (2, 3), (4, 5), (6, 7),
+    (0, 2), (1, 3), (4, 6), (5, 7),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+])
+BOX_CORNER_BITS = (np.arange(8)[:, None] >> np.arange(3)[None, :]) & 1
+
+
+class UniformGrid:
+    """Rejilla uniforme sobre cajas alineadas a los ejes (AABB)
+
+    Cada elemento se registra en todas las celdas que toca su AABB. Las
+    celdas se guardan en formato CSR: `offsets[c]:offsets[c + 1]` son las
+    posiciones en `items` de los elementos de la celda c, así que una consulta
+    solo indexa arreglos, sin recorrer los elementos. Construcción y consultas
+    se hacen para lotes enteros de cajas a la vez.
+    """
+
+    def __init__(self, aabb_min: np.ndarray, aabb_max: np.ndarray,
+                 cell_size: Optional[float] = None):
+        """
+        Construir el índice
+
+        Args:
+            aabb_min: Esquinas mínimas de los elementos (M, 3)
+            aabb_max: Esquinas máximas de los elementos (M, 3)
+            cell_size: Lado de cada celda; por defecto, la mediana de la mayor
+                extensión de los elementos (agrandada si la rejilla excede
+                `MAX_GRID_CELLS`)
+        """
+        aabb_min = np.asarray(aabb_min, dtype=float).reshape(-1, 3)
+        aabb_max = np.asarray(aabb_max, dtype=float).reshape(-1, 3)
+        self.origin = aabb_min.min(axis=0)
+        extent = np.maximum(aabb_max.max(axis=0) - self.origin, 1e-9)
+
+        if cell_size is None:
+            cell_size = float(np.median((aabb_max - aabb_min).max(axis=1)))
+            if cell_size <= 0.0:
+                cell_size = float(np.cbrt(np.prod(extent) / len(aabb_min)))
+        smallest = float(np.cbrt(np.prod(extent) / MAX_GRID_CELLS))
+        cell_size = max(cell_size, smallest, 1e-6)
+
+        self.cell_size = cell_size
+        self.dims = np.maximum(np.ceil(extent / cell_size).astype(np.int64), 1)
+
+        cells, items = self._covered_cells(aabb_min, aabb_max)
+        order = np.argsort(cells, kind='stable')
+        self.items = items[order]
+        counts = np.bincount(cells, minlength=int(np.prod(self.dims)))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    @property
+    def cell_count(self) -> int:
+        """Número total de celdas"""
+        return int(np.prod(self.dims))
+
+    def candidates(self, box_min: np.ndarray,
+                   box_max: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pares (consulta, elemento) que comparten alguna celda
+
+        Un mismo par puede repetirse si comparten varias celdas.
+
+        Args:
+            box_min: Esquinas mínimas de las cajas de consulta (Q, 3)
+            box_max: Esquinas máximas de las cajas de consulta (Q, 3)
+
+        Returns:
+            Índices de consulta y de elemento, ambos (K,)
+        """
+        cells, queries = self._covered_cells(box_min, box_max)
+        begin = self.offsets[cells]
+        counts = self.offsets[cells + 1] - begin
+        positions = _expand_ranges(begin, counts)
+        return np.repeat(queries, counts), self.items[positions]
+
+    def _covered_cells(self, box_min: np.ndarray,
+                       box_max: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Celdas que toca cada caja (las que caen fuera de la rejilla se ignoran)"""
+        upper = self.origin + self.dims * self.cell_size
+        inside = np.all((box_max >= self.origin) & (box_min <= upper), axis=1)
+        boxes = np.flatnonzero(inside)
+
+        low = np.floor((box_min[boxes] - self.origin) / self.cell_size)
+        high = np.floor((box_max[boxes] - self.origin) / self.cell_size)
+        low, high = low.astype(np.int64), high.astype(np.int64)
+        low = np.clip(low, 0, self.dims - 1)
+        high = np.clip(high, 0, self.dims - 1)
+        spans = high - low + 1
+
+        # Desplegar el bloque de celdas de cada caja
+        counts = np.prod(spans, axis=1)
+        owners = np.repeat(np.arange(len(boxes)), counts)
+        local = _expand_ranges(np.zeros(len(boxes), dtype=np.int64), counts)
+        span_y, span_z = spans[owners, 1], spans[owners, 2]
+        i = low[owners, 0] + local // (span_y * span_z)
+        j = low[owners, 1] + (local // span_z) % span_y
+        k = low[owners, 2] + local % span_z
+
+        cells = (i * self.dims[1] + j) * self.dims[2] + k
+        return cells, boxes[owners]
+
+
+class ObstacleScene:
+    """Obstáculos fijos de la celda de trabajo
+
+    Esferas, cajas alineadas a los ejes y cápsulas, guardadas en arreglos por
+    tipo. Todas se indexan juntas por su AABB en una `UniformGrid` que se
+    reconstruye al consultar después de añadir obstáculos. Las consultas
+    reciben lotes de cápsulas (los segmentos del brazo de toda una población)
+    y solo calculan distancias exactas contra los obstáculos de sus celdas.
+    """
+
+    def __init__(self, cell_size: Optional[float] = None):
+        """
+        Inicializar una escena vacía
+
+        Args:
+            cell_size: Lado de las celdas del índice (por defecto, automático)
+        """
+        self.cell_size = cell_size
+        self.sphere_centers = np.zeros((0, 3))
+        self.sphere_radii = np.zeros(0)
+        self.box_min = np.zeros((0, 3))
+        self.box_max = np.zeros((0, 3))
+        self.capsule_starts = np.zeros((0, 3))
+        self.capsule_ends = np.zeros((0, 3))
+        self.capsule_radii = np.zeros(0)
+        self._index = None
+        self._aabb = None
+        self._version = 0
+
+    def __len__(self) -> int:
+        return len(self.sphere_radii) + len(self.box_min) + len(self.capsule_radii)
+
+    @property
+    def version(self) -> int:
+        """Contador que cambia con cada modificación (para cachés de la vista)"""
+        return self._version
+
+    def add_spheres(self, centers: np.ndarray, radii: np.ndarray) -> None:
+        """
+        Añadir esferas
+
+        Args:
+            centers: Centros (S, 3)
+            radii: Radios (S,) o un radio común
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), len(centers))
+        if np.any(radii <= 0.0):
+            raise ValueError("El radio de las esferas debe ser positivo")
+        self.sphere_centers = np.vstack([self.sphere_centers, centers])
+        self.sphere_radii = np.concatenate([self.sphere_radii, radii])
+        self._changed()
+
+    def add_boxes(self, min_corners: np.ndarray, max_corners: np.ndarray) -> None:
+        """
+        Añadir cajas alineadas a los ejes
+
+        Args:
+            min_corners: Esquinas mínimas (B, 3)
+            max_corners: Esquinas máximas (B, 3), mayores en cada eje
+        """
+        min_corners = np.asarray(min_corners, dtype=float).reshape(-1, 3)
+        max_corners = np.asarray(max_corners, dtype=float).reshape(-1, 3)
+        if np.any(max_corners <= min_corners):
+            raise ValueError("La esquina máxima de una caja debe ser mayor que "
+                             "la mínima en cada eje")
+        self.box_min = np.vstack([self.box_min, min_corners])
+        self.box_max = np.vstack([self.box_max, max_corners])
+        self._changed()
+
+    def add_capsules(self, starts: np.ndarray, ends: np.ndarray,
+                     radii: np.ndarray) -> None:
+        """
+        Añadir cápsulas (segmentos con radio)
+
+        Args:
+            starts: Extremos iniciales (C, 3)
+            ends: Extremos finales (C, 3), distintos de los iniciales
+            radii: Radios (C,) o un radio común
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), len(starts))
+        if np.any(radii <= 0.0):
+            raise ValueError("El radio de las cápsulas debe ser positivo")
+        if np.any(np.all(starts == ends, axis=1)):
+            raise ValueError("Una cápsula de longitud nula es una esfera: "
+                             "usar add_spheres")
+        self.capsule_starts = np.vstack([self.capsule_starts, starts])
+        self.capsule_ends = np.vstack([self.capsule_ends, ends])
+        self.capsule_radii = np.concatenate([self.capsule_radii, radii])
+        self._changed()
+
+    def add_sphere(self, center, radius: float) -> None:
+        """Añadir una esfera"""
+        self.add_spheres([center], [radius])
+
+    def add_box(self, min_corner, max_corner) -> None:
+        """Añadir una caja alineada a los ejes"""
+        self.add_boxes([min_corner], [max_corner])
+
+    def add_capsule(self, start, end, radius: float) -> None:
+        """Añadir una cápsula"""
+        self.add_capsules([start], [end], [radius])
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ObstacleScene':
+        """
+        Crear una escena desde su descripción
+
+        Args:
+            data: {'cell_size': float (opcional),
+                   'spheres': [{'center': [x, y, z], 'radius': r}, ...],
+                   'boxes': [{'min': [x, y, z], 'max': [x, y, z]}, ...],
+                   'capsules': [{'start': [x, y, z], 'end': [x, y, z],
+                                 'radius': r}, ...]}
+
+        Returns:
+            Escena con los obstáculos descritos
+        """
+        scene = cls(data.get('cell_size'))
+        spheres = data.get('spheres', [])
+        boxes = data.get('boxes', [])
+        capsules = data.get('capsules', [])
+        if spheres:
+            scene.add_spheres([s['center'] for s in spheres],
+                              [s['radius'] for s in spheres])
+        if boxes:
+            scene.add_boxes([b['min'] for b in boxes], [b['max'] for b in boxes])
+        if capsules:
+            scene.add_capsules([c['start'] for c in capsules],
+                               [c['end'] for c in capsules],
+                               [c['radius'] for c in capsules])
+        return scene
+
+    @classmethod
+    def load(cls, path: str) -> 'ObstacleScene':
+        """
+        Cargar una escena desde un archivo JSON (formato de `from_dict`)
+
+        Args:
+            path: Ruta del archivo
+
+        Returns:
+            Escena cargada
+        """
+        with open(path) as scene_file:
+            return cls.from_dict(json.load(scene_file))
+
+    @property
+    def index(self) -> Optional[UniformGrid]:
+        """Rejilla de todos los obstáculos (None si la escena está vacía)"""
+        if self._index is None and len(self):
+            self._aabb = self._aabbs()
+            self._index = UniformGrid(*self._aabb, self.cell_size)
+        return self._index
+
+    def capsule_penetrations(self, starts: np.ndarray, ends: np.ndarray,
+                             radius: float) -> np.ndarray:
+        """
+        Penetración de cápsulas en los obstáculos
+
+        Fase amplia: cada segmento se parte en trozos no más largos que una
+        celda (el AABB de un segmento diagonal largo cubriría muchas celdas
+        vacías) y se consulta la rejilla con sus AABB. Fase estrecha: distancia
+        exacta del segmento completo a cada obstáculo candidato.
+
+        Args:
+            starts: Extremos iniciales de las cápsulas (Q, 3)
+            ends: Extremos finales de las cápsulas (Q, 3)
+            radius: Radio de las cápsulas
+
+        Returns:
+            Suma por cápsula de max(0, radio - distancia al obstáculo) (Q,)
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        penetrations = np.zeros(len(starts))
+        queries, obstacles = self.candidate_pairs(starts, ends, radius)
+        if not len(queries):
+            return penetrations
+
+        distances = self._distances(queries, obstacles, starts[queries], ends[queries])
+        depth = np.maximum(0.0, radius - distances)
+        return penetrations + np.bincount(queries, weights=depth, minlength=len(starts))
+
+    def candidate_pairs(self, starts: np.ndarray, ends: np.ndarray,
+                        radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pares únicos (cápsula, obstáculo) de la fase amplia
+
+        Args:
+            starts: Extremos iniciales de las cápsulas (Q, 3)
+            ends: Extremos finales de las cápsulas (Q, 3)
+            radius: Radio de las cápsulas
+
+        Returns:
+            Índices de cápsula y de obstáculo (numeración global: esferas,
+            cajas y luego cápsulas), ambos (K,)
+        """
+        index = self.index
+        if index is None or not len(starts):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # Trozos de como mucho una celda de largo
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        pieces = np.maximum(np.ceil(lengths / index.cell_size).astype(np.int64), 1)
+        owners = np.repeat(np.arange(len(starts)), pieces)
+        step = _expand_ranges(np.zeros(len(starts), dtype=np.int64), pieces)
+        fraction = (1.0 / pieces)[owners][:, None]
+        direction = (ends - starts)[owners]
+        piece_starts = starts[owners] + direction * (step[:, None] * fraction)
+        piece_ends = piece_starts + direction * fraction
+
+        piece_ids, obstacles = index.candidates(
+            np.minimum(piece_starts, piece_ends) - radius,
+            np.maximum(piece_starts, piece_ends) + radius
+        )
+        if not len(piece_ids):
+            return piece_ids, obstacles
+
+        # Un par se repite por cada trozo y cada celda compartida
+        keys = np.unique(owners[piece_ids] * np.int64(len(self)) + obstacles)
+        queries, obstacles = keys // len(self), keys % len(self)
+
+        # Compartir celda no implica que los AABB se solapen
+        aabb_min, aabb_max = self._aabb
+        overlap = np.all(
+            (np.minimum(starts, ends)[queries] - radius <= aabb_max[obstacles])
+            & (np.maximum(starts, ends)[queries] + radius >= aabb_min[obstacles]),
+            axis=1
+        )
+        return queries[overlap], obstacles[overlap]
+
+    def _distances(self, queries: np.ndarray, obstacles: np.ndarray,
+                   starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Distancia de cada segmento a la superficie de su obstáculo (K,)"""
+        distances = np.empty(len(queries))
+        n_spheres = len(self.sphere_radii)
+        n_boxes = len(self.box_min)
+
+        kind = np.searchsorted([n_spheres, n_spheres + n_boxes], obstacles,
+                               side='right')
+
+        selected = kind == SPHERE
+        if np.any(selected):
+            local = obstacles[selected]
+            distances[selected] = point_segment_distances(
+                self.sphere_centers[local], starts[selected], ends[selected]
+            ) - self.sphere_radii[local]
+
+        selected = kind == BOX
+        if np.any(selected):
+            local = obstacles[selected] - n_spheres
+            distances[selected] = segment_box_distances(
+                starts[selected], ends[selected],
+                self.box_min[local], self.box_max[local]
+            )
+
+        selected = kind == CAPSULE
+        if np.any(selected):
+            local = obstacles[selected] - n_spheres - n_boxes
+            distances[selected] = segment_distances(
+                starts[selected], ends[selected],
+                self.capsule_starts[local], self.capsule_ends[local]
+            ) - self.capsule_radii[local]
+
+        return distances
+
+    def _aabbs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """AABB de todos los obstáculos en la numeración global (M, 3) x 2"""
+        sphere_radii = self.sphere_radii[:, None]
+        capsule_radii = self.capsule_radii[:, None]
+        aabb_min = np.vstack([
+            self.sphere_centers - sphere_radii,
+            self.box_min,
+            np.minimum(self.capsule_starts, self.capsule_ends) - capsule_radii,
+        ])
+        aabb_max = np.vstack([
+            self.sphere_centers + sphere_radii,
+            self.box_max,
+            np.maximum(self.capsule_starts, self.capsule_ends) + capsule_radii,
+        ])
+        return aabb_min, aabb_max
+
+    def _changed(self) -> None:
+        """Invalidar el índice tras modificar la escena"""
+        self._index = None
+        self._version += 1
+
+
+class ObstacleConstraint(Constraint):
+    """Segmentos del brazo que atraviesan obstáculos de la escena
+
+    Cada segmento es una cápsula de radio `link_radius`; la violación de una
+    configuración es la suma de las penetraciones de todos sus segmentos en
+    todos los obstáculos. Los segmentos de toda la población se consultan en
+    un solo lote contra el índice de la escena.
+    """
+
+    def __init__(self, scene: ObstacleScene, link_radius: float = 0.1,
+                 weight: float = 1.0, hard: bool = True):
+        """
+        Inicializar la restricción
+
+        Args:
+            scene: Escena de obstáculos
+            link_radius: Radio de cada segmento
+            weight: Peso de la violación en el fitness
+            hard: Separar las configuraciones inválidas de las válidas
+        """
+        super().__init__(weight, hard)
+        self.scene = scene
+        self.link_radius = link_radius
+
+    def violation(self, positions: np.ndarray) -> np.ndarray:
+        """Suma de penetraciones en los obstáculos (P,)"""
+        population, n_joints = positions.shape[:2]
+        if not len(self.scene):
+            return np.zeros(population)
+
+        penetrations = self.scene.capsule_penetrations(
+            positions[:, :-1].reshape(-1, 3), positions[:, 1:].reshape(-1, 3),
+            self.link_radius
+        )
+        return penetrations.reshape(population, n_joints - 1).sum(axis=1)
+
+
+def segment_box_distances(p: np.ndarray, q: np.ndarray,
+                          box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+    """
+    Distancia mínima de segmentos [p, q] a cajas alineadas a los ejes
+
+    Cero si el segmento corta la caja (prueba de placas). Si no, el punto más
+    cercano del segmento es un extremo o, si es interior, su par en la caja
+    está en una arista, así que basta el mínimo entre la distancia de los
+    extremos a la caja y la de las 12 aristas al segmento.
+
+    Args:
+        p, q: Extremos de los segmentos (K, 3)
+        box_min, box_max: Esquinas de las cajas (K, 3)
+
+    Returns:
+        Distancias (K,)
+    """
+    # Prueba de placas: intervalo de t en [0, 1] dentro de las tres placas
+    direction = q - p
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (box_min - p) / direction
+        t2 = (box_max - p) / direction
+    parallel = direction == 0.0
+    inside_slab = (p >= box_min) & (p <= box_max)
+    t_near = np.where(parallel, np.where(inside_slab, -np.inf, np.inf),
+                      np.minimum(t1, t2))
+    t_far = np.where(parallel, np.where(inside_slab, np.inf, -np.inf),
+                     np.maximum(t1, t2))
+    enter = np.maximum(t_near.max(axis=1), 0.0)
+    leave = np.minimum(t_far.min(axis=1), 1.0)
+    intersects = enter <= leave
+
+    endpoints = np.minimum(_point_box_distances(p, box_min, box_max),
+                           _point_box_distances(q, box_min, box_max))
+
+    corners = np.where(BOX_CORNER_BITS[None], box_max[:, None], box_min[:, None])
+    edges = segment_distances(
+        p[:, None], q[:, None], corners[:, BOX_EDGES[:, 0]], corners[:, BOX_EDGES[:, 1]]
+    ).min(axis=1)
+
+    return np.where(intersects, 0.0, np.minimum(endpoints, edges))
+
+
+def _point_box_distances(point: np.ndarray, box_min: np.ndarray,
+                         box_max: np.ndarray) -> np.ndarray:
+    """Distancia de puntos a cajas alineadas a los ejes (0 dentro)"""
+    outside = np.maximum(np.maximum(box_min - point, point - box_max), 0.0)
+    return np.linalg.norm(outside, axis=-1)
+
+
+def _expand_ranges(begin: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenar los rangos begin[i] : begin[i] + counts[i]"""
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.cumsum(counts) - counts
+    return np.arange(total) - np.repeat(starts - begin, counts)
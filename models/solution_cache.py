@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Caché LRU de soluciones de cinemática inversa por objetivo cuantizado
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.chain_model import Point, as_point
+
+Key = Tuple[int, int, int]
+Entry = Tuple[np.ndarray, Dict[str, float], np.ndarray]
+
+
+class SolutionCache:
+    """Caché acotada de objetivos resueltos con desalojo LRU
+
+    Las entradas se indexan por el objetivo cuantizado a `resolution`. Un
+    segundo índice con celdas de tamaño `near_distance` permite encontrar
+    soluciones vecinas revisando solo las 27 celdas adyacentes.
+    """
+
+    def __init__(self, max_entries: int = 1024, resolution: float = 0.001,
+                 near_distance: float = 0.05, max_neighbors: int = 8):
+        """
+        Inicializar la caché
+
+        Args:
+            max_entries: Número máximo de objetivos guardados
+            resolution: Tamaño de celda para cuantizar (x, y, z)
+            near_distance: Distancia máxima de un acierto cercano
+            max_neighbors: Número máximo de soluciones cercanas devueltas
+        """
+        self.max_entries = max_entries
+        self.resolution = resolution
+        self.near_distance = near_distance
+        self.max_neighbors = max_neighbors
+
+        # clave -> (objetivo, solución, posición alcanzada)
+        self._entries: "OrderedDict[Key, Entry]" = OrderedDict()
+        self._near_index: Dict[Key, Set[Key]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, target: Point, tolerance: float) -> Optional[Dict[str, float]]:
+        """
+        Buscar un acierto exacto
+
+        Args:
+            target: Punto objetivo
+            tolerance: Distancia máxima aceptada entre la posición alcanzada
+                por la solución guardada y el objetivo
+
+        Returns:
+            Solución guardada o None
+        """
+        key = self._key(target, self.resolution)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        _, solution, position = entry
+        if self._distance(position, target) >= tolerance:
+            return None
+
+        self._entries.move_to_end(key)
+        return dict(solution)
+
+    def nearby(self, target: Point) -> List[Dict[str, float]]:
+        """
+        Buscar soluciones de objetivos cercanos para sembrar un solver
+
+        Args:
+            target: Punto objetivo
+
+        Returns:
+            Soluciones ordenadas por cercanía de su objetivo
+        """
+        cx, cy, cz = self._key(target, self.near_distance)
+        candidates = []
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for key in self._near_index.get((cx + dx, cy + dy, cz + dz), ()):
+                        cached_target, solution, _ = self._entries[key]
+                        distance = self._distance(cached_target, target)
+                        if distance <= self.near_distance:
+                            candidates.append((distance, key, solution))
+
+        candidates.sort(key=lambda item: item[0])
+        for _, key, _ in candidates[:self.max_neighbors]:
+            self._entries.move_to_end(key)
+
+        return [dict(solution) for _, _, solution in candidates[:self.max_neighbors]]
+
+    def put(self, target: Point, solution: Dict[str, float], position: Point) -> None:
+        """
+        Guardar una solución
+
+        Args:
+            target: Punto objetivo
+            solution: Ángulos en grados
+            position: Posición del efector final con esa solución
+        """
+        key = self._key(target, self.resolution)
+        if key in self._entries:
+            self._unindex(key, self._entries.pop(key)[0])
+
+        self._entries[key] = (as_point(target), dict(solution), as_point(position))
+        near_key = self._key(target, self.near_distance)
+        self._near_index.setdefault(near_key, set()).add(key)
+
+        # Desalojar los menos usados recientemente
+        while len(self._entries) > self.max_entries:
+            old_key, (old_target, _, _) = self._entries.popitem(last=False)
+            self._unindex(old_key, old_target)
+
+    def clear(self) -> None:
+        """Vaciar la caché"""
+        self._entries.clear()
+        self._near_index.clear()
+
+    def _unindex(self, key: Key, target: Point) -> None:
+        """Quitar una entrada del índice de vecinos"""
+        cell_key = self._key(target, self.near_distance)
+        cell = self._near_index[cell_key]
+        cell.discard(key)
+        if not cell:
+            del self._near_index[cell_key]
+
+    @staticmethod
+    def _key(point: Point, cell_size: float) -> Key:
+        """Cuantizar un punto a su celda"""
+        x, y, z = as_point(point)
+        return (
+            math.floor(x / cell_size),
+            math.floor(y / cell_size),
+            math.floor(z / cell_size),
+        )
+
+    @staticmethod
+    def _distance(a: Point, b: Point) -> float:
+        return float(np.linalg.norm(as_point(a) - as_point(b)))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Métricas de ejecución de los solvers - Tiempos por fase, evaluaciones y convergencia
+"""
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO, Union
+
+import numpy as np
+
+
+class SolverMetrics:
+    """Registro estructurado de una ejecución de `solve()`
+
+    Acumula el tiempo de pared por fase (evaluate, select, crossover,
+    mutate, ...), el número de evaluaciones de fitness y, por generación o
+    iteración, el mejor fitness, el fitness medio y la diversidad de la
+    población. Se exporta como JSONL: un registro por generación y uno final
+    de resumen. `stop_reason` indica si la ejecución terminó antes por plazo
+    agotado ('deadline'), cancelación ('cancelled') o estancamiento
+    ('stalled').
+    """
+
+    def __init__(self, solver_name: Optional[str] = None):
+        """
+        Inicializar las métricas
+
+        Args:
+            solver_name: Nombre del solver que se mide
+        """
+        self.solver_name = solver_name
+        self.phase_times: Dict[str, float] = defaultdict(float)
+        self.evaluations = 0
+        self.restarts = 0
+        self.generations: List[Dict] = []
+        self.final_residual: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+
+    def start(self) -> None:
+        """Marcar el inicio de la ejecución y descartar una medición anterior"""
+        self.phase_times.clear()
+        self.evaluations = 0
+        self.restarts = 0
+        self.generations.clear()
+        self.final_residual = None
+        self.stop_reason = None
+        self.end_time = None
+        self.start_time = time.perf_counter()
+
+    def finish(self, final_residual: Optional[float]) -> None:
+        """
+        Marcar el final de la ejecución
+
+        Args:
+            final_residual: Distancia al objetivo de la mejor solución
+        """
+        self.end_time = time.perf_counter()
+        if final_residual is not None and np.isfinite(final_residual):
+            self.final_residual = float(final_residual)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Acumular el tiempo de pared del bloque en la fase `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] += time.perf_counter() - start
+
+    def count_evaluations(self, count: int) -> None:
+        """Sumar evaluaciones de fitness"""
+        self.evaluations += int(count)
+
+    def count_restart(self) -> None:
+        """Contar un reinicio parcial de la población"""
+        self.restarts += 1
+
+    def record_generation(self, generation: int, best_fitness: float,
+                          fitness: Optional[np.ndarray] = None,
+                          population: Optional[np.ndarray] = None,
+                          mutation_scale: Optional[float] = None) -> None:
+        """
+        Registrar un punto de la curva de convergencia
+
+        Args:
+            generation: Generación o iteración
+            best_fitness: Mejor fitness hasta ahora
+            fitness: Fitness de la población actual
+            population: Población actual (P, 6) en grados, para la diversidad
+            mutation_scale: Escala de mutación del control adaptativo
+        """
+        record = {
+            'generation': int(generation),
+            'elapsed_s': self.elapsed,
+            'evaluations': self.evaluations,
+            'best_fitness': float(best_fitness),
+        }
+        if fitness is not None and len(fitness):
+            record['mean_fitness'] = float(np.mean(fitness))
+        if population is not None and len(population) > 1:
+            record['diversity'] = population_diversity(population)
+        if mutation_scale is not None:
+            record['mutation_scale'] = float(mutation_scale)
+        self.generations.append(record)
+
+    @property
+    def elapsed(self) -> float:
+        """Tiempo de pared desde `start()` (hasta `finish()` si ya terminó)"""
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    @property
+    def evaluations_per_second(self) -> float:
+        """Evaluaciones de fitness por segundo de pared"""
+        elapsed = self.elapsed
+        return self.evaluations / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        """Resumen de la ejecución"""
+        return {
+            'solver': self.solver_name,
+            'elapsed_s': self.elapsed,
+            'evaluations': self.evaluations,
+            'evaluations_per_s': self.evaluations_per_second,
+            'generations': len(self.generations),
+            'restarts': self.restarts,
+            'final_residual': self.final_residual,
+            'stop_reason': self.stop_reason,
+            'phase_times_s': dict(self.phase_times),
+        }
+
+    def records(self, **extra) -> Iterator[Dict]:
+        """
+        Registros de la curva de convergencia y el resumen
+
+        Args:
+            **extra: Campos añadidos a cada registro (por ejemplo, un id de objetivo)
+        """
+        for record in self.generations:
+            yield {'type': 'generation', **extra, **record}
+        yield {'type': 'summary', **extra, **self.summary()}
+
+    def write_jsonl(self, destination: Union[str, TextIO], **extra) -> None:
+        """
+        Escribir los registros como JSONL
+
+        Args:
+            destination: Ruta (se añade al final) o flujo de texto abierto
+            **extra: Campos añadidos a cada registro
+        """
+        lines = ''.join(json.dumps(record) + '\n' for record in self.records(**extra))
+        if isinstance(destination, str):
+            with open(destination, 'a') as output_file:
+                output_file.write(lines)
+        else:
+            destination.write(lines)
+
+
+def population_diversity(population: np.ndarray) -> float:
+    """Desviación estándar media por gen de una población (P, 6), en grados"""
+    return float(np.mean(np.std(population, axis=0)))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Registro de solvers de cinemática inversa
+"""
+
+from typing import Dict, Optional, Sequence, Type
+
+from models.chain_model import ChainModel, Point
+from models.constraints import Constraint
+from models.ik_solver import IKSolver
+from models.genetic_solver import (GeneticSolver, VectorizedGeneticSolver,
+                                   MemeticGeneticSolver)
+from models.island_solver import IslandGeneticSolver
+from models.dls_solver import DampedLeastSquaresSolver
+from models.cma_es_solver import CMAESSolver
+from models.differential_evolution_solver import DifferentialEvolutionSolver
+
+
+# Motores disponibles por nombre, con su etiqueta para la interfaz
+SOLVERS: Dict[str, Type[IKSolver]] = {
+    'genetic': GeneticSolver,
+    'vectorized': VectorizedGeneticSolver,
+    'memetic': MemeticGeneticSolver,
+    'islands': IslandGeneticSolver,
+    'dls': DampedLeastSquaresSolver,
+    'cmaes': CMAESSolver,
+    'de': DifferentialEvolutionSolver,
+}
+
+# Motores genéticos que aceptan `adaptive=True` (control adaptativo opcional)
+ADAPTIVE_SOLVERS = ('genetic', 'vectorized', 'memetic', 'islands')
+
+SOLVER_LABELS: Dict[str, str] = {
+    'genetic': 'Genético',
+    'vectorized': 'Genético vectorizado',
+    'memetic': 'Memético (genético + búsqueda local)',
+    'islands': 'Genético por islas',
+    'dls': 'Mínimos cuadrados amortiguados',
+    'cmaes': 'CMA-ES',
+    'de': 'Evolución diferencial',
+}
+
+
+def create_solver(name: str, arm_model: ChainModel, target: Point,
+                  constraints: Optional[Sequence[Constraint]] = None,
+                  **options) -> IKSolver:
+    """
+    Crear un solver por nombre
+
+    Args:
+        name: Nombre del motor en `SOLVERS`
+        arm_model: Modelo del brazo
+        target: Punto objetivo
+        constraints: Restricciones a penalizar en el fitness
+        **options: Parámetros propios del motor
+
+    Returns:
+        Solver listo para `solve(callback)`
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"Solver desconocido: {name}")
+    solver = SOLVERS[name](arm_model, target, **options)
+    for constraint in constraints or ():
+        solver.add_constraint(constraint)
+    return solver
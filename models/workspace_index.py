@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Índice del espacio de trabajo - Configuraciones muestreadas indexadas por posición
+"""
+
+import os
+import sys
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.arm_model import ArmModel
+from models.chain_model import ChainModel, Point, as_point
+from models.ik_solver import angle_bounds
+
+# Directorio por defecto del índice precalculado
+DEFAULT_INDEX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', 'workspace_index'
+)
+
+
+class WorkspaceIndex:
+    """KD-tree implícito sobre las posiciones del efector final
+
+    Los arreglos se guardan ya permutados en orden del árbol: el nodo del
+    rango [lo, hi) es el elemento central `mid`, que divide por el eje
+    `split_dims[mid]`; los rangos de hasta `leaf_size` elementos son hojas.
+    Así el árbol no necesita punteros y los `.npy` se abren con `np.memmap`
+    sin reconstruir nada ni cargarlos en memoria.
+    """
+
+    ANGLES_FILE = 'angles.npy'
+    POSITIONS_FILE = 'positions.npy'
+    SPLIT_DIMS_FILE = 'split_dims.npy'
+    METADATA_FILE = 'metadata.json'
+
+    def __init__(self, angles: np.ndarray, positions: np.ndarray,
+                 split_dims: np.ndarray, link_lengths: List[float],
+                 angle_names: List[str], leaf_size: int):
+        """
+        Inicializar el índice a partir de arreglos en orden del árbol
+
+        Args:
+            angles: Configuraciones (M, 6) en grados
+            positions: Posiciones del efector final (M, 3)
+            split_dims: Eje de división de cada nodo (M,)
+            link_lengths: Longitudes del brazo muestreado
+            angle_names: Nombres de las columnas de `angles`
+            leaf_size: Tamaño máximo de una hoja
+        """
+        self.angles = angles
+        self.positions = positions
+        self.split_dims = split_dims
+        self.link_lengths = list(link_lengths)
+        self.angle_names = list(angle_names)
+        self.leaf_size = leaf_size
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @classmethod
+    def build(cls, arm_model: ChainModel, samples: int = 200_000, leaf_size: int = 32,
+              seed: Optional[int] = 0) -> 'WorkspaceIndex':
+        """
+        Muestrear configuraciones y construir el árbol
+
+        Args:
+            arm_model: Modelo del brazo
+            samples: Número de configuraciones muestreadas
+            leaf_size: Tamaño máximo de una hoja
+            seed: Semilla del generador aleatorio
+
+        Returns:
+            Índice construido
+        """
+        rng = np.random.default_rng(seed)
+        lower, upper = angle_bounds(arm_model)
+        angles = rng.uniform(lower, upper, size=(samples, len(lower)))
+        positions = arm_model.forward_kinematics_batch(angles)[:, -1]
+
+        order = np.arange(samples)
+        split_dims = np.zeros(samples, dtype=np.int8)
+        stack = [(0, samples)]
+
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= leaf_size:
+                continue
+
+            # Dividir por el eje de mayor extensión en la mediana
+            indices = order[lo:hi]
+            points = positions[indices]
+            dim = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+            mid = (lo + hi) // 2
+            partition = np.argpartition(points[:, dim], mid - lo)
+            order[lo:hi] = indices[partition]
+            split_dims[mid] = dim
+
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+        return cls(
+            angles[order].astype(np.float32),
+            positions[order].astype(np.float32),
+            split_dims,
+            arm_model.link_lengths.tolist(),
+            arm_model.angle_names,
+            leaf_size
+        )
+
+    def save(self, directory: str = DEFAULT_INDEX_DIR) -> None:
+        """
+        Guardar el índice como archivos `.npy`
+
+        Args:
+            directory: Directorio de destino
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, self.ANGLES_FILE), np.asarray(self.angles))
+        np.save(os.path.join(directory, self.POSITIONS_FILE),
+                np.asarray(self.positions))
+        np.save(os.path.join(directory, self.SPLIT_DIMS_FILE),
+                np.asarray(self.split_dims))
+        with open(os.path.join(directory, self.METADATA_FILE), 'w') as metadata_file:
+            json.dump({
+                'link_lengths': self.link_lengths,
+                'angle_names': self.angle_names,
+                'leaf_size': self.leaf_size,
+            }, metadata_file)
+
+    @classmethod
+    def load(cls, directory: str = DEFAULT_INDEX_DIR,
+             arm_model: Optional[ChainModel] = None) -> Optional['WorkspaceIndex']:
+        """
+        Abrir un índice guardado como arreglos mapeados en memoria
+
+        Args:
+            directory: Directorio del índice
+            arm_model: Si se indica, solo se acepta un índice de las mismas
+                longitudes de segmentos
+
+        Returns:
+            Índice o None si no existe o no corresponde al brazo
+        """
+        metadata_path = os.path.join(directory, cls.METADATA_FILE)
+        if not os.path.exists(metadata_path):
+            return None
+
+        with open(metadata_path) as metadata_file:
+            metadata = json.load(metadata_file)
+
+        if arm_model is not None and (
+                len(metadata['link_lengths']) != arm_model.n_links
+                or not np.allclose(metadata['link_lengths'], arm_model.link_lengths)):
+            return None
+
+        return cls(
+            np.load(os.path.join(directory, cls.ANGLES_FILE), mmap_mode='r'),
+            np.load(os.path.join(directory, cls.POSITIONS_FILE), mmap_mode='r'),
+            np.load(os.path.join(directory, cls.SPLIT_DIMS_FILE), mmap_mode='r'),
+            metadata['link_lengths'],
+            metadata['angle_names'],
+            metadata['leaf_size']
+        )
+
+    def query(self, target: Point, k: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Buscar las k configuraciones cuyo efector final está más cerca del objetivo
+
+        Args:
+            target: Punto objetivo
+            k: Número de vecinos
+
+        Returns:
+            Configuraciones (k, 6) en grados y sus distancias (k,), de menor a mayor
+        """
+        point = as_point(target).astype(np.float32)
+        k = min(k, len(self))
+        best_distances = np.full(k, np.inf)
+        best_indices = np.full(k, -1)
+
+        # Pila de (lo, hi, cota inferior de la distancia² al rango)
+        stack = [(0, len(self), 0.0)]
+
+        while stack:
+            lo, hi, bound = stack.pop()
+            if lo >= hi or bound >= best_distances[-1]:
+                continue
+
+            if hi - lo <= self.leaf_size:
+                distances = np.sum((self.positions[lo:hi] - point) ** 2, axis=1)
+                candidates = np.concatenate([best_distances, distances])
+                indices = np.concatenate([best_indices, np.arange(lo, hi)])
+                keep = np.argsort(candidates, kind='stable')[:k]
+                best_distances, best_indices = candidates[keep], indices[keep]
+                continue
+
+            mid = (lo + hi) // 2
+            node = self.positions[mid]
+            distance = float(np.sum((node - point) ** 2))
+            if distance < best_distances[-1]:
+                position = np.searchsorted(best_distances, distance)
+                best_distances = np.insert(best_distances, position, distance)[:k]
+                best_indices = np.insert(best_indices, position, mid)[:k]
+
+            dim = int(self.split_dims[mid])
+            offset = float(point[dim] - node[dim])
+            if offset < 0:
+                near, far = (lo, mid), (mid + 1, hi)
+            else:
+                near, far = (mid + 1, hi), (lo, mid)
+
+            # La rama lejana se visita después y solo si puede mejorar
+            stack.append((far[0], far[1], max(bound, offset * offset)))
+            stack.append((near[0], near[1], bound))
+
+        found = best_indices >= 0
+        return (
+            np.asarray(self.angles[best_indices[found]], dtype=float),
+            np.sqrt(best_distances[found])
+        )
+
+    def nearest_solutions(self, target: Point, k: int = 8) -> List[Dict[str, float]]:
+        """
+        Configuraciones más cercanas al objetivo como diccionarios de ángulos
+
+        Args:
+            target: Punto objetivo
+            k: Número de vecinos
+
+        Returns:
+            Diccionarios de ángulos en grados, para `IKSolver.set_initial_guesses`
+        """
+        angles, _ = self.query(target, k)
+        return [dict(zip(self.angle_names, map(float, values))) for values in angles]
+
+
+if __name__ == "__main__":
+    # Construcción offline: python -m models.workspace_index [muestras] [directorio]
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    directory = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_INDEX_DIR
+    index = WorkspaceIndex.build(ArmModel(), samples=samples)
+    index.save(directory)
+    print(f"Índice de {len(index)} configuraciones guardado en {directory}")
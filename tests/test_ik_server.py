@@ -0,0 +1,38 @@
+"""
+Pruebas del servidor de cinemática inversa con micro-lotes
+"""
+
+import asyncio
+import json
+import math
+
+from ik_server import IKServer, MicroBatcher
+from models.arm_model import ArmModel
+
+
+def _solve_concurrently(server: IKServer, count: int, deadline_ms: float):
+    """Enviar `count` peticiones a la vez y devolver sus respuestas"""
+    async def run():
+        server.batcher.start()
+        try:
+            bodies = [
+                json.dumps({'id': i, 'x': 2.0, 'y': 1.0, 'z': 0.01 * i,
+                            'deadline_ms': deadline_ms}).encode()
+                for i in range(count)
+            ]
+            return await asyncio.gather(*(server.solve(body) for body in bodies))
+        finally:
+            await server.batcher.stop()
+
+    return asyncio.run(run())
+
+
+def test_short_deadline_under_load_returns_best_solution():
+    """Un lote que agota el plazo responde 200 con la mejor solución, no 504"""
+    batcher = MicroBatcher(ArmModel(), restarts=64, seed=0)
+    responses = _solve_concurrently(IKServer(batcher), 128, deadline_ms=50)
+
+    for status, result, _ in responses:
+        assert status == 200, result
+        assert math.isfinite(result['residual'])
+        assert set(result['angles']) == set(batcher.arm_model.angle_names)
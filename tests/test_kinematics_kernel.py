@@ -0,0 +1,45 @@
+"""
+Pruebas del núcleo de cinemática generado frente a la ruta de matrices
+"""
+
+import numpy as np
+import pytest
+
+from models.chain_model import ChainModel
+from models.kinematics_kernel import verify_kernel
+
+CHAINS = {
+    3: [3.0, 2.5, 2.0],
+    5: [2.0, 1.8, 1.5, 1.2, 1.0],
+    6: [1.5, 1.4, 1.3, 1.2, 1.1, 1.0],
+}
+
+
+@pytest.mark.parametrize('n_links', sorted(CHAINS))
+def test_kernel_matches_matrix_path(n_links):
+    """Cinemática directa y jacobiano de todas las variantes del núcleo"""
+    errors = verify_kernel(ChainModel(CHAINS[n_links]), samples=100)
+
+    for variant in ('forward', 'forward_scalar', 'jacobian_positions'):
+        assert errors[variant] < 1e-9, (variant, errors[variant])
+    for variant in ('jacobian', 'jacobian_scalar'):
+        assert errors[variant] < 1e-6, (variant, errors[variant])
+
+
+@pytest.mark.parametrize('n_links', sorted(CHAINS))
+def test_partial_update_matches_matrix_path(n_links):
+    """update_positions(start_link) tras cambiar solo los ángulos desde start_link"""
+    chain = ChainModel(CHAINS[n_links])
+    rng = np.random.default_rng(n_links)
+
+    for _ in range(20):
+        chain.angles[:] = rng.uniform(-180.0, 180.0, size=chain.angles.shape)
+        chain.update_positions()
+        start_link = int(rng.integers(chain.n_links))
+        chain.angles[2 * start_link:] = rng.uniform(
+            -180.0, 180.0, size=len(chain.angles) - 2 * start_link
+        )
+        chain.update_positions(start_link)
+
+        reference = chain.forward_kinematics_matrix(chain.angles)
+        np.testing.assert_allclose(chain.joint_positions, reference, rtol=0, atol=1e-9)
@@ -3,15 +3,195 @@
 Widget OpenGL para visualización 3D del brazo robótico
 """
 
+import ctypes
+from typing import Dict, Tuple
+
 import numpy as np
 from PyQt5.QtWidgets import QOpenGLWidget
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QMouseEvent, QWheelEvent
 import OpenGL.GL as gl
 import OpenGL.GLU as glu
+from OpenGL.GL import shaders
+
+# Teselación de la esfera (stacks, slices) según el zoom: más cerca, más fina
+SPHERE_LODS = (
+    (-10, (24, 32)),
+    (-20, (16, 24)),
+    (float('-inf'), (10, 12)),
+)
+
+# Ubicaciones de los atributos del shader de instancias
+POSITION_ATTRIBUTE = 0
+INSTANCE_ATTRIBUTE = 1
+COLOR_ATTRIBUTE = 2
+
+SPHERE_VERTEX_SHADER = """
+#version 120
+attribute vec3 position;
+attribute vec4 instance;        // centro (xyz) y radio (w)
+attribute vec3 instance_color;
+varying vec3 normal;
+varying vec3 color;
+
+void main() {
+    normal = gl_NormalMatrix * position;
+    color = instance_color;
+    vec3 world = instance.xyz + position * instance.w;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(world, 1.0);
+}
+"""
+
+SPHERE_FRAGMENT_SHADER = """
+#version 120
+uniform vec3 light_direction;
+varying vec3 normal;
+varying vec3 color;
+
+void main() {
+    float diffuse = max(dot(normalize(normal), light_direction), 0.0);
+    gl_FragColor = vec4(color * (0.2 + 0.8 * diffuse), 1.0);
+}
+"""
+
+# Colores de la escena
+BASE_COLOR = (0.5, 0.5, 0.5)
+SEGMENT_COLOR = (0.2, 0.6, 1.0)
+JOINT_COLOR = (1.0, 0.8, 0.0)
+END_EFFECTOR_COLOR = (1.0, 0.0, 0.0)
+TARGET_COLOR = (0.0, 1.0, 0.0)
+OBSTACLE_COLOR = (0.75, 0.4, 0.25)
+
+# Lados de los cilindros de las cápsulas
+CAPSULE_SLICES = 16
+
+# Caras de un cubo unitario como cuadriláteros de esquinas (la esquina i toma
+# 1 en los ejes cuyos bits están activos) y su normal
+CUBE_CORNERS = ((np.arange(8)[:, None] >> np.arange(3)[None, :]) & 1).astype(np.float32)
+CUBE_FACES = (
+    ((0, 2, 6, 4), (-1, 0, 0)), ((1, 3, 7, 5), (1, 0, 0)),
+    ((0, 1, 5, 4), (0, -1, 0)), ((2, 3, 7, 6), (0, 1, 0)),
+    ((0, 1, 3, 2), (0, 0, -1)), ((4, 5, 7, 6), (0, 0, 1)),
+)
+
+# Ejes de coordenadas: pares de vértices (x, y, z, r, g, b)
+AXES_VERTICES = np.array([
+    [0, 0, 0, 1, 0, 0], [5, 0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 1, 0], [0, 5, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 1], [0, 0, 5, 0, 0, 1],
+], dtype=np.float32)
+
+
+def sphere_mesh(stacks: int, slices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Malla de una esfera unitaria centrada en el origen
+    
+    Args:
+        stacks: Divisiones en latitud
+        slices: Divisiones en longitud
+    
+    Returns:
+        Vértices (V, 3) float32, que también son las normales, e índices de
+        triángulos (T * 3,) uint32
+    """
+    phi = np.linspace(0.0, np.pi, stacks + 1)[:, None]
+    theta = np.linspace(0.0, 2.0 * np.pi, slices + 1)[None, :]
+    vertices = np.stack([
+        np.sin(phi) * np.cos(theta),
+        np.sin(phi) * np.sin(theta),
+        np.cos(phi) * np.ones_like(theta),
+    ], axis=-1).reshape(-1, 3).astype(np.float32)
+    
+    row = slices + 1
+    first = (np.arange(stacks)[:, None] * row + np.arange(slices)[None, :]).ravel()
+    indices = np.stack([
+        first, first + row, first + 1,
+        first + 1, first + row, first + row + 1,
+    ], axis=-1).ravel().astype(np.uint32)
+    
+    return vertices, indices
+
+
+def box_mesh(min_corners: np.ndarray, max_corners: np.ndarray) -> np.ndarray:
+    """
+    Triángulos de cajas alineadas a los ejes
+    
+    Args:
+        min_corners: Esquinas mínimas (B, 3)
+        max_corners: Esquinas máximas (B, 3)
+    
+    Returns:
+        Vértices (B * 36, 6) float32: posición y normal
+    """
+    corners = np.array([
+        CUBE_CORNERS[[a, b, c, a, c, d]] for (a, b, c, d), _ in CUBE_FACES
+    ]).reshape(-1, 3)
+    normals = np.array([normal for _, normal in CUBE_FACES], dtype=np.float32)
+    normals = np.repeat(normals, 6, axis=0)
+    
+    min_corners = np.asarray(min_corners, dtype=np.float32)[:, None]
+    size = np.asarray(max_corners, dtype=np.float32)[:, None] - min_corners
+    positions = min_corners + corners[None] * size
+    normals = np.broadcast_to(normals, positions.shape)
+    return np.concatenate([positions, normals], axis=-1).reshape(-1, 6)
+
+
+def cylinder_mesh(starts: np.ndarray, ends: np.ndarray, radii: np.ndarray,
+                  slices: int = CAPSULE_SLICES) -> np.ndarray:
+    """
+    Triángulos del lateral de cilindros (el cuerpo de las cápsulas)
+    
+    Args:
+        starts: Centros de las bases iniciales (C, 3)
+        ends: Centros de las bases finales (C, 3)
+        radii: Radios (C,)
+        slices: Lados de cada cilindro
+    
+    Returns:
+        Vértices (C * slices * 6, 6) float32: posición y normal
+    """
+    starts = np.asarray(starts, dtype=np.float32)
+    axis = np.asarray(ends, dtype=np.float32) - starts
+    direction = axis / np.linalg.norm(axis, axis=1, keepdims=True)
+    
+    # Base ortonormal perpendicular a cada eje
+    helper = np.where(np.abs(direction[:, :1]) < 0.9, [[1, 0, 0]], [[0, 1, 0]])
+    helper = helper.astype(np.float32)
+    u = np.cross(direction, helper)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    v = np.cross(direction, u)
+    
+    # Cada lado es un cuadrilátero (ángulo k, k + 1) x (base, tapa)
+    angle = np.linspace(0.0, 2.0 * np.pi, slices + 1, dtype=np.float32)
+    around = np.stack([angle[:-1], angle[1:], angle[1:],
+                       angle[:-1], angle[1:], angle[:-1]], axis=-1).ravel()
+    height = np.tile(np.float32([0, 0, 1, 0, 1, 1]), slices)
+    
+    normals = (np.cos(around)[None, :, None] * u[:, None]
+               + np.sin(around)[None, :, None] * v[:, None])
+    positions = (starts[:, None] + height[None, :, None] * axis[:, None]
+                 + normals * np.asarray(radii, dtype=np.float32)[:, None, None])
+    vertices = np.concatenate([positions, normals], axis=-1).reshape(-1, 6)
+    return vertices.astype(np.float32)
+
 
 class ArmGLWidget(QOpenGLWidget):
-    """Widget OpenGL para renderizar el brazo robótico en 3D"""
+    """Widget OpenGL para renderizar el brazo robótico en 3D
+    
+    El renderizado es en modo retenido: la malla de la esfera se sube una vez
+    por nivel de detalle y las posiciones de articulaciones, segmentos y
+    objetivo se vuelcan a buffers de vértices solo cuando cambian. Todas las
+    esferas salen de una única llamada instanciada (GLSL 1.20 con
+    `glVertexAttribDivisor`); si el contexto no lo soporta, se dibujan con un
+    `glDrawElements` por esfera sobre la misma malla.
+    
+    Los obstáculos esféricos y los extremos de las cápsulas se suman a las
+    instancias de esferas; cajas y cuerpos de cápsulas son triángulos en un
+    buffer estático que solo se reescribe al cambiar la escena.
+    
+    No hay timer de repintado: `update()` solo se pide cuando cambian el
+    brazo, el objetivo o la cámara.
+    """
     
     # Señales
     view_changed = pyqtSignal()
@@ -26,26 +206,89 @@ class ArmGLWidget(QOpenGLWidget):
         self.last_mouse_pos = None
         
         # Datos del brazo
-        self.joint_positions = []
+        self.joint_positions = np.zeros((0, 3), dtype=np.float32)
         self.target_position = None
         
+        # Recursos de OpenGL (se crean en initializeGL)
+        self._sphere_meshes: Dict[Tuple[int, int], Tuple[int, int, int]] = {}
+        self._line_buffer = None
+        self._instance_buffer = None
+        self._sphere_program = None
+        self._instancing = False
+        
+        # Geometría de la escena volcada a los buffers
+        self._scene_dirty = True
+        self._line_count = 0
+        self._dashed_line_count = 0
+        self._instances = np.zeros((0, 7), dtype=np.float32)
+        
+        # Obstáculos: instancias de esferas y triángulos (posición, normal, color)
+        self._obstacle_buffer = None
+        self._obstacle_instances = np.zeros((0, 7), dtype=np.float32)
+        self._obstacle_vertices = np.zeros((0, 9), dtype=np.float32)
+        self._obstacle_vertex_count = 0
+        self._obstacles_dirty = False
+        
         # Configuración del widget
         self.setFocusPolicy(Qt.StrongFocus)
         self.setMinimumSize(600, 400)
-        
-        # Timer para actualización continua
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update)
-        self.update_timer.start(16)  # ~60 FPS
     
     def set_joint_positions(self, positions):
-        """Establecer posiciones de las articulaciones"""
+        """Establecer posiciones de las articulaciones (solo repinta si cambiaron)"""
+        positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        if np.array_equal(positions, self.joint_positions):
+            return
         self.joint_positions = positions
+        self._scene_dirty = True
         self.update()
     
     def set_target_position(self, position):
-        """Establecer posición del objetivo"""
+        """Establecer posición del objetivo (x, y, z) o None (solo repinta si cambió)"""
+        if position is not None:
+            position = np.array(position, dtype=np.float32).reshape(3)
+        if position is None or self.target_position is None:
+            if position is self.target_position:
+                return
+        elif np.array_equal(position, self.target_position):
+            return
         self.target_position = position
+        self._scene_dirty = True
+        self.update()
+    
+    def set_obstacles(self, scene):
+        """
+        Establecer los obstáculos a dibujar
+        
+        Args:
+            scene: `ObstacleScene` (o None para no dibujar ninguno)
+        """
+        instances = []
+        meshes = []
+        if scene is not None:
+            if len(scene.sphere_radii):
+                radii = scene.sphere_radii[:, None]
+                instances.append(np.hstack([scene.sphere_centers, radii]))
+            if len(scene.box_min):
+                meshes.append(box_mesh(scene.box_min, scene.box_max))
+            if len(scene.capsule_radii):
+                radii = scene.capsule_radii[:, None]
+                instances.append(np.hstack([scene.capsule_starts, radii]))
+                instances.append(np.hstack([scene.capsule_ends, radii]))
+                meshes.append(cylinder_mesh(scene.capsule_starts, scene.capsule_ends,
+                                            scene.capsule_radii))
+        
+        spheres = np.vstack(instances) if instances else np.zeros((0, 4))
+        self._obstacle_instances = np.hstack([
+            spheres, np.tile(OBSTACLE_COLOR, (len(spheres), 1))
+        ]).astype(np.float32)
+        
+        triangles = np.vstack(meshes) if meshes else np.zeros((0, 6), dtype=np.float32)
+        self._obstacle_vertices = np.ascontiguousarray(np.hstack([
+            triangles, np.tile(np.float32(OBSTACLE_COLOR), (len(triangles), 1))
+        ]), dtype=np.float32)
+        
+        self._obstacles_dirty = True
+        self._scene_dirty = True
         self.update()
     
     def initializeGL(self):
@@ -58,11 +301,68 @@ class ArmGLWidget(QOpenGLWidget):
         gl.glEnable(gl.GL_LIGHTING)
         gl.glEnable(gl.GL_LIGHT0)
         gl.glEnable(gl.GL_COLOR_MATERIAL)
+        gl.glEnable(gl.GL_NORMALIZE)
         
         # Configurar iluminación
         gl.glLightfv(gl.GL_LIGHT0, gl.GL_POSITION, [1, 1, 1, 0])
         gl.glLightfv(gl.GL_LIGHT0, gl.GL_AMBIENT, [0.2, 0.2, 0.2, 1])
         gl.glLightfv(gl.GL_LIGHT0, gl.GL_DIFFUSE, [0.8, 0.8, 0.8, 1])
+        
+        # Buffers de la escena
+        buffers = gl.glGenBuffers(3)
+        self._line_buffer, self._instance_buffer, self._obstacle_buffer = buffers
+        self._sphere_meshes.clear()
+        self._scene_dirty = True
+        self._obstacles_dirty = True
+        
+        self._sphere_program = self._create_sphere_program()
+        self._instancing = self._sphere_program is not None
+        
+        self.context().aboutToBeDestroyed.connect(self._release_gl_resources)
+    
+    def _create_sphere_program(self):
+        """Compilar el shader de esferas instanciadas, o None si no hay soporte"""
+        if not (bool(gl.glVertexAttribDivisor) and bool(gl.glDrawElementsInstanced)):
+            return None
+        
+        try:
+            program = shaders.compileProgram(
+                shaders.compileShader(SPHERE_VERTEX_SHADER, gl.GL_VERTEX_SHADER),
+                shaders.compileShader(SPHERE_FRAGMENT_SHADER, gl.GL_FRAGMENT_SHADER),
+                validate=False,
+            )
+        except (RuntimeError, gl.GLError):
+            return None
+        
+        # Fijar las ubicaciones de los atributos y reenlazar
+        gl.glBindAttribLocation(program, POSITION_ATTRIBUTE, 'position')
+        gl.glBindAttribLocation(program, INSTANCE_ATTRIBUTE, 'instance')
+        gl.glBindAttribLocation(program, COLOR_ATTRIBUTE, 'instance_color')
+        gl.glLinkProgram(program)
+        if not gl.glGetProgramiv(program, gl.GL_LINK_STATUS):
+            gl.glDeleteProgram(program)
+            return None
+        
+        # Misma luz direccional que GL_LIGHT0, en coordenadas de cámara
+        gl.glUseProgram(program)
+        light = np.array([1.0, 1.0, 1.0]) / np.sqrt(3.0)
+        gl.glUniform3f(gl.glGetUniformLocation(program, 'light_direction'), *light)
+        gl.glUseProgram(0)
+        
+        return program
+    
+    def _release_gl_resources(self):
+        """Liberar buffers y shaders antes de destruir el contexto"""
+        self.makeCurrent()
+        buffers = [self._line_buffer, self._instance_buffer, self._obstacle_buffer]
+        for vertex_buffer, index_buffer, _ in self._sphere_meshes.values():
+            buffers += [vertex_buffer, index_buffer]
+        gl.glDeleteBuffers(len(buffers), buffers)
+        if self._sphere_program is not None:
+            gl.glDeleteProgram(self._sphere_program)
+        self._sphere_meshes.clear()
+        self._sphere_program = None
+        self.doneCurrent()
     
     def resizeGL(self, width, height):
         """Manejar cambio de tamaño"""
@@ -82,107 +382,210 @@ class ArmGLWidget(QOpenGLWidget):
         gl.glRotatef(self.rotation_x, 1.0, 0.0, 0.0)
         gl.glRotatef(self.rotation_y, 0.0, 1.0, 0.0)
         
-        # Dibujar ejes de coordenadas
-        self._draw_coordinate_axes()
+        # Volcar la geometría solo si cambió
+        if self._obstacles_dirty:
+            self._upload_obstacles()
+        if self._scene_dirty:
+            self._upload_scene()
+        
+        # Ejes, segmentos y línea al objetivo
+        self._draw_lines()
         
-        # Dibujar brazo
-        if self.joint_positions:
-            self._draw_arm()
+        # Cajas y cuerpos de cápsulas
+        self._draw_obstacle_triangles()
         
-        # Dibujar objetivo
-        if self.target_position:
-            self._draw_target()
+        # Base, articulaciones, efector final, objetivo y obstáculos esféricos
+        self._draw_spheres()
     
-    def _draw_coordinate_axes(self):
-        """Dibujar ejes de coordenadas"""
-        gl.glDisable(gl.GL_LIGHTING)
-        gl.glBegin(gl.GL_LINES)
+    def _upload_scene(self):
+        """Construir los vértices de líneas y las instancias de esferas y subirlos"""
+        lines = [AXES_VERTICES]
+        instances = []
         
-        # Eje X (rojo)
-        gl.glColor3f(1.0, 0.0, 0.0)
-        gl.glVertex3f(0, 0, 0)
-        gl.glVertex3f(5, 0, 0)
+        positions = self.joint_positions
+        if len(positions) >= 2:
+            # Segmentos: pares de vértices consecutivos
+            segments = np.repeat(positions, 2, axis=0)[1:-1]
+            colors = np.tile(np.float32(SEGMENT_COLOR), (len(segments), 1))
+            lines.append(np.hstack([segments, colors]))
+            
+            instances.append([0.0, 0.0, 0.0, 0.3, *BASE_COLOR])
+            instances.extend([*position, 0.2, *JOINT_COLOR]
+                             for position in positions[1:])
+            instances.append([*positions[-1], 0.25, *END_EFFECTOR_COLOR])
         
-        # Eje Y (verde)
-        gl.glColor3f(0.0, 1.0, 0.0)
-        gl.glVertex3f(0, 0, 0)
-        gl.glVertex3f(0, 5, 0)
+        self._dashed_line_count = 0
+        if self.target_position is not None:
+            target = self.target_position.tolist()
+            instances.append([*target, 0.3, *TARGET_COLOR])
+            
+            # Línea punteada desde el origen, al final del buffer
+            lines.append(np.array([[0, 0, 0, *TARGET_COLOR], [*target, *TARGET_COLOR]],
+                                  dtype=np.float32))
+            self._dashed_line_count = 2
         
-        # Eje Z (azul)
-        gl.glColor3f(0.0, 0.0, 1.0)
-        gl.glVertex3f(0, 0, 0)
-        gl.glVertex3f(0, 0, 5)
+        line_vertices = np.ascontiguousarray(np.vstack(lines), dtype=np.float32)
+        self._line_count = len(line_vertices)
+        self._instances = np.vstack([
+            np.array(instances, dtype=np.float32).reshape(-1, 7),
+            self._obstacle_instances,
+        ])
         
-        gl.glEnd()
-        gl.glEnable(gl.GL_LIGHTING)
-    
-    def _draw_arm(self):
-        """Dibujar el brazo robótico"""
-        if len(self.joint_positions) < 2:
-            return
+        # GL_DYNAMIC_DRAW: se reescriben cuando se mueve el brazo
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._line_buffer)
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, line_vertices.nbytes, line_vertices,
+                        gl.GL_DYNAMIC_DRAW)
+        if len(self._instances):
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._instance_buffer)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, self._instances.nbytes, self._instances,
+                            gl.GL_DYNAMIC_DRAW)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
         
-        # Dibujar base
-        gl.glColor3f(0.5, 0.5, 0.5)
-        self._draw_sphere(0, 0, 0, 0.3)
+        self._scene_dirty = False
+    
+    def _upload_obstacles(self):
+        """Subir los triángulos de los obstáculos (estáticos: la escena no se mueve)"""
+        vertices = self._obstacle_vertices
+        self._obstacle_vertex_count = len(vertices)
+        if len(vertices):
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._obstacle_buffer)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices,
+                            gl.GL_STATIC_DRAW)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
         
-        # Dibujar segmentos y articulaciones
-        for i in range(len(self.joint_positions) - 1):
-            pos1 = self.joint_positions[i]
-            pos2 = self.joint_positions[i + 1]
-            
-            # Dibujar segmento
-            gl.glColor3f(0.2, 0.6, 1.0)
-            self._draw_segment(pos1, pos2)
-            
-            # Dibujar articulación
-            gl.glColor3f(1.0, 0.8, 0.0)
-            self._draw_sphere(pos2[0], pos2[1], pos2[2], 0.2)
-        
-        # Dibujar efector final
-        if self.joint_positions:
-            final_pos = self.joint_positions[-1]
-            gl.glColor3f(1.0, 0.0, 0.0)
-            self._draw_sphere(final_pos[0], final_pos[1], final_pos[2], 0.25)
-    
-    def _draw_target(self):
-        """Dibujar punto objetivo"""
-        if not self.target_position:
+        self._obstacles_dirty = False
+    
+    def _draw_obstacle_triangles(self):
+        """Dibujar cajas y cuerpos de cápsulas con una sola llamada"""
+        if not self._obstacle_vertex_count:
             return
         
-        x, y, z = self.target_position['x'], self.target_position['y'], self.target_position['z']
+        stride = 9 * 4
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._obstacle_buffer)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_NORMAL_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(3, gl.GL_FLOAT, stride, ctypes.c_void_p(0))
+        gl.glNormalPointer(gl.GL_FLOAT, stride, ctypes.c_void_p(12))
+        gl.glColorPointer(3, gl.GL_FLOAT, stride, ctypes.c_void_p(24))
         
-        # Dibujar esfera objetivo
-        gl.glColor3f(0.0, 1.0, 0.0)
-        self._draw_sphere(x, y, z, 0.3)
+        gl.glDrawArrays(gl.GL_TRIANGLES, 0, self._obstacle_vertex_count)
         
-        # Dibujar línea punteada desde el origen
-        gl.glDisable(gl.GL_LIGHTING)
-        gl.glEnable(gl.GL_LINE_STIPPLE)
-        gl.glLineStipple(2, 0xAAAA)
-        gl.glBegin(gl.GL_LINES)
-        gl.glVertex3f(0, 0, 0)
-        gl.glVertex3f(x, y, z)
-        gl.glEnd()
-        gl.glDisable(gl.GL_LINE_STIPPLE)
-        gl.glEnable(gl.GL_LIGHTING)
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_NORMAL_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
     
-    def _draw_segment(self, start, end):
-        """Dibujar un segmento del brazo"""
+    def _draw_lines(self):
+        """Dibujar ejes, segmentos y la línea al objetivo desde el buffer de líneas"""
+        stride = 6 * 4
         gl.glDisable(gl.GL_LIGHTING)
-        gl.glBegin(gl.GL_LINES)
-        gl.glVertex3f(start[0], start[1], start[2])
-        gl.glVertex3f(end[0], end[1], end[2])
-        gl.glEnd()
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._line_buffer)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_COLOR_ARRAY)
+        gl.glVertexPointer(3, gl.GL_FLOAT, stride, ctypes.c_void_p(0))
+        gl.glColorPointer(3, gl.GL_FLOAT, stride, ctypes.c_void_p(12))
+        
+        solid_count = self._line_count - self._dashed_line_count
+        gl.glDrawArrays(gl.GL_LINES, 0, solid_count)
+        if self._dashed_line_count:
+            gl.glEnable(gl.GL_LINE_STIPPLE)
+            gl.glLineStipple(2, 0xAAAA)
+            gl.glDrawArrays(gl.GL_LINES, solid_count, self._dashed_line_count)
+            gl.glDisable(gl.GL_LINE_STIPPLE)
+        
+        gl.glDisableClientState(gl.GL_COLOR_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
         gl.glEnable(gl.GL_LIGHTING)
     
-    def _draw_sphere(self, x, y, z, radius):
-        """Dibujar una esfera"""
-        gl.glPushMatrix()
-        gl.glTranslatef(x, y, z)
-        quad = glu.gluNewQuadric()
-        glu.gluSphere(quad, radius, 16, 16)
-        glu.gluDeleteQuadric(quad)
-        gl.glPopMatrix()
+    def _draw_spheres(self):
+        """Dibujar todas las esferas de la escena"""
+        if not len(self._instances):
+            return
+        
+        vertex_buffer, index_buffer, index_count = self._sphere_mesh_buffers()
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, index_buffer)
+        
+        if self._instancing:
+            self._draw_spheres_instanced(vertex_buffer, index_count)
+        else:
+            self._draw_spheres_fixed(vertex_buffer, index_count)
+        
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, 0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+    
+    def _draw_spheres_instanced(self, vertex_buffer, index_count):
+        """Una sola llamada instanciada para todas las esferas"""
+        stride = 7 * 4
+        gl.glUseProgram(self._sphere_program)
+        
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_buffer)
+        gl.glEnableVertexAttribArray(POSITION_ATTRIBUTE)
+        gl.glVertexAttribPointer(POSITION_ATTRIBUTE, 3, gl.GL_FLOAT, gl.GL_FALSE, 0,
+                                 ctypes.c_void_p(0))
+        
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._instance_buffer)
+        gl.glEnableVertexAttribArray(INSTANCE_ATTRIBUTE)
+        gl.glVertexAttribPointer(INSTANCE_ATTRIBUTE, 4, gl.GL_FLOAT, gl.GL_FALSE,
+                                 stride, ctypes.c_void_p(0))
+        gl.glVertexAttribDivisor(INSTANCE_ATTRIBUTE, 1)
+        gl.glEnableVertexAttribArray(COLOR_ATTRIBUTE)
+        gl.glVertexAttribPointer(COLOR_ATTRIBUTE, 3, gl.GL_FLOAT, gl.GL_FALSE, stride,
+                                 ctypes.c_void_p(16))
+        gl.glVertexAttribDivisor(COLOR_ATTRIBUTE, 1)
+        
+        gl.glDrawElementsInstanced(gl.GL_TRIANGLES, index_count, gl.GL_UNSIGNED_INT,
+                                   ctypes.c_void_p(0), len(self._instances))
+        
+        gl.glVertexAttribDivisor(INSTANCE_ATTRIBUTE, 0)
+        gl.glVertexAttribDivisor(COLOR_ATTRIBUTE, 0)
+        for attribute in (POSITION_ATTRIBUTE, INSTANCE_ATTRIBUTE, COLOR_ATTRIBUTE):
+            gl.glDisableVertexAttribArray(attribute)
+        gl.glUseProgram(0)
+    
+    def _draw_spheres_fixed(self, vertex_buffer, index_count):
+        """Sin instanciado: un glDrawElements por esfera sobre la malla cacheada"""
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_buffer)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glEnableClientState(gl.GL_NORMAL_ARRAY)
+        gl.glVertexPointer(3, gl.GL_FLOAT, 0, ctypes.c_void_p(0))
+        gl.glNormalPointer(gl.GL_FLOAT, 0, ctypes.c_void_p(0))
+        
+        for x, y, z, radius, r, g, b in self._instances:
+            gl.glColor3f(r, g, b)
+            gl.glPushMatrix()
+            gl.glTranslatef(x, y, z)
+            gl.glScalef(radius, radius, radius)
+            gl.glDrawElements(gl.GL_TRIANGLES, index_count, gl.GL_UNSIGNED_INT,
+                              ctypes.c_void_p(0))
+            gl.glPopMatrix()
+        
+        gl.glDisableClientState(gl.GL_NORMAL_ARRAY)
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+    
+    def _sphere_mesh_buffers(self) -> Tuple[int, int, int]:
+        """Buffers (vértices, índices, número de índices) de la esfera según el zoom"""
+        detail = self.sphere_detail()
+        if detail not in self._sphere_meshes:
+            vertices, indices = sphere_mesh(*detail)
+            vertex_buffer, index_buffer = gl.glGenBuffers(2)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, vertex_buffer)
+            gl.glBufferData(gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices,
+                            gl.GL_STATIC_DRAW)
+            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, index_buffer)
+            gl.glBufferData(gl.GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices,
+                            gl.GL_STATIC_DRAW)
+            self._sphere_meshes[detail] = (vertex_buffer, index_buffer, len(indices))
+        
+        return self._sphere_meshes[detail]
+    
+    def sphere_detail(self) -> Tuple[int, int]:
+        """Teselación (stacks, slices) de las esferas según la distancia de la cámara"""
+        for min_zoom, detail in SPHERE_LODS:
+            if self.zoom >= min_zoom:
+                return detail
+        return SPHERE_LODS[-1][1]
     
     def mousePressEvent(self, event: QMouseEvent):
         """Manejar clic del mouse"""
@@ -196,7 +599,7 @@ class ArmGLWidget(QOpenGLWidget):
         dx = event.x() - self.last_mouse_pos.x()
         dy = event.y() - self.last_mouse_pos.y()
         
-        if event.buttons() & Qt.LeftButton:
+        if event.buttons() & Qt.LeftButton and (dx or dy):
             self.rotation_y += dx
             self.rotation_x += dy
             self.view_changed.emit()
@@ -207,8 +610,10 @@ class ArmGLWidget(QOpenGLWidget):
     def wheelEvent(self, event: QWheelEvent):
         """Manejar rueda del mouse"""
         delta = event.angleDelta().y()
-        self.zoom += delta / 120.0
-        self.zoom = max(-30, min(-5, self.zoom))
+        zoom = max(-30, min(-5, self.zoom + delta / 120.0))
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
         self.view_changed.emit()
         self.update()
     
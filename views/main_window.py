@@ -5,18 +5,33 @@ Ventana principal de la aplicación
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QGroupBox, QLabel, QSlider, QLineEdit, QPushButton,
-                             QSplitter, QGridLayout)
+                             QSplitter, QGridLayout, QComboBox)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
 
 from views.gl_widget import ArmGLWidget
 
+# Agrupar los eventos de los sliders en una actualización por cuadro (ms)
+SLIDER_COALESCE_MS = 16
+
+# Esperar a que el usuario deje de escribir el objetivo (ms)
+TARGET_DEBOUNCE_MS = 250
+
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación"""
     
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
+        
+        # Timers de un disparo para agrupar ráfagas de entrada
+        self.angle_timer = QTimer(self)
+        self.angle_timer.setSingleShot(True)
+        self.angle_timer.setInterval(SLIDER_COALESCE_MS)
+        self.target_timer = QTimer(self)
+        self.target_timer.setSingleShot(True)
+        self.target_timer.setInterval(TARGET_DEBOUNCE_MS)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -95,11 +110,30 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(coord_grid)
         
-        # Botón de visualización
+        # Selector de motor de cinemática inversa
+        solver_layout = QHBoxLayout()
+        solver_layout.addWidget(QLabel("Motor:"))
+        self.solver_combo = QComboBox()
+        solver_layout.addWidget(self.solver_combo)
+        layout.addLayout(solver_layout)
+        
+        # Plazo por cálculo: vacío sin límite
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("Plazo (ms):"))
+        self.budget_input = QLineEdit()
+        self.budget_input.setPlaceholderText("sin límite")
+        budget_layout.addWidget(self.budget_input)
+        layout.addLayout(budget_layout)
+        
+        # Botones de visualización y cancelación
         self.visualize_btn = QPushButton("🚀 Visualizar Movimiento")
         self.visualize_btn.setFont(QFont("Arial", 11, QFont.Bold))
         layout.addWidget(self.visualize_btn)
         
+        self.cancel_btn = QPushButton("⏹️ Cancelar Cálculo")
+        self.cancel_btn.setEnabled(False)
+        layout.addWidget(self.cancel_btn)
+        
         return group
     
     def create_angle_group(self):
@@ -110,17 +144,13 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(group)
         layout.setSpacing(8)
         
-        # Sliders para los 6 ángulos
+        # Un slider por ángulo de la cadena (theta y gamma de cada segmento)
         self.angle_sliders = {}
         self.angle_labels = {}
         
         angles = [
-            ('theta1', 'Θ₁', -180, 180),
-            ('gamma1', 'γ₁', -180, 180),
-            ('theta2', 'Θ₂', -180, 180),
-            ('gamma2', 'γ₂', -180, 180),
-            ('theta3', 'Θ₃', -180, 180),
-            ('gamma3', 'γ₃', -180, 180)
+            (angle_name, self._angle_symbol(angle_name), -180, 180)
+            for angle_name in self.controller.arm_model.angle_names
         ]
         
         for angle_name, angle_symbol, min_val, max_val in angles:
@@ -149,6 +179,15 @@ class MainWindow(QMainWindow):
         
         return group
     
+    @staticmethod
+    def _angle_symbol(angle_name):
+        """Símbolo de un ángulo: 'theta2' -> 'Θ₂', 'gamma1' -> 'γ₁'"""
+        if angle_name.startswith('theta'):
+            symbol, index = 'Θ', angle_name[len('theta'):]
+        else:
+            symbol, index = 'γ', angle_name[len('gamma'):]
+        return symbol + index.translate(str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉'))
+    
     def create_info_group(self):
         """Crear grupo de información"""
         group = QGroupBox("📊 Información")
@@ -180,17 +219,37 @@ class MainWindow(QMainWindow):
     
     def connect_signals(self):
         """Conectar señales de la interfaz"""
-        # Conectar sliders
+        # Conectar sliders: varios valueChanged seguidos dan una sola actualización
+        self.angle_timer.timeout.connect(self.controller.on_angle_changed)
         for slider in self.angle_sliders.values():
-            slider.valueChanged.connect(self.controller.on_angle_changed)
+            slider.valueChanged.connect(self._schedule_angle_update)
         
-        # Conectar campos de entrada
-        self.x_input.textChanged.connect(self.controller.on_target_changed)
-        self.y_input.textChanged.connect(self.controller.on_target_changed)
-        self.z_input.textChanged.connect(self.controller.on_target_changed)
+        # Conectar campos de entrada: actualizar al dejar de escribir o al confirmar
+        self.target_timer.timeout.connect(self.controller.on_target_changed)
+        for line_edit in (self.x_input, self.y_input, self.z_input):
+            line_edit.textChanged.connect(self.target_timer.start)
+            line_edit.editingFinished.connect(self.flush_target_update)
         
         # Conectar botones
         self.visualize_btn.clicked.connect(self.controller.on_visualize_clicked)
+        self.cancel_btn.clicked.connect(self.controller.cancel_solve)
+    
+    def _schedule_angle_update(self):
+        """Programar una actualización de ángulos si no hay una pendiente"""
+        if not self.angle_timer.isActive():
+            self.angle_timer.start()
+    
+    def flush_target_update(self):
+        """Aplicar de inmediato un cambio de objetivo pendiente"""
+        if self.target_timer.isActive():
+            self.target_timer.stop()
+            self.controller.on_target_changed()
+    
+    @staticmethod
+    def _set_label_text(label, text):
+        """Cambiar el texto de una etiqueta solo si es distinto"""
+        if label.text() != text:
+            label.setText(text)
     
     def update_arm_display(self, joint_positions):
         """Actualizar visualización del brazo"""
@@ -204,35 +263,65 @@ class MainWindow(QMainWindow):
         """Actualizar etiquetas de ángulos"""
         for angle_name, value in angles.items():
             if angle_name in self.angle_labels:
-                self.angle_labels[angle_name].setText(f"{value:.1f}°")
+                self._set_label_text(self.angle_labels[angle_name], f"{value:.1f}°")
     
     def update_info_labels(self, current_pos, target_pos, distance, status):
-        """Actualizar etiquetas de información"""
-        self.current_pos_label.setText(f"📍 Posición actual: ({current_pos['x']:.2f}, {current_pos['y']:.2f}, {current_pos['z']:.2f})")
-        self.target_pos_label.setText(f"🎯 Objetivo: ({target_pos['x']:.2f}, {target_pos['y']:.2f}, {target_pos['z']:.2f})")
-        self.distance_label.setText(f"📏 Distancia: {distance:.2f}")
-        self.status_label.setText(f"✅ Estado: {status}")
+        """Actualizar etiquetas de información (posiciones como (x, y, z))"""
+        current = ", ".join(f"{value:.2f}" for value in current_pos[:3])
+        target = ", ".join(f"{value:.2f}" for value in target_pos[:3])
+        self._set_label_text(self.current_pos_label, f"📍 Posición actual: ({current})")
+        self._set_label_text(self.target_pos_label, f"🎯 Objetivo: ({target})")
+        self._set_label_text(self.distance_label, f"📏 Distancia: {distance:.2f}")
+        self._set_label_text(self.status_label, f"✅ Estado: {status}")
     
     def get_target_values(self):
-        """Obtener valores del objetivo"""
+        """Obtener valores del objetivo como (x, y, z)"""
         try:
             x = float(self.x_input.text() or "0")
             y = float(self.y_input.text() or "0")
             z = float(self.z_input.text() or "0")
-            return {'x': x, 'y': y, 'z': z}
+            return (x, y, z)
         except ValueError:
-            return {'x': 0, 'y': 0, 'z': 0}
+            return (0.0, 0.0, 0.0)
     
     def get_angle_values(self):
         """Obtener valores de los ángulos"""
         return {name: slider.value() for name, slider in self.angle_sliders.items()}
     
     def set_angle_values(self, angles):
-        """Establecer valores de los ángulos"""
+        """Establecer valores de los ángulos sin disparar on_angle_changed"""
         for name, value in angles.items():
             if name in self.angle_sliders:
-                self.angle_sliders[name].setValue(int(value))
+                slider = self.angle_sliders[name]
+                slider.blockSignals(True)
+                slider.setValue(int(value))
+                slider.blockSignals(False)
+    
+    def set_solver_options(self, labels, selected):
+        """Llenar el selector de motores con {nombre: etiqueta}"""
+        self.solver_combo.clear()
+        for name, label in labels.items():
+            self.solver_combo.addItem(label, name)
+        index = self.solver_combo.findData(selected)
+        if index >= 0:
+            self.solver_combo.setCurrentIndex(index)
+    
+    def get_time_budget(self):
+        """Obtener el plazo por cálculo en segundos (None: sin límite)"""
+        try:
+            milliseconds = float(self.budget_input.text())
+        except ValueError:
+            return None
+        return milliseconds / 1000.0 if milliseconds > 0 else None
+    
+    def get_solver_name(self):
+        """Obtener el nombre del motor seleccionado"""
+        return self.solver_combo.currentData()
     
     def set_visualize_enabled(self, enabled):
         """Habilitar/deshabilitar botón de visualización"""
         self.visualize_btn.setEnabled(enabled)
+    
+    def set_cancel_enabled(self, enabled):
+        """Habilitar/deshabilitar botón de cancelación"""
+        self.cancel_btn.setEnabled(enabled)